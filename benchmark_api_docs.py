@@ -0,0 +1,725 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmarks for the API reference generator in build_api_docs.py.
+
+Measures parse_docstring, escape_mdx_content, generate_function_signature,
+generate_ast_docs and a full generate_custom_docs pass over one or more
+corpora, and reports throughput in items/s and MB/s:
+
+- a synthetic package written by a deterministic generator (always run
+  unless --no_synthetic), with adversarial docstrings full of JSON blobs,
+  angle brackets, braces and long argument lists;
+- a frozen snapshot of real package sources (--snapshot), created once
+  from a checkout with --freeze_snapshot so every run sees the same code;
+- a live source tree (--source_root).
+
+Results can be saved as JSON (--output) and compared against a stored
+baseline (--baseline); the exit status is 1 if any benchmark got slower
+than the tolerance allows. Every benchmark runs at least --repeat passes
+and for at least --min_time seconds, and only benchmarks timed over
+MIN_JUDGED_PASSES passes, now and in the baseline, are judged, so a
+single noisy pass never counts as a regression. Timings only compare on
+the machine that made them: nothing is judged against a baseline recorded
+on another platform or Python version, and a baseline for checking a
+change should be saved from the base commit on the same machine.
+
+benchmarks/camel_snapshot.zip is the pinned snapshot: the agents,
+messages, memories, prompts, responses, terminators and types packages of
+camel-ai 0.2.90, as published on PyPI. benchmarks/baseline.json records
+results on it from one machine, for reference only; it is not a baseline
+to compare against elsewhere. To recreate the snapshot:
+
+    pip download camel-ai==0.2.90 --no-deps -d wheel
+    python -m zipfile -e wheel/camel_ai-0.2.90-py3-none-any.whl camel-0.2.90
+    python benchmark_api_docs.py --freeze_snapshot camel-0.2.90 \\
+        --snapshot benchmarks/camel_snapshot.zip --freeze_only camel \\
+        --freeze_only 'camel.agents*' --freeze_only 'camel.messages*' \\
+        --freeze_only 'camel.memories*' --freeze_only 'camel.prompts*' \\
+        --freeze_only 'camel.responses*' --freeze_only 'camel.terminators*' \\
+        --freeze_only 'camel.types*'
+
+Usage (the first run on the base commit, the second with the change):
+    python benchmark_api_docs.py --snapshot benchmarks/camel_snapshot.zip --output base.json
+    python benchmark_api_docs.py --snapshot benchmarks/camel_snapshot.zip --baseline base.json
+"""
+
+import argparse
+import ast
+import contextlib
+import fnmatch
+import gc
+import inspect
+import io
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+from build_api_docs import (
+    FUNCTION_NODES,
+    GENERATOR_VERSION,
+    ClassHierarchy,
+    PackageIndex,
+    SymbolTable,
+    escape_mdx_content,
+    generate_ast_docs,
+    generate_custom_docs,
+    generate_function_signature,
+    parse_docstring,
+)
+
+BENCHMARKS = [
+    "parse_docstring",
+    "escape_mdx_content",
+    "generate_function_signature",
+    "generate_ast_docs",
+    "generate_custom_docs",
+]
+
+# Relative slowdown in items/s tolerated before a benchmark counts as a regression
+DEFAULT_TOLERANCE = 0.10
+
+# Timed passes and seconds of timing every benchmark gets at least
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 1.0
+
+# Fewest timed passes, in both runs, for a change to be judged at all
+MIN_JUDGED_PASSES = 5
+
+SNAPSHOT_MANIFEST = "SNAPSHOT.json"
+
+# Fixed timestamp for snapshot entries, so freezing the same sources twice
+# gives byte-identical archives
+SNAPSHOT_DATE = (1980, 1, 1, 0, 0, 0)
+
+# Docstring fragments the MDX escaper finds hard
+ADVERSARIAL_SNIPPETS = [
+    'Accepts a JSON payload such as {"name": "agent", "tools": [1, 2, {"nested": true}]}.',
+    'Maps Dict<str, List<int>> onto the wire format.',
+    'Requires 0 < temperature <= 2 and top_p >= 0, otherwise x > limit fails.',
+    'Renders <div class="note">inline HTML</div> and <br> verbatim.',
+    'Formats a {placeholder} template; literal braces are written {{like this}}.',
+    'See `the guide <https://example.com/docs/guide>`_ for details.',
+    'Inline code like `a < b and {"k": 1}` must survive escaping.',
+    'Returns :obj:`None` when the queue is empty and :obj:`True` otherwise.',
+    'Values between 1-100 and ranges like >=0.5 are validated.',
+    'Uses <T> generics such as Callable[[int], Awaitable<str>].',
+]
+
+ARG_TYPES = [
+    "int",
+    "str",
+    "bool",
+    "float",
+    "Optional[str]",
+    "List[Dict[str, Any]]",
+    "Dict[str, Union[int, str]]",
+    "Callable[[str], Awaitable[None]]",
+    "Optional[List[Tuple[str, int]]]",
+]
+
+ARG_DEFAULTS = ["None", "0", "1.0", "True", "False", "'auto'", "()", "-1"]
+
+
+def _words(rng, count):
+    vocabulary = (
+        "agent model message memory tool config token stream buffer task "
+        "worker schema prompt response context window value result batch"
+    ).split()
+    return " ".join(rng.choice(vocabulary) for _ in range(count))
+
+
+def _synthetic_docstring(rng, params, returns=True, raises=False, indent="    "):
+    """Return the source lines of a Google-style docstring for params"""
+    lines = [f"{_words(rng, 6).capitalize()}."]
+    lines.append("")
+    lines.append(" ".join(rng.sample(ADVERSARIAL_SNIPPETS, rng.randint(1, 3))))
+    if params:
+        lines.append("")
+        lines.append("Args:")
+        for name, type_name, default in params:
+            description = f"{_words(rng, rng.randint(4, 14)).capitalize()}."
+            if rng.random() < 0.3:
+                description += " " + rng.choice(ADVERSARIAL_SNIPPETS)
+            if default is not None:
+                description += f" (default: :obj:`{default}`)"
+            lines.append(f"    {name} ({type_name}): {description}")
+    if returns:
+        lines.append("")
+        lines.append("Returns:")
+        lines.append(f"    Dict[str, Any]: {_words(rng, 8)} like {{\"ok\": true}}.")
+    if raises:
+        lines.append("")
+        lines.append("Raises:")
+        lines.append(f"    ValueError: If {_words(rng, 5)} < 0.")
+    if rng.random() < 0.2:
+        lines.extend([
+            "",
+            "Example:",
+            "    ```python",
+            '    result = call({"key": [1, 2]}, limit=3)  # a < b',
+            "    ```",
+        ])
+
+    body = [f'{indent}"""{lines[0]}']
+    body.extend(f"{indent}{line}" if line else "" for line in lines[1:])
+    body.append(f'{indent}"""')
+    return body
+
+
+def _synthetic_params(rng, low, high):
+    count = rng.randint(low, high)
+    params = []
+    for i in range(count):
+        default = rng.choice(ARG_DEFAULTS) if i >= count // 2 else None
+        params.append((f"arg_{i}", rng.choice(ARG_TYPES), default))
+    return params
+
+
+def _synthetic_def(rng, name, params, indent, method=False, is_async=False, raises=False):
+    args = ["self"] if method else []
+    for arg, type_name, default in params:
+        args.append(f"{arg}: {type_name}" + (f" = {default}" if default else ""))
+    if rng.random() < 0.2:
+        args.extend(["*args", "**kwargs"])
+    keyword = "async def" if is_async else "def"
+    lines = [f"{indent}{keyword} {name}({', '.join(args)}) -> Dict[str, Any]:"]
+    lines.extend(_synthetic_docstring(rng, params, raises=raises, indent=indent + "    "))
+    lines.append(f"{indent}    return {{}}")
+    lines.append("")
+    return lines
+
+
+def generate_synthetic_package(root, package_name="synthpkg", modules=200, classes=4, methods=6, seed=0):
+    """Write a deterministic synthetic package under root and return its size in bytes
+
+    Modules are grouped twenty to a subpackage whose __init__ re-exports
+    their first class. Classes inherit from classes of earlier modules
+    (through the re-exports), and some overrides repeat the overridden
+    docstring. The same arguments always produce the same files.
+    """
+    rng = random.Random(seed)
+    package_dir = os.path.join(root, package_name)
+    os.makedirs(package_dir, exist_ok=True)
+    total = 0
+
+    def write(path, lines):
+        nonlocal total
+        data = "\n".join(lines) + "\n"
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(data)
+        total += len(data.encode("utf-8"))
+
+    write(
+        os.path.join(package_dir, "__init__.py"),
+        [f'"""Synthetic package for benchmarking ({modules} modules)."""'],
+    )
+
+    groups = {}
+    for i in range(modules):
+        groups.setdefault(i // 20, []).append(i)
+
+    for group, members in groups.items():
+        group_dir = os.path.join(package_dir, f"group{group}")
+        os.makedirs(group_dir, exist_ok=True)
+        write(
+            os.path.join(group_dir, "__init__.py"),
+            [f'"""Group {group} of the synthetic package."""', ""]
+            + [f"from .mod{i} import Class{i}_0" for i in members]
+            + ["", "__all__ = ["]
+            + [f'    "Class{i}_0",' for i in members]
+            + ["]"],
+        )
+
+    for i in range(modules):
+        lines = [
+            f'"""Synthetic module {i}. {rng.choice(ADVERSARIAL_SNIPPETS)}"""',
+            "",
+            "from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union",
+            "",
+        ]
+        base = None
+        if i and rng.random() < 0.6:
+            parent = rng.randrange(i)
+            lines.append(f"from {package_name}.group{parent // 20} import Class{parent}_0")
+            lines.append("")
+            base = f"Class{parent}_0"
+        lines.append("")
+
+        for f in range(rng.randint(1, 3)):
+            lines.extend(_synthetic_def(
+                rng, f"function_{i}_{f}", _synthetic_params(rng, 2, 14), "",
+                raises=rng.random() < 0.3,
+            ))
+            lines.append("")
+
+        for c in range(classes):
+            bases = f"({base})" if base and c == 0 else ""
+            lines.append(f"class Class{i}_{c}{bases}:")
+            lines.extend(_synthetic_docstring(
+                rng, _synthetic_params(rng, 2, 20), returns=False
+            ))
+            lines.append("")
+            lines.extend(_synthetic_def(
+                rng, "__init__", _synthetic_params(rng, 1, 8), "    ", method=True
+            ))
+            for m in range(methods):
+                method_rng = rng
+                if c == 0 and m == 0:
+                    # Every first class shares method_0 verbatim, so subclasses
+                    # override it with the docstring of their base
+                    method_rng = random.Random(f"{seed}:shared")
+                lines.extend(_synthetic_def(
+                    method_rng, f"method_{m}", _synthetic_params(method_rng, 0, 10),
+                    "    ", method=True, is_async=m % 4 == 3,
+                    raises=method_rng.random() < 0.2,
+                ))
+            lines.append("")
+
+        write(os.path.join(package_dir, f"group{i // 20}", f"mod{i}.py"), lines)
+
+    return total
+
+
+def freeze_snapshot(source_root, package_name, path, patterns=None):
+    """Archive the package's Python sources under source_root as a snapshot zip
+
+    With patterns, only modules whose name matches one of them (fnmatch)
+    are archived. Entries are sorted and carry a fixed timestamp, and a
+    manifest records the package name and __version__, the file count and
+    the source commit when source_root is a git checkout. Returns the
+    manifest.
+    """
+    package_dir = os.path.join(source_root, package_name)
+    if not os.path.isdir(package_dir):
+        raise SystemExit(f"Error: {package_dir} is not a directory")
+
+    files = []
+    for root, dirs, names in os.walk(package_dir):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(names):
+            if not name.endswith(".py"):
+                continue
+            file = os.path.join(root, name)
+            module = os.path.relpath(file, source_root)[:-len(".py")].replace(os.sep, ".")
+            module = module.removesuffix(".__init__")
+            if not patterns or any(fnmatch.fnmatchcase(module, p) for p in patterns):
+                files.append(file)
+
+    version = None
+    with contextlib.suppress(OSError):
+        with open(os.path.join(package_dir, "__init__.py"), encoding="utf-8") as f:
+            match = re.search(r"^__version__\s*=\s*['\"]([^'\"]+)['\"]", f.read(), re.M)
+        version = match.group(1) if match else None
+
+    commit = None
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        commit = subprocess.run(
+            ["git", "-C", source_root, "rev-parse", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip() or None
+
+    total = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for file in files:
+            with open(file, "rb") as f:
+                data = f.read()
+            total += len(data)
+            info = zipfile.ZipInfo(
+                os.path.relpath(file, source_root).replace(os.sep, "/"), SNAPSHOT_DATE
+            )
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, data)
+        manifest = {
+            "package": package_name,
+            "version": version,
+            "files": len(files),
+            "bytes": total,
+            "commit": commit,
+        }
+        info = zipfile.ZipInfo(SNAPSHOT_MANIFEST, SNAPSHOT_DATE)
+        archive.writestr(info, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    return manifest
+
+
+def load_snapshot(path, directory):
+    """Extract a snapshot zip into directory and return its manifest"""
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read(SNAPSHOT_MANIFEST))
+        archive.extractall(directory)
+    return manifest
+
+
+class Corpus:
+    """The inputs every benchmark runs over, collected from one package"""
+
+    def __init__(self, name, package_name, source_root):
+        self.name = name
+        self.package_name = package_name
+        self.source_root = source_root
+        self.index = PackageIndex(package_name, source_root)
+        self.modules = self.index.names()
+        self.source_bytes = sum(self.index.size(module) for module in self.modules)
+
+        raw_parse = inspect.unwrap(parse_docstring)
+        self.docstrings = []
+        self.functions = []
+        for module in self.modules:
+            with open(self.index.path(module), encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+            for node in ast.walk(tree):
+                if isinstance(node, (ast.Module, ast.ClassDef) + FUNCTION_NODES):
+                    doc = ast.get_docstring(node)
+                    if doc:
+                        self.docstrings.append(doc)
+                if isinstance(node, FUNCTION_NODES):
+                    self.functions.append(node)
+
+        # The texts a page render passes to escape_mdx_content
+        self.escape_inputs = []
+        for doc in self.docstrings:
+            info = raw_parse(doc)
+            self.escape_inputs.append(info.description)
+            self.escape_inputs.extend(arg.description for arg in info.args)
+            if info.returns:
+                self.escape_inputs.append(info.returns)
+            self.escape_inputs.extend(exc.description for exc in info.raises)
+
+    def describe(self):
+        return {
+            "package": self.package_name,
+            "modules": len(self.modules),
+            "source_bytes": self.source_bytes,
+            "docstrings": len(self.docstrings),
+            "functions": len(self.functions),
+        }
+
+
+def _utf8_size(texts):
+    return sum(len(text.encode("utf-8")) for text in texts)
+
+
+def _benchmark_case(corpus, name, workdir):
+    """Return (run, items, bytes) for a benchmark; run() executes one pass"""
+    if name == "parse_docstring":
+        raw_parse = inspect.unwrap(parse_docstring)
+        docstrings = corpus.docstrings
+
+        def run():
+            for doc in docstrings:
+                raw_parse(doc)
+        return run, len(docstrings), _utf8_size(docstrings)
+
+    if name == "escape_mdx_content":
+        raw_escape = inspect.unwrap(escape_mdx_content)
+        texts = corpus.escape_inputs
+
+        def run():
+            for text in texts:
+                raw_escape(text)
+        return run, len(texts), _utf8_size(texts)
+
+    if name == "generate_function_signature":
+        functions = corpus.functions
+
+        def run():
+            for node in functions:
+                generate_function_signature(node, multiline=True)
+        return run, len(functions), 0
+
+    output_dir = os.path.join(workdir, f"{corpus.name}-{name}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    if name == "generate_ast_docs":
+        def run():
+            parse_docstring.cache_clear()
+            for module in corpus.modules:
+                generate_ast_docs(
+                    module, output_dir, corpus.package_name, corpus.source_root
+                )
+        return run, len(corpus.modules), corpus.source_bytes
+
+    if name == "generate_custom_docs":
+        def run():
+            parse_docstring.cache_clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_custom_docs(
+                    corpus.modules,
+                    output_dir,
+                    corpus.package_name,
+                    corpus.source_root,
+                    index=corpus.index,
+                    symbol_table=SymbolTable(),
+                    hierarchy=ClassHierarchy(),
+                )
+        return run, len(corpus.modules), corpus.source_bytes
+
+    raise ValueError(f"Unknown benchmark: {name}")
+
+
+def run_benchmark(corpus, name, workdir, repeat=DEFAULT_REPEAT, min_time=DEFAULT_MIN_TIME):
+    """Time a benchmark after one warm-up pass
+
+    Runs at least repeat passes, and more until min_time seconds have been
+    timed in total.
+    """
+    run, items, size = _benchmark_case(corpus, name, workdir)
+    run()  # Warm up caches, imports and (for page benchmarks) the output files
+
+    timings = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(timings) < repeat or sum(timings) < min_time:
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    best = min(timings)
+    return {
+        "items": items,
+        "bytes": size,
+        "passes": len(timings),
+        "best_s": best,
+        "median_s": statistics.median(timings),
+        "items_per_s": items / best if best else 0.0,
+        "mb_per_s": size / best / 1e6 if best and size else None,
+    }
+
+
+def format_result(key, result):
+    rate = f"{result['items_per_s']:12.0f} items/s"
+    if result["mb_per_s"] is not None:
+        rate += f" {result['mb_per_s']:8.2f} MB/s"
+    return (
+        f"  {key:<42} {result['items']:>7} items  {result['passes']:>4} passes  "
+        f"best {result['best_s']:8.4f} s  median {result['median_s']:8.4f} s  {rate}"
+    )
+
+
+def compare_with_baseline(report, baseline, tolerance):
+    """Print per-benchmark changes against a baseline; return the regressions
+
+    Benchmarks timed over fewer than MIN_JUDGED_PASSES passes, in either
+    run, are reported but never counted as regressions, and neither is
+    anything if the baseline was recorded on another platform or Python
+    version.
+    """
+    regressions = []
+    print(f"\nComparison with baseline (tolerance {tolerance:.0%}):")
+    other_machine = [
+        f"{field} {baseline.get(field)}"
+        for field in ("platform", "python")
+        if baseline.get(field) != report[field]
+    ]
+    if other_machine:
+        print(
+            f"  Warning: the baseline was recorded on {', '.join(other_machine)}; "
+            "changes are shown but not judged"
+        )
+    for key, result in report["results"].items():
+        previous = baseline.get("results", {}).get(key)
+        if not previous or not previous.get("items_per_s"):
+            print(f"  {key:<42} (not in baseline)")
+            continue
+        if previous["items"] != result["items"]:
+            print(
+                f"  {key:<42} (corpus changed: {previous['items']} -> "
+                f"{result['items']} items; comparing rates anyway)"
+            )
+        ratio = result["items_per_s"] / previous["items_per_s"]
+        passes = min(result["passes"], previous.get("passes", 0))
+        status = ""
+        if other_machine:
+            status = "  (not judged)"
+        elif passes < MIN_JUDGED_PASSES:
+            status = f"  (not judged: {passes} passes)"
+        elif ratio < 1 - tolerance:
+            status = "  REGRESSION"
+            regressions.append(key)
+        elif ratio > 1 + tolerance:
+            status = "  faster"
+        print(f"  {key:<42} {ratio - 1:+8.1%}{status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the API reference generator of build_api_docs.py"
+    )
+    parser.add_argument(
+        "--freeze_snapshot",
+        metavar="SOURCE_ROOT",
+        help="Archive the package sources under SOURCE_ROOT into the --snapshot "
+        "zip and exit",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="ZIP",
+        help="Snapshot zip of real package sources to benchmark (see "
+        "--freeze_snapshot)",
+    )
+    parser.add_argument(
+        "--freeze_only",
+        action="append",
+        metavar="PATTERN",
+        help="With --freeze_snapshot, only archive modules matching this fnmatch "
+        "pattern, e.g. 'camel.agents*' (repeatable)",
+    )
+    parser.add_argument(
+        "--package",
+        default="camel",
+        help="Package archived by --freeze_snapshot, or found under --source_root",
+    )
+    parser.add_argument(
+        "--source_root",
+        help="Also benchmark the live package sources under this directory",
+    )
+    parser.add_argument(
+        "--no_synthetic",
+        action="store_true",
+        help="Skip the synthetic package",
+    )
+    parser.add_argument(
+        "--modules", type=int, default=200, help="Synthetic package: number of modules"
+    )
+    parser.add_argument(
+        "--classes", type=int, default=4, help="Synthetic package: classes per module"
+    )
+    parser.add_argument(
+        "--methods", type=int, default=6, help="Synthetic package: methods per class"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Synthetic package: generator seed"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="Fewest timed passes per benchmark (best is reported)",
+    )
+    parser.add_argument(
+        "--min_time",
+        type=float,
+        default=DEFAULT_MIN_TIME,
+        help="Fewest seconds timed per benchmark; more passes are run until "
+        f"reached (default: {DEFAULT_MIN_TIME})",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=BENCHMARKS,
+        help="Only run this benchmark (repeatable)",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against results saved with --output")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative slowdown counted as a regression (default: 0.10)",
+    )
+    args = parser.parse_args()
+
+    if args.freeze_snapshot:
+        if not args.snapshot:
+            parser.error("--freeze_snapshot needs --snapshot to name the zip")
+        manifest = freeze_snapshot(
+            args.freeze_snapshot, args.package, args.snapshot, args.freeze_only
+        )
+        print(
+            f"Froze {manifest['files']} files ({manifest['bytes'] / 1e6:.2f} MB) of "
+            f"{manifest['package']} {manifest['version'] or ''} at "
+            f"{manifest['commit'] or 'unknown commit'} into {args.snapshot}"
+        )
+        return
+
+    benchmarks = args.only or BENCHMARKS
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "generator_version": GENERATOR_VERSION,
+        "repeat": args.repeat,
+        "min_time": args.min_time,
+        "corpora": {},
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="api_docs_bench-") as workdir:
+        corpora = []
+        if not args.no_synthetic:
+            root = os.path.join(workdir, "synthetic")
+            size = generate_synthetic_package(
+                root, "synthpkg", args.modules, args.classes, args.methods, args.seed
+            )
+            print(f"Generated synthetic package: {args.modules} modules, {size / 1e6:.2f} MB")
+            corpora.append(("synthetic", "synthpkg", root, {
+                "modules": args.modules, "classes": args.classes,
+                "methods": args.methods, "seed": args.seed,
+            }))
+        if args.snapshot:
+            root = os.path.join(workdir, "snapshot")
+            manifest = load_snapshot(args.snapshot, root)
+            print(f"Loaded snapshot of {manifest['package']} ({manifest['files']} files)")
+            corpora.append(("snapshot", manifest["package"], root, manifest))
+        if args.source_root:
+            corpora.append(("source", args.package, os.path.abspath(args.source_root), {}))
+        if not corpora:
+            parser.error("nothing to benchmark")
+
+        for name, package_name, root, details in corpora:
+            corpus = Corpus(name, package_name, root)
+            report["corpora"][name] = dict(details, **corpus.describe())
+            print(f"\n{name}: {len(corpus.modules)} modules, "
+                  f"{corpus.source_bytes / 1e6:.2f} MB of source")
+            for benchmark in benchmarks:
+                result = run_benchmark(
+                    corpus, benchmark, workdir, args.repeat, args.min_time
+                )
+                key = f"{name}/{benchmark}"
+                report["results"][key] = result
+                print(format_result(key, result))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nWrote results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,19 +18,46 @@
 
 #!/usr/bin/env python3
 import argparse
+import contextlib
+import fnmatch
+import functools
 import glob
-import importlib
+import hashlib
+import importlib.util
 import json
 import os
+import sqlite3
 import subprocess
 import sys
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque, namedtuple
 from pathlib import Path
 import textwrap
 import ast
 import re
 
+from doc_build_utils import (
+    LLMS_FULL,
+    LLMS_INDEX,
+    BuildProfiler,
+    OutputStats,
+    active_profiler,
+    check_mdx_files,
+    format_mdx_issue,
+    git_blob_id,
+    git_changes,
+    git_tree_files,
+    profile_stage,
+    profiled,
+    read_archive,
+    read_git_blobs,
+    staged_directory,
+    update_json_subtree,
+    update_llms_bundle,
+    write_if_changed,
+)
+
 # Module name to display name mapping
 MODULE_NAME_DISPLAY = {
     "agents": "Agents",
@@ -64,6 +91,24 @@ MODULE_NAME_DISPLAY = {
     "extractors": "Extractors",
 }
 
+# Bump whenever generated output changes, so cached pages are rebuilt
+GENERATOR_VERSION = "6"
+
+# Bump whenever the documentation model (see DocModel) or how it is
+# extracted from source changes, so cached models are re-extracted
+MODEL_VERSION = "2"
+
+# Models kept by DocModelCache before the least recently used are evicted
+MODEL_CACHE_ENTRIES = 4096
+
+# Source bytes per worker batch when generating in parallel; modules larger
+# than this are scheduled on their own
+PARALLEL_CHUNK_BYTES = 64 * 1024
+
+# Watch mode: quiet period that ends a batch of events, and polling interval
+WATCH_DEBOUNCE_SECONDS = 0.05
+WATCH_POLL_SECONDS = 0.2
+
 # Custom order, this determines the display order of top-level modules
 MODULE_ORDER = [
     "agents",
@@ -94,102 +139,302 @@ MODULE_ORDER = [
 ]
 
 
-def get_module_display_name(module_name):
+def get_module_display_name(module_name, display_names=None):
     """Get the beautiful display name for a module"""
-    if module_name in MODULE_NAME_DISPLAY:
-        return MODULE_NAME_DISPLAY[module_name]
+    if display_names is None:
+        display_names = MODULE_NAME_DISPLAY
+    if module_name in display_names:
+        return display_names[module_name]
     # If no mapping exists, convert snake_case to title case
     return module_name.replace('_', ' ').title()
 
 
-def get_all_modules(package_name="camel", recursive=True):
-    """Get all modules in the package"""
-    modules = []
+@functools.lru_cache(maxsize=None)
+def get_package_path(package_name="camel", source_root=None):
+    """Locate the package directory on disk without importing it"""
+    parts = package_name.split('.')
 
-    try:
-        # Import main package
-        package = importlib.import_module(package_name)
-        modules.append(package_name)
+    if source_root:
+        root_path = os.path.join(os.path.abspath(source_root), parts[0])
+    else:
+        # find_spec on a top-level name only resolves the loader and search
+        # locations; it never executes the package's __init__.py
+        try:
+            spec = importlib.util.find_spec(parts[0])
+        except (ImportError, ValueError) as e:
+            print(f"Error locating {package_name}: {e}")
+            return None
+        if spec is None or not spec.submodule_search_locations:
+            print(f"Error locating {package_name}: package not found")
+            return None
+        root_path = list(spec.submodule_search_locations)[0]
 
-        # Get package path
-        package_path = os.path.dirname(package.__file__)
+    package_path = os.path.join(root_path, *parts[1:])
+    if not os.path.isfile(os.path.join(package_path, "__init__.py")):
+        print(f"Error locating {package_name}: {package_path} is not a package")
+        return None
 
-        # Traverse all Python files in the package
-        for root, dirs, files in os.walk(package_path):
-            if not recursive and root != package_path:
-                continue
+    return package_path
 
-            for file in files:
-                if file.endswith(".py") and file != "__init__.py":
-                    # Calculate relative path of the module
-                    rel_path = os.path.relpath(
-                        os.path.join(root, file), os.path.dirname(package_path)
-                    )
-                    # Convert to module name
-                    module_name = os.path.splitext(rel_path)[0].replace(
-                        os.sep, "."
-                    )
-                    modules.append(module_name)
-
-            # Handle subpackages
-            for dir_name in dirs:
-                if os.path.isfile(os.path.join(root, dir_name, "__init__.py")):
-                    # Calculate relative path of the subpackage
-                    rel_path = os.path.relpath(
-                        os.path.join(root, dir_name),
-                        os.path.dirname(package_path),
-                    )
-                    # Convert to package name
-                    subpackage_name = rel_path.replace(os.sep, ".")
-                    modules.append(subpackage_name)
 
-    except ImportError as e:
-        print(f"Error importing {package_name}: {e}")
+def find_module_source(module_name, package_name="camel", source_root=None):
+    """Resolve a module name to its source file path without importing it"""
+    package_path = get_package_path(package_name, source_root)
+    if not package_path:
+        return None
+
+    if module_name != package_name and not module_name.startswith(
+        package_name + "."
+    ):
+        return None
 
-    return sorted(modules)
+    rel_parts = module_name.split('.')[len(package_name.split('.')):]
+    base_path = os.path.join(package_path, *rel_parts)
 
+    if os.path.isfile(os.path.join(base_path, "__init__.py")):
+        return os.path.join(base_path, "__init__.py")
+    if rel_parts and os.path.isfile(base_path + ".py"):
+        return base_path + ".py"
 
-def get_changed_modules(package_name="camel", since_hours=24):
-    """Get recently modified modules (for incremental updates)"""
-    changed_modules = []
+    return None
+
+
+ModuleInfo = namedtuple("ModuleInfo", ["path", "size", "group"])
+
+
+def map_module_files(rel_paths, package_name="camel"):
+    """Map source files to the modules they define and the package's groups
+
+    rel_paths are '/'-separated paths relative to the directory that holds
+    the top-level package. Returns ({module: rel_path}, groups): groups are
+    the subpackages directly below the package root, in the order their
+    files were listed.
+    """
+    prefix = package_name.split('.')
+    packages = {}
+    modules = {}
+    groups = {}
+    for rel_path in rel_paths:
+        parts = rel_path.split('/')
+        if not rel_path.endswith(".py") or parts[:len(prefix)] != prefix:
+            continue
+        dir_parts, file = parts[:-1], parts[-1]
+        if file == "__init__.py":
+            packages[".".join(dir_parts)] = rel_path
+            if len(dir_parts) >= 2 and not any(
+                part.startswith(('.', '__pycache__')) for part in dir_parts
+            ):
+                groups.setdefault(dir_parts[1], None)
+        else:
+            modules.setdefault(".".join(dir_parts + [file[:-len(".py")]]), rel_path)
+
+    # A package shadows a module of the same name, as on import
+    for name, rel_path in modules.items():
+        packages.setdefault(name, rel_path)
+    return packages, list(groups)
+
+
+def module_group(module_name, groups):
+    """Return the top-level group of a module, or None"""
+    parts = module_name.split('.')
+    return parts[1] if len(parts) >= 2 and parts[1] in groups else None
+
+
+class PackageIndex:
+    """Every module of a package, found in a single scan of its source tree
+
+    Each module maps to a ModuleInfo holding its source path, size and
+    top-level group (the subpackage directly below the package root, or
+    None). Content hashes are computed on first use and memoized, so
+    partial builds only read the files they need.
+    """
+
+    def __init__(self, package_name="camel", source_root=None):
+        self.package_name = package_name
+        self.source_root = source_root
+        self.package_path = get_package_path(package_name, source_root)
+        self.modules = {}
+        self.groups = []
+        self._hashes = {}
+        if self.package_path:
+            self._scan()
+
+    def _scan(self):
+        # Module names are computed relative to the directory that holds the
+        # top-level package, so dotted package names resolve correctly
+        names_root = self.package_path
+        for _ in self.package_name.split('.'):
+            names_root = os.path.dirname(names_root)
+
+        rel_paths = []
+        for root, _dirs, files in os.walk(self.package_path):
+            rel_root = os.path.relpath(root, names_root).replace(os.sep, '/')
+            rel_paths.extend(f"{rel_root}/{file}" for file in files)
+
+        found, self.groups = map_module_files(rel_paths, self.package_name)
+        for name, rel_path in found.items():
+            path = os.path.join(names_root, *rel_path.split('/'))
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue  # Deleted during the scan
+            self.modules[name] = ModuleInfo(path, size, module_group(name, self.groups))
+
+    def __contains__(self, module):
+        return module in self.modules
+
+    def names(self, patterns=None):
+        """Return sorted module names, optionally filtered by fnmatch patterns"""
+        if not patterns:
+            return sorted(self.modules)
+        return sorted(
+            name for name in self.modules
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+        )
+
+    def path(self, module):
+        info = self.modules.get(module)
+        return info.path if info else None
+
+    def size(self, module):
+        info = self.modules.get(module)
+        return info.size if info else 0
+
+    def source_hash(self, module):
+        """Return the memoized content hash of a module's source"""
+        if module not in self._hashes:
+            self._hashes[module] = compute_source_hash(self.modules[module].path)
+        return self._hashes[module]
+
+    def seed_hash(self, module, source_hash):
+        """Memoize a content hash known from an earlier scan of an unchanged file"""
+        self._hashes[module] = source_hash
+
+    def known_hashes(self):
+        """Return the content hashes computed or seeded so far, by module"""
+        return dict(self._hashes)
+
+    def is_package(self, module):
+        return self.modules[module].path.endswith("__init__.py")
+
+    def read_source(self, module):
+        with open(self.modules[module].path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def structure(self):
+        """Return {group: {'display_name': ..., 'modules': [...]}}"""
+        structure = {
+            group: {'display_name': get_module_display_name(group), 'modules': []}
+            for group in self.groups
+        }
+        for name in sorted(self.modules):
+            group = self.modules[name].group
+            if group:
+                structure[group]['modules'].append(name)
+        return structure
+
+
+class SourceSnapshot(PackageIndex):
+    """A package's modules as of a git ref, or as packaged in a wheel or sdist
+
+    Sources are read in memory: nothing is checked out, extracted or
+    installed. ModuleInfo.path is the file's path in the repository or
+    archive, and source_hash is the git blob id of its content, so a module
+    whose source is the same in two snapshots has the same hash in both.
+    label names the snapshot, e.g. "v0.2.1".
+    """
+
+    def __init__(self, package_name, label, files, load):
+        # files maps '/'-separated paths to (blob_id, size); load(blob_ids)
+        # returns {blob_id: bytes}
+        self.package_name = package_name
+        self.source_root = None
+        self.package_path = None
+        self.label = label
+        self.modules = {}
+        self._hashes = {}
+        self._sources = {}
+        self._load = load
+        found, self.groups = map_module_files(files, package_name)
+        for name, rel_path in found.items():
+            blob_id, size = files[rel_path]
+            self.modules[name] = ModuleInfo(
+                rel_path, size, module_group(name, self.groups)
+            )
+            self._hashes[name] = blob_id
+
+    @classmethod
+    def from_git(cls, package_name, ref, repository="."):
+        """Snapshot the package at a git ref of the repository holding it
+
+        repository is the directory containing the top-level package, as
+        for --source_root. Raises RuntimeError if git fails.
+        """
+        files = git_tree_files(repository, ref, "/".join(package_name.split('.')))
+        return cls(
+            package_name, git_ref_label(ref), files,
+            functools.partial(read_git_blobs, repository),
+        )
+
+    @classmethod
+    def from_archive(cls, package_name, path):
+        """Snapshot the package as packaged in a wheel or sdist
+
+        Raises RuntimeError if the archive does not contain the package.
+        """
+        members = read_archive(path, (".py",))
+        # sdists nest the package in a top-level directory, wheels do not
+        package_init = "/".join(package_name.split('.') + ["__init__.py"])
+        roots = sorted(
+            (
+                name[:-len(package_init)] for name in members
+                if name == package_init or name.endswith("/" + package_init)
+            ),
+            key=len,
+        )
+        if not roots:
+            raise RuntimeError(f"{path} does not contain {package_name}")
+
+        blobs = {}
+        files = {}
+        for name, data in members.items():
+            if name.startswith(roots[0]):
+                blob_id = git_blob_id(data)
+                blobs[blob_id] = data
+                files[name[len(roots[0]):]] = (blob_id, len(data))
+        return cls(
+            package_name, archive_label(path), files,
+            lambda blob_ids: {blob_id: blobs[blob_id] for blob_id in blob_ids},
+        )
+
+    def load(self, modules):
+        """Read the sources of modules that were not read yet, in one batch"""
+        missing = {self._hashes[module] for module in modules} - self._sources.keys()
+        if missing:
+            self._sources.update(self._load(missing))
+
+    def read_source(self, module):
+        blob_id = self._hashes[module]
+        if blob_id not in self._sources:
+            self.load([module])
+        return self._sources[blob_id].decode('utf-8')
 
-    try:
-        # Import main package
-        package = importlib.import_module(package_name)
-        package_path = os.path.dirname(package.__file__)
-
-        # Calculate time threshold
-        time_threshold = time.time() - (since_hours * 3600)
-
-        # Traverse all Python files in the package
-        for root, _dirs, files in os.walk(package_path):
-            for file in files:
-                if file.endswith(".py"):
-                    file_path = os.path.join(root, file)
-
-                    # Check file modification time
-                    if os.path.getmtime(file_path) > time_threshold:
-                        if file == "__init__.py":
-                            # Handle package
-                            rel_path = os.path.relpath(
-                                root, os.path.dirname(package_path)
-                            )
-                            module_name = rel_path.replace(os.sep, ".")
-                            changed_modules.append(module_name)
-                        else:
-                            # Handle module
-                            rel_path = os.path.relpath(
-                                file_path, os.path.dirname(package_path)
-                            )
-                            module_name = os.path.splitext(rel_path)[
-                                0
-                            ].replace(os.sep, ".")
-                            changed_modules.append(module_name)
-
-    except ImportError as e:
-        print(f"Error importing {package_name}: {e}")
-
-    return sorted(set(changed_modules))
+
+def git_ref_label(ref):
+    """Return a git ref made safe for directory names and URLs, such as HEAD-1 for HEAD~1"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", ref)
+
+
+def archive_label(path):
+    """Return the version in a wheel or sdist file name, such as 0.2.1"""
+    name = os.path.basename(path)
+    if name.endswith(".whl"):
+        return name.split('-')[1]
+    for suffix in (".tar.gz", ".tgz", ".tar.bz2", ".tar.xz", ".tar", ".zip"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return name.rpartition('-')[2]
 
 
 def is_content_substantial(content):
@@ -218,135 +463,348 @@ def is_content_substantial(content):
     return len(substantial_lines) >= 3
 
 
-def generate_sphinx_docs(modules, output_dir, package_name="camel"):
-    """Generate Markdown documentation using Sphinx for all modules"""
-    import tempfile
-    import shutil
-    
+SPHINX_CONF_TEMPLATE = '''\
+import os
+import sys
+
+sys.path.insert(0, {import_root!r})
+
+project = {package_name!r}
+extensions = ["sphinx.ext.autodoc", "sphinx.ext.napoleon"]
+autodoc_default_options = {{
+    "members": True,
+    "undoc-members": True,
+    "show-inheritance": True,
+}}
+autodoc_member_order = "bysource"
+html_theme = "basic"
+suppress_warnings = ["toc.not_included"]
+'''
+
+
+def create_sphinx_config(sphinx_source_dir, package_name="camel", source_root=None):
+    """Write conf.py for a Sphinx project documenting the package"""
+    os.makedirs(sphinx_source_dir, exist_ok=True)
+
+    # autodoc imports the package from the directory holding it
+    import_root = get_package_path(package_name, source_root)
+    for _ in package_name.split('.'):
+        import_root = os.path.dirname(import_root)
+
+    write_if_changed(
+        os.path.join(sphinx_source_dir, "conf.py"),
+        SPHINX_CONF_TEMPLATE.format(import_root=import_root, package_name=package_name),
+    )
+
+
+def create_rst_file(module, sphinx_source_dir):
+    """Write the .rst stub that documents a single module"""
+    title = f"{module}\n{'=' * len(module)}\n\n"
+    write_if_changed(
+        os.path.join(sphinx_source_dir, f"{module}.rst"),
+        f"{title}.. automodule:: {module}\n",
+    )
+
+
+def create_sphinx_index(modules, sphinx_source_dir, package_name="camel"):
+    """Write index.rst with a hidden toctree over every module stub"""
+    entries = "\n".join(f"   {module}" for module in sorted(modules))
+    title = f"{package_name}\n{'=' * len(package_name)}\n\n"
+    write_if_changed(
+        os.path.join(sphinx_source_dir, "index.rst"),
+        f"{title}.. toctree::\n   :hidden:\n\n{entries}\n",
+    )
+
+
+def generate_sphinx_docs(
+    modules,
+    output_dir,
+    package_name="camel",
+    source_root=None,
+    sphinx_dir=".sphinx_build",
+    on_result=None,
+    stats=None,
+):
+    """Generate Markdown documentation using one Sphinx build for all modules
+
+    Stubs live in a persistent project under sphinx_dir, so Sphinx's doctree
+    cache lets repeated builds re-read only the modules that changed.
+    on_result and stats behave as in generate_custom_docs.
+    """
     os.makedirs(output_dir, exist_ok=True)
-    
+
+    sphinx_source_dir = os.path.join(sphinx_dir, "source")
+    sphinx_html_dir = os.path.join(sphinx_dir, "html")
+    sphinx_doctree_dir = os.path.join(sphinx_dir, "doctrees")
+
     generated_count = 0
     skipped_count = 0
-    
-    # Process each module individually
+
+    # Write the project: config, one stub per module and the index
+    create_sphinx_config(sphinx_source_dir, package_name, source_root)
+    for module in modules:
+        create_rst_file(module, sphinx_source_dir)
+
+    # Drop stubs of modules that no longer exist so autodoc does not fail on them
+    documented = []
+    for stub in glob.glob(os.path.join(sphinx_source_dir, "*.rst")):
+        module = os.path.basename(stub)[:-len(".rst")]
+        if module == "index":
+            continue
+        if find_module_source(module, package_name, source_root):
+            documented.append(module)
+        else:
+            os.remove(stub)
+    create_sphinx_index(documented, sphinx_source_dir, package_name)
+
+    print(f"  Running sphinx-build for {len(documented)} modules...")
+    try:
+        with profile_stage("sphinx-build"):
+            subprocess.run([
+                "sphinx-build",
+                "-b", "html",  # Use HTML builder
+                "-q",  # Quiet mode
+                "-j", "auto",  # Read and write documents in parallel
+                "-d", sphinx_doctree_dir,  # Persistent doctree cache
+                sphinx_source_dir,
+                sphinx_html_dir
+            ], capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        print("    Error: sphinx-build not found; install sphinx to use --backend sphinx")
+        return generated_count, len(modules)
+    except subprocess.CalledProcessError as e:
+        print(f"    Error running sphinx-build: {e}")
+        if e.stderr:
+            print(f"    STDERR: {e.stderr}")
+        return generated_count, len(modules)
+
+    # Convert every requested module's HTML page in one pass
     for i, module in enumerate(modules):
-        print(f"  [{i+1}/{len(modules)}] Processing {module}...")
-        
-        # Create temporary Sphinx directory for this module
-        with tempfile.TemporaryDirectory() as temp_dir:
-            sphinx_source_dir = os.path.join(temp_dir, "source")
-            sphinx_build_dir = os.path.join(temp_dir, "build")
-            
-            # Create Sphinx configuration
-            create_sphinx_config(sphinx_source_dir, package_name)
-            
-            # Create .rst file for this module
-            create_rst_file(module, sphinx_source_dir)
-            
-            # Generate documentation using Sphinx (HTML first)
-            try:
-                # Use sphinx-build to generate HTML files
-                result = subprocess.run([
-                    "sphinx-build", 
-                    "-b", "html",  # Use HTML builder
-                    "-q",  # Quiet mode
-                    sphinx_source_dir,
-                    sphinx_build_dir
-                ], capture_output=True, text=True, check=True)
-                
-                # Look for the generated HTML file
-                html_file = os.path.join(sphinx_build_dir, f"{module}.html")
-                if os.path.exists(html_file):
-                    # Convert HTML to Markdown using a simple approach
-                    content = convert_html_to_markdown(html_file, module)
-                    
-                    if is_content_substantial(content):
-                        # Write to output directory as .mdx
-                        mdx_file = os.path.join(output_dir, f"{module}.mdx")
-                        with open(mdx_file, "w", encoding="utf-8") as f:
-                            f.write(content)
-                        generated_count += 1
-                        print(f"    Generated {os.path.basename(mdx_file)}")
-                    else:
-                        print(f"    Skipped {module} (insufficient content)")
-                        skipped_count += 1
-                else:
-                    print(f"    Skipped {module} (HTML file not generated)")
-                    skipped_count += 1
-                
-            except subprocess.CalledProcessError as e:
-                print(f"    Error generating docs for {module}: {e}")
-                if e.stderr:
-                    print(f"    STDERR: {e.stderr}")
-                skipped_count += 1
-    
+        print(f"  [{i+1}/{len(modules)}] Converting {module}...")
+
+        output_file = None
+        html_file = os.path.join(sphinx_html_dir, f"{module}.html")
+        if not os.path.exists(html_file):
+            print(f"    Skipped {module} (HTML file not generated)")
+        else:
+            with profile_stage("convert", module):
+                content = convert_html_to_markdown(html_file, module)
+                if is_content_substantial(content):
+                    output_file = os.path.join(output_dir, f"{module}.mdx")
+                    written = write_if_changed(output_file, content, stats)
+            if output_file is None:
+                print(f"    Skipped {module} (insufficient content)")
+            elif written:
+                print(f"    Generated {os.path.basename(output_file)}")
+            else:
+                print(f"    Unchanged {os.path.basename(output_file)}")
+
+        if on_result:
+            on_result(module, output_file, (), (), (), ())
+        if output_file:
+            generated_count += 1
+        else:
+            skipped_count += 1
+
     return generated_count, skipped_count
 
 
+# HTML elements whose text becomes a Markdown block
+HTML_BLOCK_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'pre', 'dt', 'dd'}
+
+# Elements that never have an end tag
+HTML_VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'source', 'track', 'wbr',
+}
+
+# Size of the chunks fed to the HTML parser
+HTML_READ_CHUNK = 64 * 1024
+
+
+class HtmlMarkdownEmitter:
+    """Turn a stream of HTML parse events into Markdown lines.
+
+    Text is routed to the innermost open block element, and a block is
+    emitted when it closes or when a nested block starts, so every node is
+    emitted exactly once. Only the main content (Sphinx's div.body, or any
+    role="main" element) is kept; pages without one fall back to the whole
+    body. The methods follow lxml's parser target interface.
+    """
+
+    def __init__(self):
+        self.main_lines = []
+        self.body_lines = []
+        self.open_tags = []
+        self.blocks = []
+        self.main_depth = None
+        self.skip_depth = None
+
+    def start(self, tag, attrib):
+        tag = tag.lower()
+        if tag in HTML_VOID_TAGS:
+            return
+        self.open_tags.append(tag)
+        depth = len(self.open_tags)
+
+        classes = (attrib.get('class') or '').split()
+        if self.skip_depth is None and (
+            tag in ('script', 'style') or 'headerlink' in classes
+        ):
+            self.skip_depth = depth
+        if self.main_depth is None and (
+            (tag == 'div' and 'body' in classes) or attrib.get('role') == 'main'
+        ):
+            self.main_depth = depth
+
+        if tag in HTML_BLOCK_TAGS:
+            if self.blocks:
+                self._flush(self.blocks[-1])
+            self.blocks.append([tag, [], attrib.get('id'), depth])
+
+    def end(self, tag):
+        tag = tag.lower()
+        if tag not in self.open_tags:
+            return
+        # Implicitly close any elements left open inside this one
+        while self.open_tags:
+            depth = len(self.open_tags)
+            if self.blocks and self.blocks[-1][3] == depth:
+                self._flush(self.blocks.pop())
+            if self.skip_depth == depth:
+                self.skip_depth = None
+            if self.main_depth == depth:
+                self.main_depth = -1  # Main content seen and closed
+            if self.open_tags.pop() == tag:
+                break
+
+    def data(self, text):
+        if self.blocks and self.skip_depth is None:
+            self.blocks[-1][1].append(text)
+
+    def close(self):
+        if self.main_depth is None:
+            return self.body_lines
+        return self.main_lines
+
+    def _flush(self, block):
+        tag, parts, anchor, _ = block
+        text = ''.join(parts)
+        parts.clear()
+        block[2] = None  # Anchors are emitted with the first flush only
+
+        lines = []
+        if tag == 'pre':
+            code = text.strip('\n')
+            if code.strip():
+                lines += ["```python", code, "```", ""]
+        else:
+            text = escape_mdx_content(' '.join(text.split()))
+            if anchor and tag == 'dt':
+                lines += [f'<a id="{anchor}"></a>', ""]
+            if not text:
+                pass
+            elif tag[0] == 'h':
+                lines += [f"{'#' * (int(tag[1]) + 1)} {text}", ""]
+            elif tag == 'dt':
+                lines += [f"**{text}**", ""]
+            elif tag == 'dd':
+                lines += [f"  {text}", ""]
+            else:
+                lines += [text, ""]
+
+        self.body_lines.extend(lines)
+        if self.main_depth is not None and self.main_depth > 0:
+            self.main_lines.extend(lines)
+
+
+def _make_html_parser(emitter):
+    """Return a parser feeding the emitter, preferring lxml's C parser"""
+    try:
+        from lxml import etree
+    except ImportError:
+        from html.parser import HTMLParser
+
+        class _Adapter(HTMLParser):
+            def handle_starttag(self, tag, attrs):
+                emitter.start(tag, dict(attrs))
+
+            def handle_startendtag(self, tag, attrs):
+                emitter.start(tag, dict(attrs))
+                if tag.lower() not in HTML_VOID_TAGS:
+                    emitter.end(tag)
+
+            def handle_endtag(self, tag):
+                emitter.end(tag)
+
+            def handle_data(self, data):
+                emitter.data(data)
+
+            def close(self):
+                super().close()
+                return emitter.close()
+
+        return _Adapter(convert_charrefs=True)
+
+    return etree.HTMLParser(target=emitter)
+
+
+@profiled("html to markdown")
 def convert_html_to_markdown(html_file, module_name):
-    """Convert Sphinx-generated HTML to Markdown format"""
-    from bs4 import BeautifulSoup
-    import re
-    
+    """Convert Sphinx-generated HTML to Markdown in a single streaming pass"""
     try:
+        emitter = HtmlMarkdownEmitter()
+        parser = _make_html_parser(emitter)
         with open(html_file, "r", encoding="utf-8") as f:
-            html_content = f.read()
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Extract the main content (usually in a div with class 'document' or 'body')
-        content_div = soup.find('div', class_='document') or soup.find('div', class_='body') or soup.find('body')
-        
-        if not content_div:
+            for chunk in iter(lambda: f.read(HTML_READ_CHUNK), ""):
+                parser.feed(chunk)
+        body_lines = parser.close()
+
+        if not body_lines:
             return ""
-        
-        # Simple HTML to Markdown conversion
-        markdown_content = []
-        
+
         # Add module anchor point
-        markdown_content.append(f'<a id="{module_name}"></a>')
-        markdown_content.append("")
-        
-        markdown_content.append(f"# {module_name}")
-        markdown_content.append("")
-        
-        # Process content elements
-        for element in content_div.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'div', 'dl', 'dt', 'dd', 'pre', 'code']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                markdown_content.append(f"{'#' * (level + 1)} {element.get_text().strip()}")
-                markdown_content.append("")
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    markdown_content.append(text)
-                    markdown_content.append("")
-            elif element.name == 'pre':
-                code_text = element.get_text().strip()
-                markdown_content.append("```python")
-                markdown_content.append(code_text)
-                markdown_content.append("```")
-                markdown_content.append("")
-            elif element.name == 'dt':
-                # Definition term (parameter name, etc.)
-                term = element.get_text().strip()
-                markdown_content.append(f"**{term}**")
-            elif element.name == 'dd':
-                # Definition description
-                desc = element.get_text().strip()
-                if desc:
-                    markdown_content.append(f"  {desc}")
-                    markdown_content.append("")
-        
-        return "\\n".join(markdown_content)
-        
+        markdown_content = [f'<a id="{module_name}"></a>', "", f"# {module_name}", ""]
+        markdown_content.extend(body_lines)
+
+        return "\n".join(markdown_content)
+
     except Exception as e:
         print(f"Error converting HTML to Markdown for {module_name}: {e}")
         return ""
 
 
+def find_reference_pages(output_dir):
+    """Return the MDX files of the reference, including class pages of split modules"""
+    output_dir = Path(output_dir)
+    return sorted(output_dir.glob("*.mdx")) + sorted(output_dir.glob("*/*.mdx"))
+
+
+def reference_bundle_pages(output_dir):
+    """Return {page: MDX file} of the reference pages, for update_llms_bundle"""
+    output_dir = Path(output_dir)
+    return {
+        f"reference/{file.relative_to(output_dir).with_suffix('').as_posix()}": file
+        for file in find_reference_pages(output_dir)
+        if file.stem != "index"
+    }
+
+
+def update_reference_bundle(output_dir, docs_json_path):
+    """Bring the reference pages in the llms.txt bundles next to docs.json up to date"""
+    bundle_dir = os.path.dirname(os.path.abspath(docs_json_path))
+    if update_llms_bundle(bundle_dir, "reference", reference_bundle_pages(output_dir)):
+        print(f"Updated {LLMS_INDEX} and {LLMS_FULL} in {bundle_dir}")
+        return True
+    return False
+
+
 def build_module_tree(mdx_files):
-    """Build module tree based on MDX file names"""
+    """Build module tree based on MDX file names
+
+    Class pages (reference/<module>/<Class>.mdx) of a module split by size
+    are grouped with the module's page in a nested navigation group.
+    """
 
     # Factory function to create new submodule dictionary
     def new_module_dict():
@@ -355,7 +813,17 @@ def build_module_tree(mdx_files):
     # Build tree structure using nested defaultdict
     module_tree = new_module_dict()
 
+    class_pages = defaultdict(list)
+    module_files = []
     for file in mdx_files:
+        if file.parent.name.startswith("camel."):
+            class_pages[file.parent.name].append(
+                f"reference/{file.parent.name}/{file.stem}"
+            )
+        else:
+            module_files.append(file)
+
+    for file in module_files:
         # Get module path from file name
         module_path = file.stem  # Remove .mdx suffix
 
@@ -369,6 +837,11 @@ def build_module_tree(mdx_files):
 
         # Build reference path
         reference_path = f"reference/{module_path}"
+        if module_path in class_pages:
+            reference_path = {
+                "group": module_path,
+                "pages": [reference_path] + sorted(class_pages[module_path]),
+            }
 
         # If it's just the camel module itself
         if len(parts) == 1:
@@ -399,24 +872,35 @@ def build_module_tree(mdx_files):
     return module_tree
 
 
-def convert_tree_to_navigation(module_tree):
-    """Convert module tree to mint.json navigation format"""
+def _navigation_sort_key(entry):
+    # Nested groups of split modules sort by their module's page
+    return entry["pages"][0] if isinstance(entry, dict) else entry
+
+
+def convert_tree_to_navigation(module_tree, module_order=None, display_names=None):
+    """Convert module tree to mint.json navigation format
+
+    module_order and display_names default to MODULE_ORDER and
+    MODULE_NAME_DISPLAY (see module_mappings).
+    """
     navigation = []
 
     # Add submodules in custom order
-    for module_name in MODULE_ORDER:
+    for module_name in MODULE_ORDER if module_order is None else module_order:
         if module_name in module_tree["submodules"]:
             submodule = module_tree["submodules"][module_name]
 
             # Get pretty display name for submodule
-            display_name = get_module_display_name(module_name)
+            display_name = get_module_display_name(module_name, display_names)
 
             # Create navigation group
             nav_group = {"group": display_name, "pages": []}
 
             # Add direct pages for this module
             if "pages" in submodule:
-                nav_group["pages"].extend(sorted(submodule["pages"]))
+                nav_group["pages"].extend(
+                    sorted(submodule["pages"], key=_navigation_sort_key)
+                )
 
             # Recursively handle submodules
             if submodule.get("submodules"):
@@ -425,7 +909,9 @@ def convert_tree_to_navigation(module_tree):
                 ):
                     if sub_data.get("pages"):
                         # Directly flatten submodule pages
-                        nav_group["pages"].extend(sorted(sub_data["pages"]))
+                        nav_group["pages"].extend(
+                            sorted(sub_data["pages"], key=_navigation_sort_key)
+                        )
 
             # Only add group if it has pages
             if nav_group["pages"]:
@@ -435,123 +921,144 @@ def convert_tree_to_navigation(module_tree):
 
 
 def update_docs_json(docs_json_path, navigation):
-    """Update the API Reference navigation section in docs.json file"""
+    """Update the API Reference navigation section in docs.json file
+
+    Only the API Reference tab is changed, under a lock, so a concurrent
+    cookbook build keeps its update (see update_json_subtree). Returns True
+    if docs.json changed.
+    """
     if not Path(docs_json_path).exists():
         print(f"Error: {docs_json_path} not found")
         return False
 
-    with open(docs_json_path, "r", encoding="utf-8") as f:
-        docs_data = json.load(f)
+    def update(tab):
+        # Preserve existing Overview group if it exists
+        overview_group = None
+        for group in tab.get("groups", []):
+            if group.get("group") == "Overview":
+                overview_group = group
+                break
 
-    # Find API Reference tab and update its groups
-    tabs = docs_data.get("navigation", {}).get("tabs", [])
-    for tab in tabs:
-        if tab.get("tab") == "API Reference":
-            # Preserve existing Overview group if it exists
-            existing_groups = tab.get("groups", [])
-            overview_group = None
-            
-            # Look for existing Overview group
-            for group in existing_groups:
-                if group.get("group") == "Overview":
-                    overview_group = group
-                    break
-            
-            # Start with Overview group if it exists, otherwise create a default one
-            if overview_group:
-                new_groups = [overview_group]
-            else:
-                new_groups = [{
-                    "group": "Overview",
-                    "pages": ["reference/index"]
-                }]
-            
-            # Add the generated navigation groups
-            new_groups.extend(navigation)
-            
-            # Update the tab groups
-            tab["groups"] = new_groups
-            break
+        # Start with Overview group if it exists, otherwise create a default one
+        if overview_group is None:
+            overview_group = {
+                "group": "Overview",
+                "pages": ["reference/index"]
+            }
+
+        # Add the generated navigation groups
+        tab["groups"] = [overview_group] + navigation
+        return tab
+
+    try:
+        return update_json_subtree(
+            docs_json_path,
+            ["navigation", "tabs", ("tab", "API Reference")],
+            update,
+        )
+    except LookupError:
+        print(f"Error: no API Reference tab in {docs_json_path}")
+        return False
+
+
+# Parsed docstrings are immutable, so identical docstrings shared by many
+# toolkits and model backends are parsed once per run
+DOCSTRING_CACHE_SIZE = 4096
+
+ParsedDocstring = namedtuple(
+    'ParsedDocstring', ['description', 'args', 'returns', 'raises', 'examples']
+)
+DocstringArg = namedtuple(
+    'DocstringArg', ['name', 'type', 'description', 'optional', 'default']
+)
+DocstringRaise = namedtuple('DocstringRaise', ['exception', 'description'])
+
+EMPTY_DOCSTRING = ParsedDocstring('', (), '', (), ())
+
+# Section headers, matched case-insensitively at the start of a line
+_SECTION_HEADER_RE = re.compile(
+    r'(?P<args>args:|arguments:|parameters:|param:)'
+    r'|(?P<returns>returns:|return:)'
+    r'|(?P<raises>raises:|raise:|except:|exceptions:)'
+    r'|(?P<examples>examples:|example:)',
+    re.IGNORECASE,
+)
+
+# Sections whose pending lines are kept when a given header starts; lines of
+# any other section are dropped. None is the end of the docstring.
+_SECTION_FLUSHES = {
+    'args': ('description',),
+    'returns': ('args',),
+    'raises': ('args', 'returns'),
+    'examples': ('args', 'returns', 'raises'),
+    None: ('description', 'args', 'returns', 'raises', 'examples'),
+}
 
-    # Save updated docs.json
-    with open(docs_json_path, "w", encoding="utf-8") as f:
-        json.dump(docs_data, f, indent=2, ensure_ascii=False)
+_ARG_START_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*\s*(\([^)]+\))?\s*:')
+_ARG_NAME_TYPE_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*\(([^)]+)\)')
+_WHITESPACE_RE = re.compile(r'\s+')
 
-    return True
+_DEFAULT_VALUE_RES = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\(default:\s*:obj:`([^`]+)`\)',
+        r'\(default:\s*([^)]+)\)',
+        r'defaults?\s+to\s+([^.,:;)]+)',
+        r'\(default:\s*([^)]*)\)',  # More flexible pattern
+    )
+]
+_TRAILING_PUNCTUATION_RE = re.compile(r'[.,:;]+$')
 
 
+@profiled("docstring")
+@functools.lru_cache(maxsize=DOCSTRING_CACHE_SIZE)
 def parse_docstring(docstring):
     """Parse a docstring and extract structured information"""
     if not docstring:
-        return {'description': '', 'args': [], 'returns': '', 'raises': [], 'examples': []}
-    
-    lines = docstring.strip().split('\n')
-    result = {
-        'description': '',
-        'args': [],
-        'returns': '',
-        'raises': [],
-        'examples': []
-    }
-    
+        return EMPTY_DOCSTRING
+
+    sections = {'description': '', 'args': [], 'returns': '', 'raises': [], 'examples': ()}
     current_section = 'description'
     current_lines = []
-    
-    for line in lines:
+
+    def flush(next_section):
+        if not current_lines or current_section not in _SECTION_FLUSHES[next_section]:
+            return
+        if current_section == 'args':
+            sections['args'].extend(parse_args_section(current_lines))
+        elif current_section == 'raises':
+            sections['raises'].extend(parse_raises_section(current_lines))
+        elif current_section == 'examples':
+            sections['examples'] = tuple(current_lines)
+        else:
+            sections[current_section] = '\n'.join(current_lines).strip()
+
+    for line in docstring.strip().split('\n'):
         line = line.strip()
-        
-        # Check for section headers
-        if line.lower().startswith(('args:', 'arguments:', 'parameters:', 'param:')):
-            if current_lines and current_section == 'description':
-                result['description'] = '\n'.join(current_lines).strip()
-            current_section = 'args'
-            current_lines = []
-        elif line.lower().startswith(('returns:', 'return:')):
-            if current_lines and current_section == 'args':
-                result['args'].extend(parse_args_section(current_lines))
-            current_section = 'returns'
-            current_lines = []
-        elif line.lower().startswith(('raises:', 'raise:', 'except:', 'exceptions:')):
-            if current_lines:
-                if current_section == 'args':
-                    result['args'].extend(parse_args_section(current_lines))
-                elif current_section == 'returns':
-                    result['returns'] = '\n'.join(current_lines).strip()
-            current_section = 'raises'
-            current_lines = []
-        elif line.lower().startswith(('examples:', 'example:')):
-            if current_lines:
-                if current_section == 'args':
-                    result['args'].extend(parse_args_section(current_lines))
-                elif current_section == 'returns':
-                    result['returns'] = '\n'.join(current_lines).strip()
-                elif current_section == 'raises':
-                    result['raises'].extend(parse_raises_section(current_lines))
-            current_section = 'examples'
+
+        header = _SECTION_HEADER_RE.match(line)
+        if header:
+            flush(header.lastgroup)
+            current_section = header.lastgroup
             current_lines = []
         else:
             current_lines.append(line)
-    
-    # Process final section
-    if current_lines:
-        if current_section == 'description':
-            result['description'] = '\n'.join(current_lines).strip()
-        elif current_section == 'args':
-            result['args'].extend(parse_args_section(current_lines))
-        elif current_section == 'returns':
-            result['returns'] = '\n'.join(current_lines).strip()
-        elif current_section == 'raises':
-            result['raises'].extend(parse_raises_section(current_lines))
-        elif current_section == 'examples':
-            result['examples'] = current_lines
-    
-    return result
+
+    flush(None)
+
+    return ParsedDocstring(
+        sections['description'],
+        tuple(sections['args']),
+        sections['returns'],
+        tuple(sections['raises']),
+        sections['examples'],
+    )
 
 
 def parse_args_section(lines):
     """Parse arguments section and extract parameter info"""
     args = []
-    current_arg = None
+    current = None
     
     for line in lines:
         line = line.strip()
@@ -559,231 +1066,312 @@ def parse_args_section(lines):
             continue
             
         # Check if this line starts a new parameter (has parameter name followed by type and colon)
-        if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*\s*(\([^)]+\))?\s*:', line):
-            # Save previous arg
-            if current_arg:
-                # Clean up description
-                current_arg['description'] = re.sub(r'\s+', ' ', current_arg['description']).strip()
-                args.append(current_arg)
+        if _ARG_START_RE.match(line):
+            if current:
+                args.append(_finish_arg(*current))
             
-            # Parse new arg
-            parts = line.split(':', 1)
-            if len(parts) == 2:
-                name_type = parts[0].strip()
-                description = parts[1].strip()
-                
-                # Extract name and type
-                type_match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s*\(([^)]+)\)', name_type)
-                if type_match:
-                    name = type_match.group(1).strip()
-                    type_info = type_match.group(2).strip()
-                else:
-                    name = name_type.strip()
-                    type_info = ''
-                
-                current_arg = {
-                    'name': name,
-                    'type': type_info,
-                    'description': description,
-                    'optional': 'optional' in description.lower(),
-                    'default': extract_default_value(description)
-                }
-        else:
+            name_type, _, description = line.partition(':')
+            name_type = name_type.strip()
+            description = description.strip()
+
+            # Extract name and type
+            type_match = _ARG_NAME_TYPE_RE.match(name_type)
+            if type_match:
+                name = type_match.group(1).strip()
+                type_info = type_match.group(2).strip()
+            else:
+                name = name_type
+                type_info = ''
+
+            # (name, type, description lines, first line of description)
+            current = (name, type_info, [description], description)
+        elif current:
             # Continuation of current arg description
-            if current_arg:
-                current_arg['description'] += ' ' + line
+            current[2].append(line)
     
-    # Add final arg
-    if current_arg:
-        # Clean up final description
-        current_arg['description'] = re.sub(r'\s+', ' ', current_arg['description']).strip()
-        args.append(current_arg)
+    if current:
+        args.append(_finish_arg(*current))
     
     return args
 
 
+def _finish_arg(name, type_info, description_lines, first_line):
+    """Build a DocstringArg once all of its description lines are known"""
+    description = _WHITESPACE_RE.sub(' ', ' '.join(description_lines)).strip()
+    return DocstringArg(
+        name,
+        type_info,
+        description,
+        'optional' in first_line.lower(),
+        extract_default_value(first_line),
+    )
+
+
 def parse_raises_section(lines):
     """Parse raises section"""
     raises = []
     for line in lines:
-        line = line.strip()
-        if ':' in line:
-            parts = line.split(':', 1)
-            if len(parts) == 2:
-                exception = parts[0].strip()
-                description = parts[1].strip()
-                raises.append({'exception': exception, 'description': description})
+        exception, separator, description = line.strip().partition(':')
+        if separator:
+            raises.append(DocstringRaise(exception.strip(), description.strip()))
     return raises
 
 
 def extract_default_value(description):
     """Extract default value from parameter description"""
     # Look for patterns like (default: value) or (default: :obj:`value`)
-    
-    patterns = [
-        r'\(default:\s*:obj:`([^`]+)`\)',
-        r'\(default:\s*([^)]+)\)',
-        r'defaults?\s+to\s+([^.,:;)]+)',
-        r'\(default:\s*([^)]*)\)'  # More flexible pattern
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, description, re.IGNORECASE)
+    for pattern in _DEFAULT_VALUE_RES:
+        match = pattern.search(description)
         if match:
             default_val = match.group(1).strip()
             # Clean up common artifacts
             default_val = default_val.replace(':obj:', '').replace('`', '')
             # Remove trailing punctuation
-            default_val = re.sub(r'[.,:;]+$', '', default_val)
+            default_val = _TRAILING_PUNCTUATION_RE.sub('', default_val)
             if default_val and default_val not in ['None', 'obj']:
                 return default_val
     
     return None
 
 
-def escape_mdx_content(text):
-    """Escape special characters in text content for MDX compatibility"""
-    if not text:
-        return text
-    
-    # Store code blocks and inline code to protect them from escaping
-    code_blocks = []
-    inline_codes = []
-    
-    # Extract and temporarily replace code blocks (```)
-    def extract_code_block(match):
-        code_blocks.append(match.group(0))
-        return f"__CODE_BLOCK_{len(code_blocks) - 1}__"
-    
-    text = re.sub(r'```[\s\S]*?```', extract_code_block, text)
-    
-    # Extract and temporarily replace inline code (`) - including our newly created ones
-    def extract_inline_code(match):
-        inline_codes.append(match.group(0))
-        return f"__INLINE_CODE_{len(inline_codes) - 1}__"
-    
-    # First extract existing inline code
-    text = re.sub(r'`[^`\n]+`', extract_inline_code, text)
-    
-    # Handle reStructuredText-style links: `text <url>`_ -> [text](url)
-    def convert_rst_links(text):
-        """Convert reStructuredText links to Markdown format"""
-        # Pattern for `text <url>`_ format
-        rst_link_pattern = r'`([^`]+)\s+<([^>]+)>`_'
-        
-        def replace_rst_link(match):
-            text_part = match.group(1).strip()
-            url_part = match.group(2).strip()
-            return f"[{text_part}]({url_part})"
-        
-        return re.sub(rst_link_pattern, replace_rst_link, text)
-    
-    # Apply reStructuredText link conversion
-    text = convert_rst_links(text)
-    
-    # Find and wrap JSON-like structures with backticks
-    def find_and_wrap_json(text):
-        """Find JSON objects in text and wrap them with backticks"""
-        result = ""
-        i = 0
-        while i < len(text):
-            if text[i] == '{':
-                # Found potential JSON start, try to find the matching closing brace
-                brace_count = 1
-                json_start = i
-                i += 1
-                has_quotes = False
-                has_colon = False
-                
-                while i < len(text) and brace_count > 0:
-                    if text[i] == '{':
-                        brace_count += 1
-                    elif text[i] == '}':
-                        brace_count -= 1
-                    elif text[i] in ['"', "'"]:
-                        has_quotes = True
-                    elif text[i] == ':':
-                        has_colon = True
-                    i += 1
-                
-                if brace_count == 0 and has_quotes and has_colon:
-                    # This looks like a complete JSON object
-                    json_content = text[json_start:i]
-                    result += f"`{json_content}`"
-                else:
-                    # Not a complete JSON, add the opening brace and continue
-                    result += text[json_start]
-                    i = json_start + 1
-            else:
-                result += text[i]
-                i += 1
-        
-        return result
-    
-    # Apply JSON wrapping
-    text = find_and_wrap_json(text)
-    
-    # Find and wrap angle bracket content that should be in code format
-    def find_and_wrap_angle_brackets(text):
-        """Find angle bracket content and wrap with backticks when appropriate"""
-        # Use regex to find all angle bracket patterns and wrap them
-        def replace_angle_brackets(match):
-            full_match = match.group(0)
-            
-            # Skip if it's already a proper HTML anchor tag like <a id="...">
-            if re.match(r'^<a\s+id=', full_match):
-                return full_match
-            
-            # For all other angle bracket content, wrap it in backticks
-            return f"`{full_match}`"
-        
-        # Pattern to match angle brackets with content inside
-        # This will match <anything> where anything doesn't contain < or >
-        pattern = r'<[^<>]+>'
-        
-        return re.sub(pattern, replace_angle_brackets, text)
-    
-    # Apply angle bracket wrapping
-    text = find_and_wrap_angle_brackets(text)
-    
-    # Find and wrap content with >= and <= operators that should be in code format
-    def find_and_wrap_comparison_operators(text):
-        """Find comparison operators and wrap them with backticks when appropriate"""
-        # Pattern for length constraints like "length >= 1 and <= 100"
-        text = re.sub(r'(length\s*>=\s*\d+\s*and\s*<=\s*\d+)', r'`\1`', text)
-        text = re.sub(r'(>=\s*\d+\s*and\s*<=\s*\d+)', r'`\1`', text)
-        
-        # Pattern for standalone comparison operators with numbers
-        text = re.sub(r'(?<!\w)(>=\s*\d+)(?!\w)', r'`\1`', text)
-        text = re.sub(r'(?<!\w)(<=\s*\d+)(?!\w)', r'`\1`', text)
-        
+# Text without any of these characters needs no MDX escaping
+_MDX_SPECIAL_RE = re.compile(r'[`{}<>]')
+
+# reStructuredText links left outside inline code: `text <url>`_
+_RST_LINK_RE = re.compile(r'`([^`]+)\s+<([^>]+)>`_')
+
+_BRACE_RE = re.compile(r'[{}]')
+_ANGLE_RE = re.compile(r'[<>]')
+_ANCHOR_TAG_RE = re.compile(r'<a\s+id=')
+
+# Numeric constraints wrapped in inline code, in the order they are applied
+_RANGE_RULES = (
+    re.compile(r'length\s*>=\s*\d+\s*and\s*<=\s*\d+'),
+    re.compile(r'>=\s*\d+\s*and\s*<=\s*\d+'),
+)
+_BOUND_RULES = (
+    re.compile(r'>=\s*\d+'),
+    re.compile(r'<=\s*\d+'),
+)
+
+# Inline code spans are kept, braces and angle brackets are escaped
+_INLINE_OR_SPECIAL_RE = re.compile(r'`[^`\n]+`|[{}<>]')
+_INLINE_CODE_RE = re.compile(r'`[^`\n]+`')
+_WORD_CHAR_RE = re.compile(r'\w')
+_LT_PRECEDING_RE = re.compile(r'[\w\s=!<>]')
+_LT_FOLLOWING_RE = re.compile(r'[\w\s=/]')
+_GT_FOLLOWING_RE = re.compile(r'[\w\s=]')
+
+# Protected spans are swapped for single private-use characters while the
+# text is processed, then restored with one str.translate
+_ATOM_BASE = 0xF0000
+_ATOM_MARK = chr(_ATOM_BASE)
+
+# Backticks inserted by each wrapping rule; later rules see earlier insertions
+_JSON_RULE, _ANGLE_RULE = 0, 1
+_RANGE_RULE_BASE = 2
+_BOUND_RULE_BASE = _RANGE_RULE_BASE + len(_RANGE_RULES)
+
+
+def _matches(pattern, char):
+    """Check a context character; protected spans behave like word characters"""
+    if not char:
+        return False
+    if char >= _ATOM_MARK:
+        return pattern is not None
+    return pattern is not None and bool(pattern.match(char))
+
+
+def _seen_char(text, inserts, gap, rule, before):
+    """Character next to a gap as seen by a rule, given earlier insertions"""
+    if any(r < rule for r in inserts.get(gap, ())):
+        return '`'
+    if before:
+        return text[gap - 1] if gap > 0 else ''
+    return text[gap] if gap < len(text) else ''
+
+
+def _wrap(inserts, start, end, rule):
+    inserts.setdefault(start, []).append(rule)
+    inserts.setdefault(end, []).append(rule)
+
+
+def _mark_json_objects(text, inserts):
+    """Wrap balanced {...} spans containing quotes and a colon"""
+    stack = []
+    closing = {}
+    for match in _BRACE_RE.finditer(text):
+        if match.group() == '{':
+            stack.append(match.start())
+        elif stack:
+            closing[stack.pop()] = match.start()
+
+    resume = 0
+    for start in sorted(closing):
+        if start < resume:
+            continue
+        end = closing[start]
+        has_quotes = text.find('"', start, end) != -1 or text.find("'", start, end) != -1
+        if has_quotes and text.find(':', start, end) != -1:
+            _wrap(inserts, start, end + 1, _JSON_RULE)
+            resume = end + 1
+
+
+def _mark_angle_brackets(text, inserts):
+    """Wrap <...> spans, except HTML anchors such as <a id="...">"""
+    positions = [match.start() for match in _ANGLE_RE.finditer(text)]
+    i = 0
+    while i < len(positions) - 1:
+        start, end = positions[i], positions[i + 1]
+        if text[start] == '<' and text[end] == '>' and end > start + 1:
+            if not _ANCHOR_TAG_RE.match(text, start):
+                _wrap(inserts, start, end + 1, _ANGLE_RULE)
+            i += 2
+        else:
+            i += 1
+
+
+def _mark_comparisons(text, inserts):
+    """Wrap numeric constraints such as "length >= 1 and <= 100" or ">= 0" """
+
+    def crosses_insert(start, end, rule):
+        return any(
+            start < gap < end and any(r < rule for r in rules)
+            for gap, rules in inserts.items()
+        )
+
+    for offset, pattern in enumerate(_RANGE_RULES):
+        rule = _RANGE_RULE_BASE + offset
+        for match in pattern.finditer(text):
+            if not crosses_insert(match.start(), match.end(), rule):
+                _wrap(inserts, match.start(), match.end(), rule)
+
+    for offset, pattern in enumerate(_BOUND_RULES):
+        rule = _BOUND_RULE_BASE + offset
+        for match in pattern.finditer(text):
+            start, end = match.start(), match.end()
+            if _matches(_WORD_CHAR_RE, _seen_char(text, inserts, start, rule, True)):
+                continue
+            if _matches(_WORD_CHAR_RE, _seen_char(text, inserts, end, rule, False)):
+                continue
+            if not crosses_insert(start, end, rule):
+                _wrap(inserts, start, end, rule)
+
+
+def _escape_outside_inline_code(text, atoms):
+    """Escape braces and angle brackets that are not inside inline code"""
+    atom_end = -1
+    escaped_lt = -1
+
+    def replace(match):
+        nonlocal atom_end, escaped_lt
+        token = match.group()
+        start = match.start()
+        if len(token) > 1:
+            atom_end = match.end()
+            return token.translate(atoms)
+
+        # Inline code spans next to a character count as word characters
+        previous = _ATOM_MARK if start == atom_end else (text[start - 1] if start else '')
+        if token in '{}':
+            return token if previous == '\\' else '\\' + token
+
+        following = text[start + 1:start + 2]
+        if following == '`' and _INLINE_CODE_RE.match(text, start + 1):
+            following = _ATOM_MARK
+
+        if token == '<':
+            if _matches(_LT_PRECEDING_RE, previous) or _matches(_LT_FOLLOWING_RE, following):
+                return token
+            escaped_lt = start
+            return '&lt;'
+
+        if escaped_lt == start - 1:
+            previous = ';'
+        if _matches(_LT_PRECEDING_RE, previous) or _matches(_GT_FOLLOWING_RE, following):
+            return token
+        return '&gt;'
+
+    return _INLINE_OR_SPECIAL_RE.sub(replace, text)
+
+
+@profiled("escape")
+def escape_mdx_content(text):
+    """Escape special characters in text content for MDX compatibility
+
+    The text is tokenized once: code blocks and inline code are protected,
+    reStructuredText links become Markdown links, JSON objects, angle bracket
+    content and numeric constraints are wrapped in inline code, and any
+    remaining braces and angle brackets are escaped for MDX.
+    """
+    if not text or not _MDX_SPECIAL_RE.search(text):
         return text
-    
-    # Apply comparison operator wrapping
-    text = find_and_wrap_comparison_operators(text)
-    
-    # Now extract ALL newly created inline code sections (including angle brackets and operators)
-    text = re.sub(r'`[^`\n]+`', extract_inline_code, text)
-    
-    # Escape remaining curly braces that would be interpreted as JavaScript expressions
-    # This will only affect braces that are NOT inside backticks now
-    text = re.sub(r'(?<!\\)\{', r'\\{', text)
-    text = re.sub(r'(?<!\\)\}', r'\\}', text)
-    
-    # Escape remaining angle brackets that could be interpreted as JSX elements
-    # But be careful not to escape legitimate comparison operators or HTML tags
-    text = re.sub(r'(?<![\w\s=!<>])<(?![\w\s=/])', r'&lt;', text)
-    text = re.sub(r'(?<![\w\s=!<>])>(?![\w\s=])', r'&gt;', text)
-    
-    # Restore inline code
-    for i, code in enumerate(inline_codes):
-        text = text.replace(f"__INLINE_CODE_{i}__", code)
-    
-    # Restore code blocks
-    for i, block in enumerate(code_blocks):
-        text = text.replace(f"__CODE_BLOCK_{i}__", block)
-    
-    return text
+
+    atoms = {}
+
+    def protect(span):
+        key = chr(_ATOM_BASE + len(atoms))
+        atoms[ord(key)] = span.translate(atoms)
+        return key
+
+    # Code blocks (```) take precedence over everything else
+    if '```' in text:
+        pieces = []
+        pos = 0
+        while True:
+            start = text.find('```', pos)
+            end = text.find('```', start + 3) if start != -1 else -1
+            if end == -1:
+                break
+            pieces.append(text[pos:start])
+            pieces.append(protect(text[start:end + 3]))
+            pos = end + 3
+        pieces.append(text[pos:])
+        text = ''.join(pieces)
+
+    # Inline code: non-empty and on a single line
+    if '`' in text:
+        pieces = []
+        pos = scan = 0
+        while True:
+            start = text.find('`', scan)
+            end = text.find('`', start + 1) if start != -1 else -1
+            if end == -1:
+                break
+            if end > start + 1 and text.find('\n', start, end) == -1:
+                pieces.append(text[pos:start])
+                pieces.append(protect(text[start:end + 1]))
+                pos = scan = end + 1
+            else:
+                scan = start + 1
+        pieces.append(text[pos:])
+        text = ''.join(pieces)
+
+    if '`' in text:
+        text = _RST_LINK_RE.sub(
+            lambda m: f"[{m.group(1).strip()}]({m.group(2).strip()})", text
+        )
+
+    # Collect the gaps where inline-code backticks are inserted
+    inserts = {}
+    if '{' in text:
+        _mark_json_objects(text, inserts)
+    if '<' in text:
+        _mark_angle_brackets(text, inserts)
+    if '>=' in text or '<=' in text:
+        _mark_comparisons(text, inserts)
+
+    if inserts:
+        pieces = []
+        pos = 0
+        for gap in sorted(inserts):
+            pieces.append(text[pos:gap])
+            pieces.append('`' * len(inserts[gap]))
+            pos = gap
+        pieces.append(text[pos:])
+        text = ''.join(pieces)
+
+    return _escape_outside_inline_code(text, atoms).translate(atoms)
 
 
 def format_code_content(content):
@@ -826,7 +1414,7 @@ def is_class_substantial(class_node):
     has_init = False
     
     for node in class_node.body:
-        if isinstance(node, ast.FunctionDef):
+        if isinstance(node, FUNCTION_NODES):
             if node.name == '__init__':
                 has_init = True
                 # Check if __init__ has substantial documentation
@@ -846,379 +1434,2456 @@ def is_class_substantial(class_node):
     return (class_doc and len(class_doc.strip()) > 20) or len(meaningful_methods) > 0
 
 
-def generate_ast_docs(module_name, output_dir):
-    """Generate documentation by parsing Python source code directly using AST"""
+def generate_ast_docs(
+    module_name,
+    output_dir,
+    package_name="camel",
+    source_root=None,
+    stats=None,
+    symbol_table=None,
+    hierarchy=None,
+    split_threshold=None,
+    model_cache=None,
+):
+    """Generate documentation by parsing Python source code directly using AST
+
+    Returns (output_file, dependencies, symbols, references, classes):
+    output_file is None if the module has nothing worth documenting,
+    dependencies the sorted in-package names the page depends on (see
+    extract_module_dependencies), symbols a Symbol for every class,
+    function and method documented on the page, and classes a ClassInfo
+    for every class in the module. If a SymbolTable is given, the module's
+    entries in it are replaced and the page is cross-linked against it
+    (see link_references); references are the names it looked up. A
+    ClassHierarchy, if given, is updated with the classes and used to show
+    inherited members (see link_inherited_members).
+    A page larger than split_threshold bytes is split into an overview and
+    one page per class (see render_split_module).
+    With a DocModelCache as model_cache, the module's documentation model
+    is reused while its source is unchanged.
+    The page is only rewritten if its content changed; stats, if given, is
+    an OutputStats counting the outcome.
+    """
+    dependencies = set()
+    symbols = []
+    classes = []
+    references = set()
+    content = render_ast_docs(
+        module_name, package_name, source_root, dependencies, symbols, classes,
+        split_threshold, model_cache,
+    )
+    if symbol_table is not None:
+        symbol_table.replace_module(module_name, symbols)
+    if hierarchy is not None:
+        hierarchy.replace_module(module_name, classes)
+
+    output_file = None
+    if content is not None:
+        output_file, written = write_module_page(
+            module_name, content, output_dir, symbol_table, references, hierarchy
+        )
+        if stats is not None:
+            stats.add(written)
+    return output_file, sorted(dependencies), symbols, references, classes
+
+
+def write_module_page(
+    module_name,
+    content,
+    output_dir,
+    symbol_table=None,
+    references=None,
+    hierarchy=None,
+    url_root=None,
+):
+    """Finish a rendered page and write it if changed
+
+    Inherited members are added if a ClassHierarchy is given, and the page
+    is cross-linked if a SymbolTable is given. The class pages of a split
+    module are finished and written alike, and class pages the module no
+    longer has are removed. Links to reference pages point below url_root
+    instead of /reference, if given. Returns (output_file, written): the
+    module's page, and whether any of its pages was written.
+    """
+    written = False
+    pages = []
+    for page, text in iter_module_pages(content, module_name):
+        if hierarchy is not None:
+            with profile_stage("inherited members"):
+                text = link_inherited_members(text, module_name, hierarchy, page)
+        if symbol_table is not None:
+            with profile_stage("xref"):
+                text = link_references(text, module_name, symbol_table, references, page)
+        if url_root is not None:
+            text = text.replace("](/reference/", f"]({url_root}/")
+        page_path = page_file(output_dir, page)
+        if pages:
+            os.makedirs(os.path.dirname(page_path), exist_ok=True)
+        written = write_if_changed(page_path, text) or written
+        pages.append(page)
+    remove_stale_class_pages(output_dir, module_name, pages)
+    return page_file(output_dir, pages[0]), written
+
+
+def page_file(output_dir, page):
+    """Return the MDX file of a page such as reference/camel.agents/ChatAgent"""
+    return os.path.join(output_dir, *page.split('/')[1:]) + ".mdx"
+
+
+def remove_stale_class_pages(output_dir, module_name, pages=()):
+    """Delete the class pages of a module that are not among pages
+
+    Class pages live in a directory named after the module, which is
+    removed once empty. Returns the number of pages deleted.
+    """
+    directory = os.path.join(output_dir, module_name)
+    if not os.path.isdir(directory):
+        return 0
+    keep = {page_file(output_dir, page) for page in pages}
+    removed = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.endswith(".mdx") and path not in keep:
+            os.remove(path)
+            removed += 1
+    with contextlib.suppress(OSError):
+        os.rmdir(directory)  # Only succeeds once no pages are left
+    return removed
+
+
+def render_ast_docs(
+    module_name,
+    package_name="camel",
+    source_root=None,
+    dependencies=None,
+    symbols=None,
+    classes=None,
+    split_threshold=None,
+    model_cache=None,
+):
+    """Render a module's page from its source without writing it
+
+    Returns the MDX content, or None if the module has nothing worth
+    documenting. If a set is passed as dependencies, it is filled with the
+    in-package names the page depends on; lists passed as symbols and
+    classes receive the page's Symbols and the module's ClassInfos (see
+    generate_ast_docs). A page larger than split_threshold bytes is split
+    into an overview and one page per class (see render_split_module).
+    With a DocModelCache as model_cache, the module's documentation model
+    is reused while its source is unchanged.
+    """
+    # Resolve the source file from disk; the module is never imported,
+    # so missing optional dependencies do not prevent documentation
+    module_file = find_module_source(module_name, package_name, source_root)
+    if not module_file:
+        return None
+
     try:
-        # Import the module to get the file path
-        module = importlib.import_module(module_name)
-        if not hasattr(module, '__file__') or not module.__file__:
-            return None
-            
-        module_file = module.__file__
-        if module_file.endswith('.pyc'):
-            module_file = module_file[:-1]  # Remove 'c' to get .py file
-            
-        if not os.path.exists(module_file):
-            return None
-        
-        # Parse the source file
         with open(module_file, 'r', encoding='utf-8') as f:
             source_code = f.read()
-        
-        tree = ast.parse(source_code)
-        
-        # Extract module-level docstring
-        module_doc = ast.get_docstring(tree) or ""
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error generating docs for {module_name}: {e}")
+        return None
+
+    return render_module_source(
+        module_name, source_code, module_file.endswith("__init__.py"),
+        package_name, dependencies, symbols, classes, split_threshold,
+        model_cache,
+    )
+
+
+def render_module_source(
+    module_name,
+    source_code,
+    is_package=False,
+    package_name="camel",
+    dependencies=None,
+    symbols=None,
+    classes=None,
+    split_threshold=None,
+    model_cache=None,
+):
+    """Render a module's page from its source code, as render_ast_docs does
+
+    is_package tells whether the source is a package's __init__.py. With a
+    DocModelCache, the module's ModuleDoc is read from it rather than
+    extracted from the source.
+    """
+    try:
+        if model_cache is not None:
+            model = model_cache.get(module_name, source_code, is_package, package_name)
+        else:
+            model = extract_module_doc(module_name, source_code, is_package, package_name)
+
+        if dependencies is not None:
+            dependencies.update(model.dependencies)
         
         # Generate markdown content
-        markdown_lines = []
+        head = []
         
         # Add module anchor point
-        markdown_lines.append(f'<a id="{module_name}"></a>')
-        markdown_lines.append("")
+        head.append(f'<a id="{module_name}"></a>')
+        head.append("")
         
-        if module_doc:
-            escaped_module_doc = escape_mdx_content(module_doc)
-            markdown_lines.append(escaped_module_doc)
-            markdown_lines.append("")
+        if model.description:
+            escaped_module_doc = escape_mdx_content(model.description)
+            head.append(escaped_module_doc)
+            head.append("")
         
         # Process classes and functions
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                if is_class_substantial(node):
-                    class_md = generate_class_docs(node, module_name)
-                    markdown_lines.extend(class_md)
-            elif isinstance(node, ast.FunctionDef) and node.col_offset == 0:  # Top-level functions only
-                func_md = generate_function_docs(node, module_name)
-                markdown_lines.extend(func_md)
+        sections = []  # (member, lines) in declaration order
+        for member in model.members:
+            if member.kind == "class":
+                if member.documented:
+                    sections.append((member, generate_class_docs(member, module_name)))
+            else:  # Top-level functions only
+                sections.append((member, generate_function_docs(member, module_name)))
         
-        # Write output
-        if not is_content_substantial('\n'.join(markdown_lines)):
+        markdown_lines = head + [line for _member, lines in sections for line in lines]
+        content = '\n'.join(markdown_lines)
+        substantial = is_content_substantial(content)
+
+        class_pages = {}
+        if (
+            substantial
+            and split_threshold
+            and len(content.encode('utf-8')) > split_threshold
+        ):
+            content, class_pages = render_split_module(module_name, head, sections, content)
+
+        page_symbols = []
+        for member, _lines in sections:
+            if member.kind == "class":
+                page_symbols.extend(
+                    collect_class_symbols(member, module_name, class_pages.get(member.name))
+                )
+            else:
+                page_symbols.append(
+                    make_function_symbol(member, "function", module_name, module_name)
+                )
+
+        if classes is not None:
+            outlines = model.class_outlines()
+            if not substantial:
+                # Still recorded: undocumented classes can be bases of others
+                outlines = [info._replace(page=None) for info in outlines]
+            elif class_pages:
+                outlines = [
+                    info._replace(page=class_pages.get(info.name.rpartition('.')[2], info.page))
+                    if info.page else info
+                    for info in outlines
+                ]
+            classes.extend(outlines)
+        if not substantial:
             return None
-            
-        output_file = os.path.join(output_dir, f"{module_name}.mdx")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(markdown_lines))
+        if symbols is not None:
+            symbols.extend(page_symbols)
         
-        return output_file
+        return content
         
     except Exception as e:
         print(f"Error generating docs for {module_name}: {e}")
         return None
 
 
-def generate_class_docs(class_node, module_name):
-    """Generate documentation for a class"""
-    lines = []
-    
-    # Class anchor point
-    class_name = class_node.name
-    lines.append(f'<a id="{module_name}.{class_name}"></a>')
-    lines.append("")
-    
-    # Class header without backticks
-    lines.append(f"## {class_name}")
-    lines.append("")
-    
-    # Class signature in Python code block
-    # Get class signature with base classes
-    bases = []
-    for base in class_node.bases:
-        if isinstance(base, ast.Name):
-            bases.append(base.id)
-        elif isinstance(base, ast.Attribute):
-            bases.append(f"{base.attr}")
-    
-    signature = f"class {class_name}"
-    if bases:
-        signature += f"({', '.join(bases)})"
-    signature += ":"
-    
-    lines.append("```python")
-    lines.append(signature)
-    lines.append("```")
-    lines.append("")
-    
-    # Class docstring
-    class_doc = ast.get_docstring(class_node)
-    if class_doc:
-        doc_info = parse_docstring(class_doc)
-        
-        if doc_info['description']:
-            escaped_description = escape_mdx_content(doc_info['description'])
-            lines.append(escaped_description)
-            lines.append("")
-        
-        if doc_info['args']:
-            lines.append("**Parameters:**")
-            lines.append("")
-            for arg in doc_info['args']:
-                type_str = f" ({format_code_content(arg['type'])})" if arg['type'] else ""
-                default_str = f" (default: {format_code_content(arg['default'])})" if arg['default'] else ""
-                escaped_description = escape_mdx_content(arg['description'])
-                lines.append(f"- **{arg['name']}**{type_str}: {escaped_description}{default_str}")
-            lines.append("")
-    
-    # Process methods
-    for node in class_node.body:
-        if isinstance(node, ast.FunctionDef):
-            method_lines = generate_method_docs(node, class_name, module_name)
-            lines.extend(method_lines)
-    
-    return lines
-
+# Starts each class page within the content of a split module (see
+# render_split_module); never written out. Python source cannot contain
+# null bytes, so no docstring can produce one.
+_PAGE_BREAK = "\x00page:"
 
-def generate_function_docs(func_node, module_name):
-    """Generate documentation for a function"""
-    lines = []
-    
-    # Function anchor point
-    function_name = func_node.name
-    lines.append(f'<a id="{module_name}.{function_name}"></a>')
-    lines.append("")
-    
-    # Function header without backticks
-    lines.append(f"## {function_name}")
-    lines.append("")
-    
-    # Function signature in Python code block
-    signature = generate_function_signature(func_node, multiline=True)
-    
-    lines.append("```python")
-    lines.append(f"def {signature}:")
-    lines.append("```")
-    lines.append("")
-    
-    # Function docstring
-    func_doc = ast.get_docstring(func_node)
-    if func_doc:
-        doc_info = parse_docstring(func_doc)
-        
-        if doc_info['description']:
-            escaped_description = escape_mdx_content(doc_info['description'])
-            lines.append(escaped_description)
-            lines.append("")
-        
-        if doc_info['args']:
-            lines.append("**Parameters:**")
-            lines.append("")
-            for arg in doc_info['args']:
-                type_str = f" ({format_code_content(arg['type'])})" if arg['type'] else ""
-                default_str = f" (default: {format_code_content(arg['default'])})" if arg['default'] else ""
-                escaped_description = escape_mdx_content(arg['description'])
-                lines.append(f"- **{arg['name']}**{type_str}: {escaped_description}{default_str}")
-            lines.append("")
-        
-        if doc_info['returns']:
-            lines.append("**Returns:**")
-            lines.append("")
-            escaped_returns = escape_mdx_content(doc_info['returns'])
-            lines.append(f"  {escaped_returns}")
-            lines.append("")
-        
-        if doc_info['raises']:
-            lines.append("**Raises:**")
-            lines.append("")
-            for exc in doc_info['raises']:
-                escaped_description = escape_mdx_content(exc['description'])
-                lines.append(f"- **{format_code_content(exc['exception'])}**: {escaped_description}")
-            lines.append("")
-    
-    return lines
 
+def render_split_module(module_name, head, sections, content):
+    """Move the class sections of a large module page onto pages of their own
 
-def generate_method_docs(method_node, class_name, module_name):
-    """Generate documentation for a class method"""
-    lines = []
-    
-    # Method anchor point  
-    method_name = method_node.name
-    lines.append(f'<a id="{module_name}.{class_name}.{method_name}"></a>')
-    lines.append("")
-    
-    # Method header without backticks
-    lines.append(f"### {method_name}")
-    lines.append("")
-    
-    # Method signature in Python code block
-    signature = generate_function_signature(method_node, multiline=True)
-    
-    lines.append("```python")
-    lines.append(f"def {signature}:")
-    lines.append("```")
-    lines.append("")
-    
-    # Method docstring
-    method_doc = ast.get_docstring(method_node)
-    if method_doc:
-        doc_info = parse_docstring(method_doc)
-        
-        if doc_info['description']:
-            escaped_description = escape_mdx_content(doc_info['description'])
-            lines.append(escaped_description)
-            lines.append("")
-        
-        if doc_info['args']:
-            lines.append("**Parameters:**")
-            lines.append("")
-            for arg in doc_info['args']:
-                # Skip 'self' parameter
-                if arg['name'] == 'self':
-                    continue
-                type_str = f" ({format_code_content(arg['type'])})" if arg['type'] else ""
-                default_str = f" (default: {format_code_content(arg['default'])})" if arg['default'] else ""
-                escaped_description = escape_mdx_content(arg['description'])
-                lines.append(f"- **{arg['name']}**{type_str}: {escaped_description}{default_str}")
-            lines.append("")
-        
-        if doc_info['returns']:
-            lines.append("**Returns:**")
-            lines.append("")
-            escaped_returns = escape_mdx_content(doc_info['returns'])
-            lines.append(f"  {escaped_returns}")
-            lines.append("")
-    
-    return lines
+    sections are the (member, lines) pairs rendered for the module's classes
+    and functions. The module's page keeps its docstring and functions and
+    lists the classes, linking each to reference/<module>/<Class>, a page
+    that starts with a link back to the module. Returns (content, {class
+    name: page}); the content of each class page follows a _PAGE_BREAK line
+    (see iter_module_pages). A module documenting a single class and nothing
+    else is returned unchanged, as splitting would shrink nothing.
+    """
+    class_docs = {}
+    for member, _lines in sections:
+        if member.kind == "class":
+            class_docs.setdefault(member.name, member)
+    if not class_docs or len(sections) < 2:
+        return content, {}
 
+    class_pages = {
+        name: f"reference/{module_name}/{name}" for name in class_docs
+    }
+    overview = list(head)
+    overview.extend(["**Classes:**", ""])
+    for name, class_doc in class_docs.items():
+        summary = escape_mdx_content(class_doc.summary)
+        link = f"[`{name}`](/{class_pages[name]})"
+        overview.append(f"- {link}: {summary}" if summary else f"- {link}")
+    overview.append("")
 
-def generate_function_signature(func_node, multiline=False):
-    """Generate function signature from AST node"""
-    args = []
-    
-    # Regular arguments
-    for arg in func_node.args.args:
-        arg_str = arg.arg
-        if arg.annotation:
-            arg_str += f": {ast.unparse(arg.annotation)}"
-        args.append(arg_str)
-    
-    # Default values
-    num_defaults = len(func_node.args.defaults)
-    if num_defaults > 0:
-        for i, default in enumerate(func_node.args.defaults):
-            arg_index = len(func_node.args.args) - num_defaults + i
-            args[arg_index] += f" = {ast.unparse(default)}"
-    
-    # *args
-    if func_node.args.vararg:
-        vararg_str = f"*{func_node.args.vararg.arg}"
-        if func_node.args.vararg.annotation:
-            vararg_str += f": {ast.unparse(func_node.args.vararg.annotation)}"
-        args.append(vararg_str)
-    
-    # **kwargs
-    if func_node.args.kwarg:
-        kwarg_str = f"**{func_node.args.kwarg.arg}"
-        if func_node.args.kwarg.annotation:
-            kwarg_str += f": {ast.unparse(func_node.args.kwarg.annotation)}"
-        args.append(kwarg_str)
-    
-    # Format signature based on length and multiline preference
-    if multiline and (len(args) > 3 or sum(len(arg) for arg in args) > 60):
-        # Multi-line format
-        if args:
-            formatted_args = ',\n    '.join(args)
-            return f"{func_node.name}(\n    {formatted_args}\n)"
+    back_link = f"Defined in [`{module_name}`](/reference/{module_name})."
+    pages = {
+        page: [f"{_PAGE_BREAK}{page}", back_link, ""]
+        for page in class_pages.values()
+    }
+    for member, lines in sections:
+        if member.kind == "class":
+            pages[class_pages[member.name]].extend(lines)
         else:
-            return f"{func_node.name}()"
-    else:
-        # Single-line format
-        return f"{func_node.name}({', '.join(args)})"
+            overview.extend(lines)
 
+    lines = overview + [line for page in pages.values() for line in page]
+    return '\n'.join(lines), class_pages
 
-def generate_custom_docs(modules, output_dir, package_name="camel"):
-    """Generate documentation using custom AST parser"""
-    os.makedirs(output_dir, exist_ok=True)
-    
-    generated_count = 0
-    skipped_count = 0
-    
-    for i, module in enumerate(modules):
-        print(f"  [{i+1}/{len(modules)}] Processing {module}...")
-        
-        output_file = generate_ast_docs(module, output_dir)
-        if output_file:
-            print(f"    Generated {os.path.basename(output_file)}")
-            generated_count += 1
-        else:
-            print(f"    Skipped {module} (insufficient content)")
-            skipped_count += 1
-    
-    return generated_count, skipped_count
 
+def iter_module_pages(content, module_name):
+    """Yield (page, content) for the module's page and any class pages"""
+    chunks = content.split(f"\n{_PAGE_BREAK}")
+    yield f"reference/{module_name}", chunks[0]
+    for chunk in chunks[1:]:
+        page, _, text = chunk.partition('\n')
+        yield page, text
 
-def discover_module_structure(package_name="camel"):
-    """Dynamically discover the module structure from the actual package"""
-    try:
-        package = importlib.import_module(package_name)
-        package_path = os.path.dirname(package.__file__)
-        
-        module_structure = {}
-        
-        # Walk through the package directory
-        for root, dirs, files in os.walk(package_path):
-            # Skip __pycache__ and hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('__pycache__') and not d.startswith('.')]
-            
-            # Get relative path from package root
-            rel_path = os.path.relpath(root, package_path)
-            if rel_path == '.':
-                current_module = package_name
-            else:
-                current_module = f"{package_name}.{rel_path.replace(os.sep, '.')}"
-            
-            # Check if this directory has an __init__.py (making it a package)
-            if '__init__.py' in files:
-                # Get the top-level module name
-                parts = current_module.split('.')
-                if len(parts) >= 2:  # camel.something
-                    top_level = parts[1]
-                    if top_level not in module_structure:
-                        module_structure[top_level] = {
-                            'display_name': get_module_display_name(top_level),
-                            'modules': []
-                        }
-        
-        # Now get all actual importable modules
-        all_modules = get_all_modules(package_name)
-        
-        # Organize modules by top-level package
-        for module in all_modules:
-            parts = module.split('.')
-            if len(parts) >= 2:  # camel.something
-                top_level = parts[1]
-                if top_level in module_structure:
-                    module_structure[top_level]['modules'].append(module)
-        
-        return module_structure
-        
-    except ImportError as e:
-        print(f"Error discovering package structure: {e}")
-        return {}
 
+Symbol = namedtuple(
+    "Symbol", ["name", "module", "kind", "page", "anchor", "signature", "summary"]
+)
 
-def update_module_mappings():
-    """Update MODULE_NAME_DISPLAY based on discovered modules"""
-    global MODULE_NAME_DISPLAY, MODULE_ORDER
-    
-    structure = discover_module_structure()
-    
-    # Update display names for discovered modules
-    for module_name in structure.keys():
-        if module_name not in MODULE_NAME_DISPLAY:
-            # Convert snake_case to Title Case
-            display_name = module_name.replace('_', ' ').title()
-            MODULE_NAME_DISPLAY[module_name] = display_name
-    
-    # Update module order to include newly discovered modules
-    discovered_modules = list(structure.keys())
-    existing_order = [m for m in MODULE_ORDER if m in discovered_modules]
-    new_modules = [m for m in discovered_modules if m not in MODULE_ORDER]
+
+def make_function_symbol(func_doc, kind, parent_name, module_name, page=None):
+    """Return the Symbol of a documented function or method
+
+    page defaults to the module's page.
+    """
+    name = f"{parent_name}.{func_doc.name}"
+    return Symbol(
+        name, module_name, kind, page or f"reference/{module_name}", name,
+        f"{func_doc.keyword} {func_doc.signature}", func_doc.summary,
+    )
+
+
+def collect_class_symbols(class_doc, module_name, page=None):
+    """Return Symbols for a documented class and each of its methods"""
+    name = f"{module_name}.{class_doc.name}"
+    page = page or f"reference/{module_name}"
+    symbols = [Symbol(
+        name, module_name, "class", page, name,
+        class_doc.signature, class_doc.summary,
+    )]
+    for method_doc in class_doc.methods:
+        symbols.append(make_function_symbol(method_doc, "method", name, module_name, page))
+    return symbols
+
+
+class SymbolTable:
+    """Documented symbols keyed by every name a docstring may use for them
+
+    Besides fully qualified names, each symbol is reachable through its
+    dotted suffixes ("ChatAgent", "chat_agent.ChatAgent.step"). A suffix
+    shared by several symbols is ambiguous and never resolves. Names that go
+    through a package re-export ("camel.agents.ChatAgent") are matched
+    against symbols defined below that package. Every lookup is a handful
+    of dict accesses.
+    """
+
+    def __init__(self, symbols=()):
+        self.symbols = {}
+        self.suffixes = defaultdict(set)
+        self.modules = defaultdict(list)
+        for symbol in symbols:
+            self.add(symbol)
+
+    @staticmethod
+    def _suffixes(symbol):
+        local = symbol.name[len(symbol.module) + 1:]
+        yield local
+        module_parts = symbol.module.split('.')
+        for i in range(len(module_parts) - 1, 0, -1):
+            yield f"{'.'.join(module_parts[i:])}.{local}"
+
+    def add(self, symbol):
+        if symbol.name in self.symbols:
+            return  # The first definition owns the anchor
+        self.symbols[symbol.name] = symbol
+        self.modules[symbol.module].append(symbol)
+        for suffix in self._suffixes(symbol):
+            self.suffixes[suffix].add(symbol.name)
+
+    def replace_module(self, module, symbols):
+        """Replace the symbols documented on a module's page"""
+        for symbol in self.modules.pop(module, ()):
+            del self.symbols[symbol.name]
+            for suffix in self._suffixes(symbol):
+                self.suffixes[suffix].discard(symbol.name)
+        for symbol in symbols:
+            self.add(symbol)
+
+    def copy(self):
+        table = SymbolTable()
+        table.symbols = dict(self.symbols)
+        table.suffixes = defaultdict(set, {k: set(v) for k, v in self.suffixes.items()})
+        table.modules = defaultdict(list, {k: list(v) for k, v in self.modules.items()})
+        return table
+
+    def resolve(self, name, module=None):
+        """Return the Symbol a reference made from module's page points to, or None"""
+        symbol = self.symbols.get(name)
+        if symbol is None and module:
+            symbol = self.symbols.get(f"{module}.{name}")
+        if symbol is not None:
+            return symbol
+
+        names = self.suffixes.get(name)
+        if names and len(names) == 1:
+            return self.symbols[next(iter(names))]
+
+        # camel.types.ModelType -> ModelType defined somewhere in camel.types
+        prefix, local = name, ""
+        while '.' in prefix:
+            prefix, _, last = prefix.rpartition('.')
+            local = f"{last}.{local}" if local else last
+            candidates = [
+                candidate for candidate in self.suffixes.get(local, ())
+                if candidate.startswith(prefix + '.')
+            ]
+            if len(candidates) == 1:
+                return self.symbols[candidates[0]]
+        return None
+
+
+ClassInfo = namedtuple(
+    "ClassInfo", ["name", "module", "bases", "methods", "page"]
+)
+
+
+def _method_digests(info):
+    """Return {method name: docstring digest}; names defined twice map to None"""
+    digests = {}
+    for name, digest in info.methods:
+        digests[name] = None if name in digests else digest
+    return digests
+
+
+class ClassHierarchy:
+    """Every class of the package with its in-package bases, across modules
+
+    Classes are kept per module in a SymbolTable, whose name resolution
+    (including package re-exports such as camel.toolkits.BaseToolkit) is
+    reused to resolve base names, so a build can load the classes of
+    unchanged modules from the cache and replace only the modules it
+    regenerates. Method resolution orders are memoized until the next
+    change.
+    """
+
+    def __init__(self, classes=()):
+        self.table = SymbolTable(classes)
+        self._mro = {}
+
+    def replace_module(self, module, classes):
+        """Replace the classes defined in a module"""
+        self.table.replace_module(module, classes)
+        self._mro.clear()
+
+    def copy(self):
+        hierarchy = ClassHierarchy()
+        hierarchy.table = self.table.copy()
+        return hierarchy
+
+    def classes(self, module):
+        """Return the ClassInfos of a module's classes"""
+        return self.table.modules.get(module, ())
+
+    def mro(self, name):
+        """Return the ClassInfos of a class and its known ancestors in MRO order"""
+        mro = self._mro.get(name)
+        if mro is None:
+            self._mro[name] = []  # Cuts inheritance cycles short
+            info = self.table.symbols.get(name)
+            mro = self._linearize(info) if info else []
+            self._mro[name] = mro
+        return mro
+
+    def _linearize(self, info):
+        bases = []
+        for base in info.bases:
+            resolved = self.table.resolve(base, info.module)
+            if resolved and resolved.name != info.name and resolved.name not in bases:
+                bases.append(resolved.name)
+
+        # C3 linearization as Python computes __mro__, over in-package bases
+        sequences = [
+            [ancestor.name for ancestor in self.mro(base)] for base in bases
+        ] + [bases]
+        names = [info.name]
+        while True:
+            sequences = [sequence for sequence in sequences if sequence]
+            if not sequences:
+                break
+            for sequence in sequences:
+                head = sequence[0]
+                if not any(head in other[1:] for other in sequences):
+                    break
+            else:
+                # Leaving external bases out can make the order inconsistent;
+                # fall back to depth-first order
+                for sequence in sequences:
+                    names.extend(name for name in sequence if name not in names)
+                break
+            names.append(head)
+            for sequence in sequences:
+                if sequence[0] == head:
+                    del sequence[0]
+
+        return [self.table.symbols[name] for name in names]
+
+    def inherited_members(self, name):
+        """Return [(ancestor ClassInfo, method names)] of inherited public methods
+
+        Methods are attributed to the first class in the MRO defining them,
+        and those the class itself defines are left out.
+        """
+        mro = self.mro(name)
+        if len(mro) < 2:
+            return []
+        seen = {method for method, _digest in mro[0].methods}
+        groups = []
+        for ancestor in mro[1:]:
+            methods = []
+            for method, _digest in ancestor.methods:
+                if method not in seen and not method.startswith('_'):
+                    methods.append(method)
+                seen.add(method)
+            if methods:
+                groups.append((ancestor, methods))
+        return groups
+
+    def documentation_source(self, name, method):
+        """Return the documented ancestor whose docstring an override repeats
+
+        The ancestor is the class whose section actually holds the text: if
+        the overridden method itself repeats its parent's docstring, the
+        search continues from there. Returns None if the override has its
+        own docstring (or none at all).
+        """
+        info = self.table.symbols.get(name)
+        digest = _method_digests(info).get(method) if info else None
+        if not digest:
+            return None
+        for ancestor in self.mro(name)[1:]:
+            digests = _method_digests(ancestor)
+            if method not in digests:
+                continue
+            if digests[method] != digest:
+                return None
+            source = self.documentation_source(ancestor.name, method)
+            return source or (ancestor if ancestor.page else None)
+        return None
+
+
+# Sphinx roles as they survive into rendered pages, e.g. :obj:`ChatAgent`
+_XREF_ROLE_RE = re.compile(
+    r':(?:py:)?(?:obj|class|func|meth|attr|mod|data|exc|const|any):`([~!]?)([^`]+)`'
+)
+_XREF_EXPLICIT_TITLE_RE = re.compile(r'^(.+?)\s*<([^<>]+)>$')
+_XREF_PARAMETER_RE = re.compile(r'^(- \*\*[^*]+\*\* \()([^)`]*)\)')
+_XREF_RAISES_RE = re.compile(r'^(- \*\*)([A-Za-z_][\w.]*)\*\*:')
+_XREF_NAME_RE = re.compile(r'[A-Za-z_][\w.]*')
+
+
+def link_references(content, module_name, table, references=None, page=None):
+    """Turn Sphinx roles and documented type names on a page into links
+
+    :obj:`X`-style roles become links to X's anchor, or plain inline code
+    when X is not documented. Class names in parameter types and raised
+    exception names are linked when they resolve to a documented class.
+    Fenced code blocks are left untouched. Every name looked up is added
+    to references, so the page can be relinked when it starts or stops
+    resolving. page is the page being linked, by default the module's.
+    """
+    if references is None:
+        references = set()
+    page = page or f"reference/{module_name}"
+
+    def url_for(name, classes_only=False):
+        name = name.strip().removesuffix("()")
+        references.add(name)
+        symbol = table.resolve(name, module_name)
+        if symbol is None or (classes_only and symbol.kind != "class"):
+            return None
+        if symbol.page == page:
+            return f"#{symbol.anchor}"
+        return f"/{symbol.page}#{symbol.anchor}"
+
+    def link_role(match):
+        modifier, target = match.groups()
+        title = _XREF_EXPLICIT_TITLE_RE.match(target)
+        if title:
+            shown, target = title.groups()
+        elif modifier == "~":
+            shown = target.rpartition('.')[2]
+        else:
+            shown = target
+        url = None if modifier == "!" else url_for(target)
+        return f"[`{shown}`]({url})" if url else f"`{shown}`"
+
+    def link_name(match):
+        url = url_for(match.group(0), classes_only=True)
+        return f"[{match.group(0)}]({url})" if url else match.group(0)
+
+    lines = content.split('\n')
+    in_fence = False
+    section = None
+    for i, line in enumerate(lines):
+        if line.startswith("```"):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        if line.startswith("#"):
+            section = None
+        elif line.startswith("**") and line.endswith(":**"):
+            section = line
+            continue
+
+        if line.startswith("- **"):
+            if section == "**Parameters:**":
+                match = _XREF_PARAMETER_RE.match(line)
+                if match:
+                    types = _XREF_NAME_RE.sub(link_name, match.group(2))
+                    line = f"{match.group(1)}{types}{line[match.end(2):]}"
+            elif section == "**Raises:**":
+                match = _XREF_RAISES_RE.match(line)
+                if match:
+                    url = url_for(match.group(2), classes_only=True)
+                    if url:
+                        line = f"{match.group(1)}[{match.group(2)}]({url}){line[match.end(2):]}"
+        if ":`" in line:
+            line = _XREF_ROLE_RE.sub(link_role, line)
+        lines[i] = line
+
+    return '\n'.join(lines)
+
+
+_ANCHOR_LINE_RE = re.compile(r'^<a id="([^"]+)"></a>$')
+
+
+def link_inherited_members(content, module_name, hierarchy, page=None):
+    """Show inherited members on class sections and collapse repeated docstrings
+
+    Every class section ends with the public methods the class inherits from
+    in-package ancestors, listed by name under a link to the defining class.
+    An overriding method whose docstring repeats the overridden one keeps
+    its heading and signature, and its text is replaced by a link to the
+    ancestor's section. page is the page being linked, by default the
+    module's.
+    """
+    page = page or f"reference/{module_name}"
+    classes = {
+        info.name for info in hierarchy.classes(module_name)
+        if info.bases and info.page == page
+    }
+    if not classes:
+        return content
+
+    def url_for(info, member=None):
+        anchor = f"{info.name}.{member}" if member else info.name
+        if info.page == page:
+            return f"#{anchor}"
+        return f"/{info.page}#{anchor}"
+
+    def inherited_lines(name):
+        groups = hierarchy.inherited_members(name)
+        if not groups:
+            return []
+        lines = ["**Inherited members:**", ""]
+        for ancestor, methods in groups:
+            owner = ancestor.name.rpartition('.')[2]
+            if ancestor.page:
+                owner = f"[{owner}]({url_for(ancestor)})"
+            names = ", ".join(f"`{method}`" for method in methods)
+            lines.append(f"- From {owner}: {names}")
+        lines.append("")
+        return lines
+
+    output = []
+    current = None  # Class whose section is being copied
+    collapsed = None  # Replacement text of the method being collapsed
+    fences = 0
+    in_fence = False
+    for line in content.split('\n'):
+        is_fence = line.startswith("```")
+        if is_fence:
+            in_fence = not in_fence
+        match = None if in_fence or is_fence else _ANCHOR_LINE_RE.match(line)
+        if match:
+            owner, _, member = match.group(1).rpartition('.')
+            collapsed = None
+            if current is not None and owner == current:
+                source = hierarchy.documentation_source(current, member)
+                if source is not None:
+                    short = source.name.rpartition('.')[2]
+                    collapsed = f"Documented in [`{short}.{member}`]({url_for(source, member)})."
+                    fences = 0
+            else:
+                if current is not None:
+                    output.extend(inherited_lines(current))
+                current = match.group(1) if match.group(1) in classes else None
+        elif collapsed is not None:
+            # Keep the heading and signature block, drop the docstring
+            if fences == 2:
+                continue
+            if is_fence:
+                fences += 1
+                if fences == 2:
+                    output.extend([line, "", collapsed, ""])
+                    continue
+        output.append(line)
+
+    if current is not None:
+        output.extend(inherited_lines(current))
+    return '\n'.join(output)
+
+
+# Function definitions of either kind; async ones render as "async def"
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Statements whose bodies are searched for declarations
+_TRY_NODES = (ast.Try, ast.TryStar) if hasattr(ast, "TryStar") else (ast.Try,)
+_DECLARATION_CONTAINERS = (ast.ClassDef, ast.If, ast.ExceptHandler) + _TRY_NODES
+
+
+def _declaration_children(node):
+    """Return the statements of a node that may hold documented declarations"""
+    if isinstance(node, _TRY_NODES):
+        return node.body + node.handlers + node.orelse + node.finalbody
+    if isinstance(node, ast.If):
+        return node.body + node.orelse
+    return node.body
+
+
+def iter_declarations(tree):
+    """Yield documented classes and top-level functions, breadth first
+
+    Only module and class bodies (and if/try blocks within them) are
+    descended, so function bodies are never visited and classes defined
+    inside functions are not documented. Declarations come out in the same
+    order as from ast.walk.
+    """
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        for child in _declaration_children(node):
+            if isinstance(child, ast.ClassDef):
+                yield child
+            elif isinstance(child, FUNCTION_NODES):
+                if node is tree:
+                    yield child
+                continue
+            if isinstance(child, _DECLARATION_CONTAINERS):
+                queue.append(child)
+
+
+def _iter_module_statements(body):
+    """Yield module-level statements, descending into if/try blocks"""
+    for node in body:
+        yield node
+        if isinstance(node, ast.If):
+            yield from _iter_module_statements(node.body)
+            yield from _iter_module_statements(node.orelse)
+        elif isinstance(node, _TRY_NODES):
+            yield from _iter_module_statements(node.body)
+            for handler in node.handlers:
+                yield from _iter_module_statements(handler.body)
+            yield from _iter_module_statements(node.orelse)
+            yield from _iter_module_statements(node.finalbody)
+
+
+def _dotted_name(node):
+    """Return the dotted name of a Name/Attribute chain, or None"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Subscript):
+        # Generic bases such as Base[T] depend on Base
+        return _dotted_name(node.value)
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def extract_module_dependencies(
+    tree,
+    module_name,
+    package_name="camel",
+    is_package=False,
+):
+    """Collect in-package names whose definitions affect this module's page
+
+    A package __init__ depends on everything it re-exports, and every module
+    depends on the modules defining its classes' bases. Returned names are
+    qualified symbol or module names; callers map them onto known modules.
+    """
+    imported, reexports = _module_bindings(tree, module_name, is_package)
+    dependencies = set(reexports) if is_package else set()
+
+    for node in iter_declarations(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in node.bases:
+            name = _dotted_name(base)
+            if not name:
+                continue
+            root, _, rest = name.partition('.')
+            if root in imported:
+                dependencies.add(f"{imported[root]}.{rest}" if rest else imported[root])
+
+    prefix = package_name + '.'
+    return sorted(
+        dep for dep in dependencies
+        if dep != module_name and (dep == package_name or dep.startswith(prefix))
+    )
+
+
+def _module_bindings(tree, module_name, is_package=False):
+    """Return the names a module's imports bind, and the names it re-exports
+
+    The first is {local name: fully qualified name}; the second holds the
+    qualified names of from-imports, with the source module for star imports.
+    """
+    current_package = module_name if is_package else module_name.rpartition('.')[0]
+
+    # Local name -> fully qualified name it is bound to
+    imported = {}
+    reexports = set()
+
+    for node in _iter_module_statements(tree.body):
+        if isinstance(node, ast.ImportFrom):
+            if node.level:
+                base_parts = current_package.split('.')
+                if node.level > 1:
+                    base_parts = base_parts[: -(node.level - 1)]
+                if node.module:
+                    base_parts.append(node.module)
+                source = '.'.join(base_parts)
+            else:
+                source = node.module or ''
+            for alias in node.names:
+                if alias.name == '*':
+                    reexports.add(source)
+                    continue
+                qualified = f"{source}.{alias.name}"
+                imported[alias.asname or alias.name] = qualified
+                reexports.add(qualified)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    imported[alias.asname] = alias.name
+                else:
+                    root = alias.name.split('.')[0]
+                    imported[root] = root
+
+    return imported, reexports
+
+
+def _docstring_digest(node):
+    """Return a short hash of a node's docstring words, or "" if it has none
+
+    Docstrings that only differ in line wrapping or indentation hash alike.
+    """
+    doc = ast.get_docstring(node)
+    if not doc:
+        return ""
+    return hashlib.sha256(" ".join(doc.split()).encode("utf-8")).hexdigest()[:16]
+
+
+def extract_class_outlines(tree, module_name, package_name="camel", is_package=False):
+    """Return a ClassInfo for every class defined in a module
+
+    bases are the qualified in-package names of the class's bases, resolved
+    through the module's imports or to classes defined in the module itself;
+    methods are (name, docstring digest) pairs in source order. page is
+    the page holding the class's section, or None if it is not documented.
+    """
+    imported, _reexports = _module_bindings(tree, module_name, is_package)
+    class_nodes = [
+        node for node in iter_declarations(tree) if isinstance(node, ast.ClassDef)
+    ]
+    local_names = {node.name for node in class_nodes}
+    prefix = package_name + '.'
+
+    classes = []
+    for node in class_nodes:
+        bases = []
+        for base in node.bases:
+            name = _dotted_name(base)
+            if not name:
+                continue
+            root, _, rest = name.partition('.')
+            if root in imported:
+                name = f"{imported[root]}.{rest}" if rest else imported[root]
+            elif root in local_names:
+                name = f"{module_name}.{name}"
+            if name.startswith(prefix):
+                bases.append(name)
+        methods = tuple(
+            (child.name, _docstring_digest(child))
+            for child in node.body
+            if isinstance(child, FUNCTION_NODES)
+        )
+        classes.append(ClassInfo(
+            f"{module_name}.{node.name}", module_name, tuple(bases), methods,
+            f"reference/{module_name}" if is_class_substantial(node) else None,
+        ))
+    return classes
+
+
+class DocModel:
+    """Base of the documentation model: compact records of what a page shows
+
+    Fields are the class's __slots__. Records convert to and from plain
+    JSON-compatible dicts, in which nested records carry their kind.
+    """
+
+    __slots__ = ()
+    kind = None
+    # Fields holding lists of records
+    _record_lists = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    @property
+    def summary(self):
+        """The first paragraph of the description on one line"""
+        return " ".join(self.description.split("\n\n")[0].split())
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def to_dict(self):
+        data = {"kind": self.kind}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            if field in self._record_lists:
+                value = [record.to_dict() for record in value]
+            data[field] = value
+        return data
+
+    @staticmethod
+    def from_dict(data):
+        cls = _DOC_MODEL_KINDS[data["kind"]]
+        values = []
+        for field in cls.__slots__:
+            value = data[field]
+            if field in cls._record_lists:
+                value = [DocModel.from_dict(item) for item in value]
+            values.append(value)
+        return cls(*values)
+
+
+class ParamDoc(DocModel):
+    """A documented parameter: name, type, default and description"""
+
+    __slots__ = ("name", "type", "default", "description")
+    kind = "param"
+
+
+class RaisesDoc(DocModel):
+    """A documented exception and when it is raised"""
+
+    __slots__ = ("exception", "description")
+    kind = "raises"
+
+
+class FunctionDoc(DocModel):
+    """A function or method with its signatures and parsed docstring
+
+    keyword is "def" or "async def"; signature is on one line and
+    long_signature wrapped as on the page. returns is the text of the
+    Returns section.
+    """
+
+    __slots__ = (
+        "name", "keyword", "signature", "long_signature", "description",
+        "params", "returns", "raises",
+    )
+    kind = "function"
+    _record_lists = ("params", "raises")
+
+
+class ClassDoc(DocModel):
+    """A class with its signature, parsed docstring and methods
+
+    documented tells whether the class is worth a section of its own (see
+    is_class_substantial).
+    """
+
+    __slots__ = ("name", "signature", "description", "params", "methods", "documented")
+    kind = "class"
+    _record_lists = ("params", "methods")
+
+
+class ModuleDoc(DocModel):
+    """A module: its docstring, classes and functions in declaration order
+
+    Also holds what the build records about the module: the in-package
+    names it depends on and the outline of each class (ClassInfo lists).
+    """
+
+    __slots__ = (
+        "name", "is_package", "description", "members", "dependencies", "classes",
+    )
+    kind = "module"
+    _record_lists = ("members",)
+
+    def class_outlines(self):
+        """Return the ClassInfo of each class"""
+        return [
+            ClassInfo(
+                name, module, tuple(bases), tuple(map(tuple, methods)), page
+            )
+            for name, module, bases, methods, page in self.classes
+        ]
+
+
+_DOC_MODEL_KINDS = {
+    cls.kind: cls for cls in (ParamDoc, RaisesDoc, FunctionDoc, ClassDoc, ModuleDoc)
+}
+
+
+def _param_docs(doc_info):
+    return [
+        ParamDoc(arg.name, arg.type, arg.default, arg.description)
+        for arg in doc_info.args
+    ]
+
+
+def make_function_doc(func_node):
+    """Return the FunctionDoc of a function or method definition"""
+    doc_info = parse_docstring(ast.get_docstring(func_node))
+    return FunctionDoc(
+        func_node.name,
+        function_keyword(func_node),
+        generate_function_signature(func_node),
+        generate_function_signature(func_node, multiline=True),
+        doc_info.description,
+        _param_docs(doc_info),
+        doc_info.returns,
+        [RaisesDoc(exc.exception, exc.description) for exc in doc_info.raises],
+    )
+
+
+def make_class_doc(class_node):
+    """Return the ClassDoc of a class definition"""
+    doc_info = parse_docstring(ast.get_docstring(class_node))
+    return ClassDoc(
+        class_node.name,
+        generate_class_signature(class_node),
+        doc_info.description,
+        _param_docs(doc_info),
+        [
+            make_function_doc(node) for node in class_node.body
+            if isinstance(node, FUNCTION_NODES)
+        ],
+        bool(is_class_substantial(class_node)),
+    )
+
+
+def extract_module_doc(
+    module_name,
+    source_code,
+    is_package=False,
+    package_name="camel",
+):
+    """Parse a module's source into its ModuleDoc"""
+    with profile_stage("parse"):
+        tree = ast.parse(source_code)
+    members = [
+        make_class_doc(node) if isinstance(node, ast.ClassDef) else make_function_doc(node)
+        for node in iter_declarations(tree)
+    ]
+    with profile_stage("class outlines"):
+        outlines = extract_class_outlines(tree, module_name, package_name, is_package)
+    return ModuleDoc(
+        module_name,
+        is_package,
+        ast.get_docstring(tree) or "",
+        members,
+        sorted(extract_module_dependencies(tree, module_name, package_name, is_package)),
+        [list(info) for info in outlines],
+    )
+
+
+class DocModelCache:
+    """ModuleDocs on disk, keyed by module and source content, LRU-evicted
+
+    Each model is a JSON file named after the hash of the module name, the
+    source and MODEL_VERSION, so any process can share the cache and a
+    change of the page templates re-renders without parsing. Reading a
+    model marks it as recently used; once more than max_entries models are
+    stored, the least recently used are deleted.
+    """
+
+    def __init__(self, directory, max_entries=MODEL_CACHE_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _path(self, module_name, source_code, is_package, package_name):
+        key = hashlib.sha256(
+            "\0".join(
+                (MODEL_VERSION, package_name, module_name, str(is_package), source_code)
+            ).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, module_name, source_code, is_package=False, package_name="camel"):
+        """Return the module's ModuleDoc, extracting and storing it if missing"""
+        path = self._path(module_name, source_code, is_package, package_name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                model = DocModel.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # Missing, or written by another version
+        else:
+            with contextlib.suppress(OSError):
+                os.utime(path)
+            return model
+
+        model = extract_module_doc(module_name, source_code, is_package, package_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_if_changed(path, json.dumps(model.to_dict(), separators=(",", ":")))
+        return model
+
+    def evict(self):
+        """Delete the least recently used models beyond max_entries
+
+        Returns the number of models deleted.
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*", "*.json")):
+            with contextlib.suppress(OSError):
+                entries.append((os.path.getmtime(path), path))
+        if len(entries) <= self.max_entries:
+            return 0
+        entries.sort()
+        removed = 0
+        for _mtime, path in entries[:len(entries) - self.max_entries]:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+                removed += 1
+        return removed
+
+
+def _param_lines(params, skip_self=False):
+    """Render the Parameters section of a function, method or class"""
+    lines = ["**Parameters:**", ""]
+    for arg in params:
+        # Skip 'self' parameter
+        if skip_self and arg.name == 'self':
+            continue
+        type_str = f" ({format_code_content(arg.type)})" if arg.type else ""
+        default_str = f" (default: {format_code_content(arg.default)})" if arg.default else ""
+        escaped_description = escape_mdx_content(arg.description)
+        lines.append(f"- **{arg.name}**{type_str}: {escaped_description}{default_str}")
+    lines.append("")
+    return lines
+
+
+def generate_class_docs(class_doc, module_name):
+    """Generate documentation for a class from its ClassDoc"""
+    lines = []
+    
+    # Class anchor point
+    class_name = class_doc.name
+    lines.append(f'<a id="{module_name}.{class_name}"></a>')
+    lines.append("")
+    
+    # Class header without backticks
+    lines.append(f"## {class_name}")
+    lines.append("")
+    
+    # Class signature in Python code block
+    lines.append("```python")
+    lines.append(f"{class_doc.signature}:")
+    lines.append("```")
+    lines.append("")
     
+    # Class docstring
+    if class_doc.description:
+        lines.append(escape_mdx_content(class_doc.description))
+        lines.append("")
+    if class_doc.params:
+        lines.extend(_param_lines(class_doc.params))
+    
+    # Process methods
+    for method_doc in class_doc.methods:
+        lines.extend(generate_method_docs(method_doc, class_name, module_name))
+    
+    return lines
+
+
+def generate_function_docs(func_doc, module_name):
+    """Generate documentation for a function from its FunctionDoc"""
+    lines = []
+    
+    # Function anchor point
+    function_name = func_doc.name
+    lines.append(f'<a id="{module_name}.{function_name}"></a>')
+    lines.append("")
+    
+    # Function header without backticks
+    lines.append(f"## {function_name}")
+    lines.append("")
+    
+    # Function signature in Python code block
+    lines.append("```python")
+    lines.append(f"{func_doc.keyword} {func_doc.long_signature}:")
+    lines.append("```")
+    lines.append("")
+    
+    # Function docstring
+    if func_doc.description:
+        lines.append(escape_mdx_content(func_doc.description))
+        lines.append("")
+    if func_doc.params:
+        lines.extend(_param_lines(func_doc.params))
+    if func_doc.returns:
+        lines.append("**Returns:**")
+        lines.append("")
+        lines.append(f"  {escape_mdx_content(func_doc.returns)}")
+        lines.append("")
+    if func_doc.raises:
+        lines.append("**Raises:**")
+        lines.append("")
+        for exc in func_doc.raises:
+            escaped_description = escape_mdx_content(exc.description)
+            lines.append(f"- **{format_code_content(exc.exception)}**: {escaped_description}")
+        lines.append("")
+    
+    return lines
+
+
+def generate_method_docs(method_doc, class_name, module_name):
+    """Generate documentation for a class method from its FunctionDoc"""
+    lines = []
+    
+    # Method anchor point  
+    method_name = method_doc.name
+    lines.append(f'<a id="{module_name}.{class_name}.{method_name}"></a>')
+    lines.append("")
+    
+    # Method header without backticks
+    lines.append(f"### {method_name}")
+    lines.append("")
+    
+    # Method signature in Python code block
+    lines.append("```python")
+    lines.append(f"{method_doc.keyword} {method_doc.long_signature}:")
+    lines.append("```")
+    lines.append("")
+    
+    # Method docstring
+    if method_doc.description:
+        lines.append(escape_mdx_content(method_doc.description))
+        lines.append("")
+    if method_doc.params:
+        lines.extend(_param_lines(method_doc.params, skip_self=True))
+    if method_doc.returns:
+        lines.append("**Returns:**")
+        lines.append("")
+        lines.append(f"  {escape_mdx_content(method_doc.returns)}")
+        lines.append("")
+    
+    return lines
+
+
+def render_module_json(model):
+    """Render a ModuleDoc as JSON, as documented on its page
+
+    Undocumented classes are left out, as are the dependencies and class
+    outlines the build records.
+    """
+    data = model.to_dict()
+    del data["dependencies"], data["classes"]
+    data["members"] = [
+        member for member, doc in zip(data["members"], model.members)
+        if doc.kind != "class" or doc.documented
+    ]
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def _docstring_text(doc, skip_self=False):
+    """Return the description and parameters of a model as plain text lines"""
+    lines = []
+    if doc.description:
+        lines.extend([doc.description, ""])
+    params = [
+        param for param in doc.params
+        if not (skip_self and param.name == 'self')
+    ]
+    if params:
+        lines.append("Parameters:")
+        for param in params:
+            type_str = f" ({param.type})" if param.type else ""
+            default_str = f" (default: {param.default})" if param.default else ""
+            lines.append(f"    {param.name}{type_str}: {param.description}{default_str}")
+        lines.append("")
+    return lines
+
+
+def _function_text(func_doc, method=False):
+    """Return the plain text lines of a function, or of a method (no Raises)"""
+    lines = [f"{func_doc.keyword} {func_doc.signature}"]
+    body = _docstring_text(func_doc, skip_self=method)
+    if func_doc.returns:
+        body.extend(["Returns:", f"    {func_doc.returns}", ""])
+    if func_doc.raises and not method:
+        body.append("Raises:")
+        body.extend(f"    {exc.exception}: {exc.description}" for exc in func_doc.raises)
+        body.append("")
+    # Blocks end with a blank line, kept by splitting on "\n"
+    lines.extend(textwrap.indent("\n".join(body), "    ").split("\n"))
+    return lines
+
+
+def render_module_text(model):
+    """Render a ModuleDoc as plain text, with what its page documents"""
+    lines = [model.name, "=" * len(model.name), ""]
+    if model.description:
+        lines.extend([model.description, ""])
+    for member in model.members:
+        if member.kind == "function":
+            lines.extend(_function_text(member))
+        elif member.documented:
+            lines.append(member.signature)
+            body = _docstring_text(member)
+            for method_doc in member.methods:
+                body.extend(_function_text(method_doc, method=True))
+            lines.extend(textwrap.indent("\n".join(body), "    ").split("\n"))
+    return "\n".join(lines).rstrip() + "\n"
+
+
+# --export formats: renderer and file suffix
+MODEL_RENDERERS = {
+    "json": (render_module_json, ".json"),
+    "text": (render_module_text, ".txt"),
+}
+
+
+def generate_class_signature(class_node):
+    """Generate a class signature with its base classes"""
+    bases = []
+    for base in class_node.bases:
+        if isinstance(base, ast.Name):
+            bases.append(base.id)
+        elif isinstance(base, ast.Attribute):
+            bases.append(f"{base.attr}")
+    
+    signature = f"class {class_node.name}"
+    if bases:
+        signature += f"({', '.join(bases)})"
+    return signature
+
+
+def function_keyword(func_node):
+    """Return the keyword that introduces a function definition"""
+    return "async def" if isinstance(func_node, ast.AsyncFunctionDef) else "def"
+
+
+def generate_function_signature(func_node, multiline=False):
+    """Generate function signature from AST node"""
+    args = []
+    
+    # Regular arguments
+    for arg in func_node.args.args:
+        arg_str = arg.arg
+        if arg.annotation:
+            arg_str += f": {ast.unparse(arg.annotation)}"
+        args.append(arg_str)
+    
+    # Default values
+    num_defaults = len(func_node.args.defaults)
+    if num_defaults > 0:
+        for i, default in enumerate(func_node.args.defaults):
+            arg_index = len(func_node.args.args) - num_defaults + i
+            args[arg_index] += f" = {ast.unparse(default)}"
+    
+    # *args
+    if func_node.args.vararg:
+        vararg_str = f"*{func_node.args.vararg.arg}"
+        if func_node.args.vararg.annotation:
+            vararg_str += f": {ast.unparse(func_node.args.vararg.annotation)}"
+        args.append(vararg_str)
+    
+    # **kwargs
+    if func_node.args.kwarg:
+        kwarg_str = f"**{func_node.args.kwarg.arg}"
+        if func_node.args.kwarg.annotation:
+            kwarg_str += f": {ast.unparse(func_node.args.kwarg.annotation)}"
+        args.append(kwarg_str)
+    
+    # Format signature based on length and multiline preference
+    if multiline and (len(args) > 3 or sum(len(arg) for arg in args) > 60):
+        # Multi-line format
+        if args:
+            formatted_args = ',\n    '.join(args)
+            return f"{func_node.name}(\n    {formatted_args}\n)"
+        else:
+            return f"{func_node.name}()"
+    else:
+        # Single-line format
+        return f"{func_node.name}({', '.join(args)})"
+
+
+def _render_module(
+    module,
+    package_name,
+    source_root,
+    split_threshold=None,
+    model_cache=None,
+):
+    """Render one page, returning (module, content, dependencies, symbols, classes)"""
+    dependencies = set()
+    symbols = []
+    classes = []
+    with profile_stage("render", module):
+        content = render_ast_docs(
+            module, package_name, source_root, dependencies, symbols, classes,
+            split_threshold, model_cache,
+        )
+    return module, content, sorted(dependencies), symbols, classes
+
+
+def _render_ast_docs_batch(
+    batch,
+    package_name,
+    source_root,
+    profile=False,
+    split_threshold=None,
+    model_cache=None,
+):
+    """Worker entry point: render the pages of a batch of modules
+
+    Returns (results, events); if profile is set, events are the worker's
+    ProfileEvents for the parent's profiler.
+    """
+    if not profile:
+        return [
+            _render_module(module, package_name, source_root, split_threshold, model_cache)
+            for module in batch
+        ], []
+    profiler = BuildProfiler()
+    with profiler.activate():
+        results = [
+            _render_module(module, package_name, source_root, split_threshold, model_cache)
+            for module in batch
+        ]
+    return results, profiler.events
+
+
+def schedule_module_batches(
+    modules,
+    package_name="camel",
+    source_root=None,
+    chunk_bytes=PARALLEL_CHUNK_BYTES,
+    index=None,
+):
+    """Group modules into worker batches, largest source files first"""
+    if index is None:
+        index = PackageIndex(package_name, source_root)
+    sizes = {module: index.size(module) for module in modules}
+
+    # Longest-module-first keeps the slowest pages from starting last; ties
+    # are broken by name so scheduling is deterministic
+    ordered = sorted(modules, key=lambda m: (-sizes[m], m))
+
+    batches = []
+    current_batch = []
+    current_bytes = 0
+    for module in ordered:
+        if sizes[module] >= chunk_bytes:
+            batches.append([module])
+            continue
+        # Small modules are chunked together to amortize IPC overhead
+        current_batch.append(module)
+        current_bytes += sizes[module]
+        if current_bytes >= chunk_bytes:
+            batches.append(current_batch)
+            current_batch = []
+            current_bytes = 0
+    if current_batch:
+        batches.append(current_batch)
+
+    return batches
+
+
+def generate_custom_docs(
+    modules,
+    output_dir,
+    package_name="camel",
+    source_root=None,
+    jobs=1,
+    on_result=None,
+    stats=None,
+    index=None,
+    symbol_table=None,
+    hierarchy=None,
+    split_threshold=None,
+    model_cache=None,
+):
+    """Generate documentation using custom AST parser
+
+    Pages are rendered first (in worker processes if jobs > 1) and written
+    by the parent once every page's symbols are in symbol_table and its
+    classes in hierarchy, so links and inherited members between pages
+    generated in the same run resolve. Progress is printed as each page is
+    rendered, and the outcome of each page as it is written. If given,
+    on_result(module, output_file, dependencies, symbols, references,
+    classes) is called for every module; output_file is None for skipped
+    modules. Pages whose content did not change are left untouched and
+    counted as unchanged in stats. Pages larger than split_threshold bytes
+    are split into an overview and one page per class. Documentation models
+    are read from and stored in model_cache, a DocModelCache, if given.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    generated_count = 0
+    skipped_count = 0
+
+    if jobs is None or jobs < 1:
+        jobs = os.cpu_count() or 1
+
+    if jobs == 1 or len(modules) < 2:
+        results = (
+            _render_module(module, package_name, source_root, split_threshold, model_cache)
+            for module in modules
+        )
+    else:
+        results = _render_parallel(
+            modules, package_name, source_root, jobs, index, split_threshold,
+            model_cache,
+        )
+    rendered = []
+    for result in results:
+        # Reported as each page is rendered, in completion order
+        rendered.append(result)
+        print(f"  [{len(rendered)}/{len(modules)}] Rendered {result[0]}")
+    # Written in the order of modules
+    position = {module: i for i, module in enumerate(modules)}
+    rendered.sort(key=lambda result: position[result[0]])
+
+    for module, _content, _dependencies, symbols, classes in rendered:
+        if symbol_table is not None:
+            symbol_table.replace_module(module, symbols)
+        if hierarchy is not None:
+            hierarchy.replace_module(module, classes)
+
+    for module, content, dependencies, symbols, classes in rendered:
+        output_file = None
+        references = set()
+        if content is not None:
+            with profile_stage("finish", module):
+                output_file, written = write_module_page(
+                    module, content, output_dir, symbol_table, references, hierarchy
+                )
+
+        if on_result:
+            on_result(module, output_file, dependencies, symbols, references, classes)
+        
+        if output_file:
+            if stats is not None:
+                stats.add(written)
+            if written:
+                print(f"  Generated {os.path.basename(output_file)}")
+            else:
+                print(f"  Unchanged {os.path.basename(output_file)}")
+            generated_count += 1
+        else:
+            print(f"  Skipped {module} (insufficient content)")
+            skipped_count += 1
+    
+    return generated_count, skipped_count
+
+
+def _render_parallel(
+    modules,
+    package_name,
+    source_root,
+    jobs,
+    index=None,
+    split_threshold=None,
+    model_cache=None,
+):
+    """Yield per-module render results from a process pool as batches finish"""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    batches = schedule_module_batches(
+        modules, package_name, source_root, index=index
+    )
+    print(f"  Using {jobs} worker processes for {len(batches)} batches")
+
+    profiler = active_profiler()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(
+                _render_ast_docs_batch, batch, package_name, source_root,
+                profiler is not None, split_threshold, model_cache,
+            )
+            for batch in batches
+        ]
+        for future in as_completed(futures):
+            results, events = future.result()
+            if profiler is not None:
+                profiler.merge(events)
+            yield from results
+
+
+def compute_source_hash(path):
+    """Return the content hash of a source file"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def compute_config_hash(
+    package_name="camel",
+    backend="ast",
+    xref=True,
+    split_threshold=None,
+):
+    """Hash the generator version and every option that affects output"""
+    config = {
+        "version": GENERATOR_VERSION,
+        "package": package_name,
+        "backend": backend,
+        "xref": xref,
+    }
+    if split_threshold:
+        # Only present when splitting, so unsplit builds keep their caches
+        config["split_threshold"] = split_threshold
+    return hashlib.sha256(
+        json.dumps(config, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class BuildCache:
+    """Persistent record of which source content produced which page.
+
+    Entries are keyed by module name and store the source content hash, the
+    configuration hash and the generated MDX path (NULL for modules that were
+    skipped), so unchanged modules can be skipped regardless of file mtimes.
+    The dependencies table holds the qualified names each page depends on, as
+    recorded during the AST pass; build_dependency_graph turns them into the
+    module graph used to invalidate pages of dependent modules. The symbols
+    table is the symbol index: one row per documented class, function and
+    method, so unchanged modules keep their entries without being reparsed.
+    The xrefs table holds the names each page looked up while linking, so
+    pages can be relinked when one of those names starts or stops resolving.
+    The classes table holds the outline of every class (see ClassInfo), from
+    which the class hierarchy of the whole package is rebuilt without
+    parsing unchanged modules.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS modules ("
+            "module TEXT PRIMARY KEY, "
+            "source_hash TEXT NOT NULL, "
+            "config_hash TEXT NOT NULL, "
+            "output_file TEXT)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS dependencies ("
+            "module TEXT NOT NULL, "
+            "depends_on TEXT NOT NULL, "
+            "PRIMARY KEY (module, depends_on))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS symbols ("
+            "name TEXT PRIMARY KEY, "
+            "module TEXT NOT NULL, "
+            "kind TEXT NOT NULL, "
+            "page TEXT NOT NULL, "
+            "anchor TEXT NOT NULL, "
+            "signature TEXT NOT NULL, "
+            "summary TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS symbols_module ON symbols (module)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS xrefs ("
+            "module TEXT NOT NULL, "
+            "name TEXT NOT NULL, "
+            "PRIMARY KEY (module, name))"
+        )
+        columns = [
+            row[1] for row in self.conn.execute("PRAGMA table_info(classes)")
+        ]
+        if columns and "page" not in columns:
+            # Written before classes could have pages of their own; forget
+            # every entry so the next build records the classes again
+            self.conn.execute("DROP TABLE classes")
+            self.conn.execute("DELETE FROM modules")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS classes ("
+            "name TEXT NOT NULL, "
+            "module TEXT NOT NULL, "
+            "bases TEXT NOT NULL, "
+            "methods TEXT NOT NULL, "
+            "page TEXT)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS classes_module ON classes (module)"
+        )
+
+    def entries(self):
+        """Return {module: (source_hash, config_hash, output_file)}"""
+        rows = self.conn.execute(
+            "SELECT module, source_hash, config_hash, output_file FROM modules"
+        )
+        return {row[0]: row[1:] for row in rows}
+
+    def dependencies(self):
+        """Return {module: set of qualified names it depends on}"""
+        graph = defaultdict(set)
+        for module, depends_on in self.conn.execute(
+            "SELECT module, depends_on FROM dependencies"
+        ):
+            graph[module].add(depends_on)
+        return graph
+
+    def symbols(self):
+        """Return every recorded Symbol, ordered by name"""
+        return [
+            Symbol(*row)
+            for row in self.conn.execute("SELECT * FROM symbols ORDER BY name")
+        ]
+
+    def references(self):
+        """Return {module: set of names its page looked up when linking}"""
+        references = defaultdict(set)
+        for module, name in self.conn.execute("SELECT module, name FROM xrefs"):
+            references[module].add(name)
+        return references
+
+    def classes(self):
+        """Return every recorded ClassInfo, in the order they were recorded"""
+        return [
+            ClassInfo(
+                name, module, tuple(json.loads(bases)),
+                tuple(map(tuple, json.loads(methods))), page,
+            )
+            for name, module, bases, methods, page in self.conn.execute(
+                "SELECT * FROM classes ORDER BY rowid"
+            )
+        ]
+
+    def record(
+        self,
+        module,
+        source_hash,
+        config_hash,
+        output_file,
+        dependencies=(),
+        symbols=(),
+        references=(),
+        classes=(),
+    ):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO modules VALUES (?, ?, ?, ?)",
+            (module, source_hash, config_hash, output_file),
+        )
+        self.conn.execute("DELETE FROM dependencies WHERE module = ?", (module,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO dependencies VALUES (?, ?)",
+            [(module, dep) for dep in dependencies],
+        )
+        self.conn.execute("DELETE FROM symbols WHERE module = ?", (module,))
+        # The first definition of a name owns the anchor on the page
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO symbols VALUES (?, ?, ?, ?, ?, ?, ?)", symbols
+        )
+        self.conn.execute("DELETE FROM xrefs WHERE module = ?", (module,))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO xrefs VALUES (?, ?)",
+            [(module, name) for name in references],
+        )
+        self.conn.execute("DELETE FROM classes WHERE module = ?", (module,))
+        self.conn.executemany(
+            "INSERT INTO classes VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    info.name, info.module, json.dumps(info.bases),
+                    json.dumps(info.methods), info.page,
+                )
+                for info in classes
+            ],
+        )
+
+    def remove(self, module):
+        self.conn.execute("DELETE FROM modules WHERE module = ?", (module,))
+        self.conn.execute("DELETE FROM dependencies WHERE module = ?", (module,))
+        self.conn.execute("DELETE FROM symbols WHERE module = ?", (module,))
+        self.conn.execute("DELETE FROM xrefs WHERE module = ?", (module,))
+        self.conn.execute("DELETE FROM classes WHERE module = ?", (module,))
+
+    def commit(self):
+        """Save the entries recorded so far, releasing the write lock"""
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def build_dependency_graph(recorded, module_set):
+    """Resolve recorded qualified names into a module-level dependency graph
+
+    Names bound by another module's imports (such as camel.toolkits.BaseToolkit
+    re-exported by the package __init__) are followed to the module that
+    defines them, so subclasses depend on the defining module only.
+    """
+    aliases = {}
+    for module, names in recorded.items():
+        for name in names:
+            aliases.setdefault(f"{module}.{name.rpartition('.')[2]}", name)
+
+    def resolve(name):
+        seen = set()
+        while name in aliases and name not in seen:
+            seen.add(name)
+            name = aliases[name]
+        # camel.agents.chat_agent.ChatAgent -> camel.agents.chat_agent
+        while name and name not in module_set:
+            name = name.rpartition('.')[0]
+        return name
+
+    graph = {}
+    for module, names in recorded.items():
+        graph[module] = {
+            target for target in map(resolve, names) if target and target != module
+        }
+    return graph
+
+
+def expand_with_dependents(changed, graph):
+    """Return the changed modules plus every module that transitively depends on them"""
+    dependents = defaultdict(set)
+    for module, depends_on in graph.items():
+        for dep in depends_on:
+            dependents[dep].add(module)
+
+    affected = set(changed)
+    queue = list(changed)
+    while queue:
+        for dependent in dependents.get(queue.pop(), ()):
+            if dependent not in affected:
+                affected.add(dependent)
+                queue.append(dependent)
+
+    return affected
+
+
+def plan_incremental_build(modules, cache, source_hashes, config_hash, known=None):
+    """Split modules into those needing regeneration and vanished modules
+
+    Modules whose own source changed are expanded with every module whose
+    page transitively depends on them, according to the recorded graph.
+    known is every module of the package when only a subset is being
+    built; cached modules missing from it are reported as vanished.
+    """
+    entries = cache.entries()
+
+    stale = []
+    for module in modules:
+        entry = entries.get(module)
+        if entry is None or entry[0] != source_hashes[module] or entry[1] != config_hash:
+            stale.append(module)
+        elif entry[2] and not os.path.exists(entry[2]):
+            # The page was deleted from the output directory
+            stale.append(module)
+
+    current = set(modules)
+    known = current if known is None else set(known)
+    removed = sorted(module for module in entries if module not in known)
+
+    graph = build_dependency_graph(cache.dependencies(), known | set(removed))
+    affected = expand_with_dependents(stale + removed, graph)
+    stale = sorted(module for module in affected if module in current)
+
+    return stale, removed
+
+
+def plan_git_build(
+    modules,
+    cache,
+    changes,
+    config_hash,
+    package_name="camel",
+    source_root=None,
+    known=None,
+):
+    """Like plan_incremental_build, but with the changed files reported by git
+
+    changes are the GitChanges of the package sources (see git_changes).
+    Added and modified modules are regenerated; deleted modules, and the
+    old names of renamed ones, are reported as vanished unless a module of
+    that name still exists. Modules without an up-to-date cache entry are
+    regenerated too, so every page is linked against a complete symbol
+    table and class hierarchy; without a cache that is every module, and
+    write_if_changed still only rewrites the pages whose content changed.
+    """
+    entries = cache.entries()
+    current = set(modules)
+    known = current if known is None else set(known)
+
+    changed = set()
+    removed = {module for module in entries if module not in known}
+    for change in changes:
+        old_path = change.path if change.status == "D" else change.old_path
+        if old_path:
+            module = module_name_for_path(old_path, package_name, source_root)
+            if module and module not in known:
+                removed.add(module)
+        if change.status != "D":
+            module = module_name_for_path(change.path, package_name, source_root)
+            if module:
+                changed.add(module)
+
+    stale = [
+        module for module in modules
+        if module not in entries or entries[module][1] != config_hash
+    ]
+    graph = build_dependency_graph(cache.dependencies(), known | removed)
+    affected = expand_with_dependents(sorted(changed | removed) + stale, graph)
+    return sorted(module for module in affected if module in current), sorted(removed)
+
+
+def remove_vanished_pages(removed, cache, output_dir=None):
+    """Delete pages (and class pages) whose source module no longer exists
+
+    Modules the cache has no page for are looked up in output_dir, if given.
+    """
+    entries = cache.entries()
+    for module in removed:
+        if module in entries:
+            output_file = entries[module][2]
+        else:
+            output_file = output_dir and os.path.join(output_dir, f"{module}.mdx")
+        if output_file and os.path.exists(output_file):
+            os.remove(output_file)
+            print(f"  Removed {os.path.basename(output_file)} ({module} no longer exists)")
+        if output_file:
+            remove_stale_class_pages(os.path.dirname(output_file), module)
+        cache.remove(module)
+
+
+def find_relinked_pages(references, old_table, new_table, exclude=()):
+    """Return modules whose recorded references resolve differently in new_table"""
+    def target(table, name, module):
+        symbol = table.resolve(name, module)
+        return symbol and (symbol.page, symbol.anchor, symbol.kind)
+
+    return sorted(
+        module for module, names in references.items()
+        if module not in exclude and any(
+            target(old_table, name, module) != target(new_table, name, module)
+            for name in names
+        )
+    )
+
+
+def write_symbol_index(cache, path, stats=None):
+    """Write the symbol index recorded in the build cache as compact JSON
+
+    Maps each qualified name to [page, anchor, kind, signature, summary], so
+    tools can look symbols up without scanning the generated pages. Returns
+    True if the file changed.
+    """
+    symbols = {
+        symbol.name: [
+            symbol.page, symbol.anchor, symbol.kind, symbol.signature, symbol.summary
+        ]
+        for symbol in cache.symbols()
+    }
+    content = json.dumps(symbols, ensure_ascii=False, separators=(",", ":"))
+    return write_if_changed(path, content + "\n", stats)
+
+
+def discover_module_structure(package_name="camel", source_root=None, index=None):
+    """Dynamically discover the module structure from the package sources"""
+    if index is None:
+        index = PackageIndex(package_name, source_root)
+    if not index.package_path:
+        print(f"Error discovering package structure: {package_name} not found")
+        return {}
+    return index.structure()
+
+
+def module_mappings(structure):
+    """Return (display_names, module_order) covering the discovered modules
+
+    Known modules keep their display names and order; other discovered
+    modules get a title-cased name and follow in alphabetical order.
+    MODULE_NAME_DISPLAY and MODULE_ORDER themselves are never changed.
+    """
+    display_names = dict(MODULE_NAME_DISPLAY)
+    for module_name in structure:
+        # Convert snake_case to Title Case
+        display_names.setdefault(module_name, module_name.replace('_', ' ').title())
+
     # Keep existing order for known modules, add new ones at the end
-    MODULE_ORDER[:] = existing_order + sorted(new_modules)
-    
-    return structure
+    existing_order = [m for m in MODULE_ORDER if m in structure]
+    new_modules = [m for m in structure if m not in MODULE_ORDER]
+    return display_names, existing_order + sorted(new_modules)
+
+
+def module_name_for_path(path, package_name="camel", source_root=None):
+    """Map a source file path to its module name, or None if it is not a module"""
+    package_path = get_package_path(package_name, source_root)
+    if not package_path or not path.endswith(".py"):
+        return None
+
+    rel_path = os.path.relpath(os.path.abspath(path), os.path.abspath(package_path))
+    if rel_path.startswith(os.pardir):
+        return None
+
+    parts = rel_path[:-len(".py")].split(os.sep)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join([package_name] + parts)
+
+
+def _snapshot_sources(package_path):
+    """Return {path: (mtime_ns, size)} for every Python file under package_path"""
+    snapshot = {}
+    for root, _dirs, files in os.walk(package_path):
+        for file in files:
+            if file.endswith(".py"):
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # Deleted while walking
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def _poll_source_changes(package_path, interval):
+    """Yield sets of added, modified or deleted source paths by polling"""
+    previous = _snapshot_sources(package_path)
+    while True:
+        time.sleep(interval)
+        current = _snapshot_sources(package_path)
+        changed = {
+            path for path in previous.keys() | current.keys()
+            if previous.get(path) != current.get(path)
+        }
+        previous = current
+        if changed:
+            yield changed
+
+
+def iter_source_changes(package_path, poll_interval=WATCH_POLL_SECONDS):
+    """Yield batches of changed paths under package_path, forever
+
+    Uses watchdog (inotify on Linux) when it is installed and falls back to
+    polling file stats otherwise. Events are debounced so an editor's
+    write-and-rename save arrives as one batch. Batches may contain
+    directories, which means their contents changed wholesale.
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        print(f"  watchdog not installed; polling every {poll_interval}s")
+        yield from _poll_source_changes(package_path, poll_interval)
+        return
+
+    import queue
+
+    events = queue.Queue()
+
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.event_type in ("opened", "closed", "closed_no_write"):
+                return
+            for path in (event.src_path, getattr(event, "dest_path", "")):
+                if path and (event.is_directory or path.endswith(".py")):
+                    events.put(path)
+
+    observer = Observer()
+    observer.schedule(_Handler(), package_path, recursive=True)
+    observer.start()
+    try:
+        while True:
+            changed = {events.get()}
+            try:
+                while True:
+                    changed.add(events.get(timeout=WATCH_DEBOUNCE_SECONDS))
+            except queue.Empty:
+                pass
+            yield changed
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def build_versions(
+    snapshots,
+    versions_dir,
+    package_name="camel",
+    xref=True,
+    split_threshold=None,
+    patterns=None,
+    model_cache=None,
+):
+    """Build the reference of several package versions, sharing what they share
+
+    Each SourceSnapshot's pages are written to versions_dir/<label>/, with
+    links between pages kept within that version. A module whose source is
+    the same in several snapshots is read, parsed and rendered once; only
+    cross-references and inherited members, which depend on the rest of
+    the version, are resolved per version. With a DocModelCache, modules
+    parsed by earlier runs are not parsed again. Returns {label:
+    OutputStats}.
+    """
+    url_base = "/" + os.path.basename(os.path.abspath(versions_dir))
+    rendered = {}  # (module, source hash): (content, symbols, classes)
+    results = {}
+    for snapshot in snapshots:
+        modules = snapshot.names(patterns)
+        keys = {module: (module, snapshot.source_hash(module)) for module in modules}
+        todo = [module for module in modules if keys[module] not in rendered]
+        print(
+            f"{snapshot.label}: {len(modules)} modules, "
+            f"{len(modules) - len(todo)} shared with earlier versions"
+        )
+
+        with profile_stage("read", snapshot.label):
+            snapshot.load(todo)
+        for module in todo:
+            symbols = []
+            classes = []
+            with profile_stage("render", module):
+                try:
+                    source_code = snapshot.read_source(module)
+                except UnicodeDecodeError as e:
+                    print(f"Error generating docs for {module}: {e}")
+                    content = None
+                else:
+                    content = render_module_source(
+                        module, source_code, snapshot.is_package(module),
+                        package_name, None, symbols, classes, split_threshold,
+                        model_cache,
+                    )
+            rendered[keys[module]] = (content, symbols, classes)
+
+        pages = [(module,) + rendered[keys[module]] for module in modules]
+        symbol_table = None
+        if xref:
+            symbol_table = SymbolTable(
+                symbol for _module, _content, symbols, _classes in pages
+                for symbol in symbols
+            )
+        hierarchy = ClassHierarchy(
+            info for _module, _content, _symbols, classes in pages
+            for info in classes
+        )
+
+        stats = OutputStats()
+        target_dir = os.path.join(versions_dir, snapshot.label)
+        with profile_stage("write", snapshot.label), staged_directory(
+            target_dir, stats, prune=("*.mdx",)
+        ) as build_dir:
+            for module, content, _symbols, _classes in pages:
+                if content is not None:
+                    write_module_page(
+                        module, content, build_dir, symbol_table, None,
+                        hierarchy, url_root=f"{url_base}/{snapshot.label}",
+                    )
+        print(f"  {target_dir}: {stats.summary()}")
+        results[snapshot.label] = stats
+    return results
+
+
+def build_reference_versions(args, model_dir):
+    """Build the reference of every --ref and --archive given"""
+    versions_dir = args.versions_dir or os.path.join(
+        os.path.dirname(os.path.abspath(args.output_dir)), "versions"
+    )
+    repository = args.source_root or "."
+    snapshots = []
+    with profile_stage("discover"):
+        try:
+            for ref in args.ref or ():
+                snapshots.append(SourceSnapshot.from_git(args.package, ref, repository))
+            for path in args.archive or ():
+                snapshots.append(SourceSnapshot.from_archive(args.package, path))
+        except (OSError, RuntimeError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    sources = {}
+    for source, snapshot in zip([*(args.ref or ()), *(args.archive or ())], snapshots):
+        if snapshot.label in sources:
+            print(
+                f"Error: versions must have distinct labels, but {sources[snapshot.label]} "
+                f"and {source} are both labelled {snapshot.label}"
+            )
+            sys.exit(1)
+        sources[snapshot.label] = source
+
+    print(f"Building {len(snapshots)} versions into {versions_dir}...")
+    model_cache = DocModelCache(model_dir)
+    build_versions(
+        snapshots,
+        versions_dir,
+        args.package,
+        xref=not args.no_xref,
+        split_threshold=args.split_threshold * 1024 or None,
+        patterns=args.only,
+        model_cache=model_cache,
+    )
+    model_cache.evict()
+
+
+def export_models(
+    package_name,
+    export_dir,
+    fmt,
+    source_root=None,
+    model_cache=None,
+    patterns=None,
+):
+    """Write each module's documentation model in a MODEL_RENDERERS format
+
+    Files are named <module>.json or <module>.txt; only changed files are
+    rewritten, and unless patterns select a subset, files of modules that
+    no longer exist are removed. Returns the OutputStats.
+    """
+    renderer, suffix = MODEL_RENDERERS[fmt]
+    index = PackageIndex(package_name, source_root)
+    stats = OutputStats()
+    prune = () if patterns else (f"*{suffix}",)
+    with staged_directory(export_dir, stats, prune=prune) as build_dir:
+        for module in index.names(patterns):
+            with profile_stage("export", module):
+                try:
+                    source_code = index.read_source(module)
+                    is_package = index.is_package(module)
+                    if model_cache is not None:
+                        model = model_cache.get(module, source_code, is_package, package_name)
+                    else:
+                        model = extract_module_doc(module, source_code, is_package, package_name)
+                except Exception as e:
+                    print(f"Error exporting {module}: {e}")
+                    continue
+                write_if_changed(
+                    os.path.join(build_dir, f"{module}{suffix}"), renderer(model)
+                )
+    return stats
+
+
+def watch_package(
+    output_dir,
+    docs_json_path,
+    package_name="camel",
+    source_root=None,
+    cache_file=None,
+    symbol_index=None,
+    xref=True,
+    split_threshold=None,
+    model_cache=None,
+    llms_txt=True,
+):
+    """Regenerate pages as package sources change, until interrupted
+
+    The module set, source hashes, dependency graph, symbol table and class
+    hierarchy stay in memory (as do the parsed-docstring memo and the
+    package path lookup), so a save only costs hashing and regenerating the
+    touched module and the modules that depend on it. docs.json is rewritten
+    only when a page appears or disappears. MDX syntax errors in regenerated
+    pages are reported. Unless llms_txt is False, the llms.txt bundles are
+    updated with the pages.
+    """
+    package_path = get_package_path(package_name, source_root)
+    if not package_path:
+        return
+
+    output_dir = os.path.abspath(output_dir)
+    config_hash = compute_config_hash(package_name, "ast", xref, split_threshold)
+    cache = BuildCache(cache_file)
+    symbol_table = SymbolTable(cache.symbols()) if xref else None
+    hierarchy = ClassHierarchy(cache.classes())
+    index = PackageIndex(package_name, source_root)
+    modules = set(index.modules)
+    source_hashes = {
+        module: entry[0]
+        for module, entry in cache.entries().items()
+        if entry[1] == config_hash
+    }
+    pages = set(find_reference_pages(output_dir))
+
+    print(f"\nWatching {package_path} for changes (Ctrl+C to stop)...")
+    try:
+        for paths in iter_source_changes(package_path):
+            start = time.perf_counter()
+
+            touched = set()
+            for path in paths:
+                module = module_name_for_path(path, package_name, source_root)
+                if module:
+                    touched.add(module)
+                elif os.path.abspath(path).startswith(os.path.abspath(package_path)):
+                    # A directory was created, moved or deleted: rescan it
+                    index = PackageIndex(package_name, source_root)
+                    touched |= set(index.modules) ^ modules
+
+            changed = []
+            removed = []
+            for module in sorted(touched):
+                module_file = find_module_source(module, package_name, source_root)
+                if module_file is None:
+                    if module in modules:
+                        removed.append(module)
+                    continue
+                try:
+                    source_hash = compute_source_hash(module_file)
+                except OSError:
+                    continue  # Replaced mid-save; the next event picks it up
+                if source_hash != source_hashes.get(module):
+                    source_hashes[module] = source_hash
+                    changed.append(module)
+            if not changed and not removed:
+                continue
+
+            modules.update(changed)
+            modules.difference_update(removed)
+            graph = build_dependency_graph(cache.dependencies(), modules | set(removed))
+            dependents = expand_with_dependents(changed + removed, graph)
+
+            stats = OutputStats()
+            previous_outputs = {
+                module: entry[2] for module, entry in cache.entries().items()
+            }
+            previous_table = symbol_table.copy() if xref else None
+            for module in removed:
+                hierarchy.replace_module(module, ())
+                if xref:
+                    symbol_table.replace_module(module, ())
+
+            checked = []
+
+            def regenerate(group):
+                # Render the whole group before writing any of it, so pages
+                # saved together see each other's symbols and classes
+                rendered = [
+                    _render_module(
+                        module, package_name, source_root, split_threshold,
+                        model_cache,
+                    )
+                    for module in group
+                ]
+                for module, _content, _dependencies, symbols, classes in rendered:
+                    if xref:
+                        symbol_table.replace_module(module, symbols)
+                    hierarchy.replace_module(module, classes)
+
+                for module, content, dependencies, symbols, classes in rendered:
+                    output_file = None
+                    references = set()
+                    if content is not None:
+                        output_file, written = write_module_page(
+                            module, content, output_dir, symbol_table,
+                            references, hierarchy,
+                        )
+                        stats.add(written)
+                        checked.append(output_file)
+                        checked.extend(
+                            page_file(output_dir, symbol.page) for symbol in symbols
+                        )
+                    previous = previous_outputs.get(module)
+                    if not output_file and previous and os.path.exists(previous):
+                        os.remove(previous)
+                        stats.removed += 1
+                    if not output_file:
+                        stats.removed += remove_stale_class_pages(output_dir, module)
+                    if module not in source_hashes:
+                        source_hashes[module] = index.source_hash(module)
+                    cache.record(
+                        module, source_hashes[module], config_hash, output_file,
+                        dependencies, symbols, references, classes,
+                    )
+
+            # The touched modules go first so their pages land soonest
+            regenerate(changed)
+            ready = time.perf_counter()
+            later = sorted(
+                module for module in dependents
+                if module in modules and module not in changed
+            )
+            regenerate(later)
+            if removed:
+                remove_vanished_pages(removed, cache)
+                stats.removed += len(removed)
+                for module in removed:
+                    source_hashes.pop(module, None)
+            if xref:
+                relink = [
+                    module for module in find_relinked_pages(
+                        cache.references(), previous_table, symbol_table,
+                        exclude=set(changed) | set(later),
+                    )
+                    if module in modules
+                ]
+                regenerate(relink)
+                later += relink
+            if symbol_index:
+                write_symbol_index(cache, symbol_index)
+            # Commit every change, so other builds are not locked out of the
+            # cache while watching and nothing is lost if the watcher is killed
+            cache.commit()
+
+            end = time.perf_counter()
+            timing = f"{(end - start) * 1000:.0f} ms"
+            if later:
+                # Other pages were regenerated after the touched ones
+                timing = f"touched pages in {(ready - start) * 1000:.0f} ms, all in {timing}"
+            print(f"  {', '.join(changed + removed)}: {stats.summary()} ({timing})")
+            for issue in check_mdx_files(sorted(set(checked)), jobs=1):
+                print(f"    {format_mdx_issue(issue)}")
+
+            current_pages = set(find_reference_pages(output_dir))
+            if current_pages != pages:
+                pages = current_pages
+                index = PackageIndex(package_name, source_root)
+                display_names, module_order = module_mappings(
+                    discover_module_structure(package_name, source_root, index)
+                )
+                navigation = convert_tree_to_navigation(
+                    build_module_tree(sorted(pages)), module_order, display_names
+                )
+                if update_docs_json(docs_json_path, navigation):
+                    print(f"  Updated {docs_json_path} ({len(pages)} pages)")
+            if llms_txt:
+                update_reference_bundle(output_dir, docs_json_path)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        cache.close()
 
 
 def main():
@@ -1243,10 +3908,19 @@ def main():
         default="camel",
         help="Package name to generate documentation for",
     )
+    parser.add_argument(
+        "--source_root",
+        type=str,
+        default=None,
+        help="Directory containing the package sources (e.g. a camel checkout). "
+        "Defaults to locating the package with importlib.util.find_spec; "
+        "package code is never imported either way",
+    )
     parser.add_argument(
         "--clean",
         action="store_true",
-        help="Clean output directory before generating new files",
+        help="Delete pages that are not regenerated by this build "
+        "(implies a full rebuild; index.mdx is preserved)",
     )
     parser.add_argument(
         "--skip_generation",
@@ -1256,84 +3930,714 @@ def main():
     parser.add_argument(
         "--incremental",
         action="store_true",
-        help="Only process modules that have been changed recently",
+        help="Only process modules whose source content changed since the last build",
+    )
+    parser.add_argument(
+        "--since_ref",
+        metavar="REF",
+        help="Only regenerate modules changed since this git ref (e.g. "
+        "origin/master) and the pages depending on them, and remove the pages "
+        "of modules deleted or renamed since then; uses a single git diff",
+    )
+    parser.add_argument(
+        "--ref",
+        action="append",
+        metavar="REF",
+        help="Build the reference of the package as of this git ref (repeatable), "
+        "reading sources from the git objects of the --source_root repository "
+        "without a checkout; pages go to --versions_dir/<ref>/",
+    )
+    parser.add_argument(
+        "--archive",
+        action="append",
+        metavar="PATH",
+        help="Build the reference of the package in this wheel or sdist "
+        "(repeatable), read in memory without installing it; pages go to "
+        "--versions_dir/<version>/",
+    )
+    parser.add_argument(
+        "--versions_dir",
+        type=str,
+        default=None,
+        help="Output directory of --ref and --archive builds (default: versions "
+        "next to the output directory)",
+    )
+    parser.add_argument(
+        "--cache_file",
+        type=str,
+        default=None,
+        help="Path to the SQLite build cache (default: .api_docs_cache.sqlite "
+        "next to the output directory)",
+    )
+    parser.add_argument(
+        "--model_cache",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Directory of the documentation models extracted from sources, "
+        "reused while a module's source is unchanged (AST backend; default: "
+        ".api_docs_models next to the output directory)",
+    )
+    parser.add_argument(
+        "--export",
+        choices=["json", "text"],
+        default=None,
+        help="Instead of building pages, write each module's documentation as "
+        "JSON or plain text to --export_dir (AST backend)",
+    )
+    parser.add_argument(
+        "--export_dir",
+        type=str,
+        default=None,
+        help="Output directory of --export (default: api_<format> next to the "
+        "output directory)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["ast", "sphinx"],
+        default="ast",
+        help="Documentation backend: the built-in AST parser, or a single "
+        "batched sphinx-build (requires sphinx; uses lxml when installed)",
+    )
+    parser.add_argument(
+        "--sphinx_dir",
+        type=str,
+        default=None,
+        help="Persistent Sphinx project and doctree cache used by --backend sphinx "
+        "(default: .sphinx_build next to the output directory)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes for generation (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--no_xref",
+        action="store_true",
+        help="Do not turn :obj:`...` roles and documented type names into links",
+    )
+    parser.add_argument(
+        "--symbol_index",
+        type=str,
+        default=None,
+        help="Path of the JSON symbol index written by the AST backend "
+        "(default: api_symbols.json next to the output directory)",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        metavar="PATTERN",
+        help="Only build modules matching this fnmatch pattern, e.g. "
+        "'camel.agents.*' (repeatable); other pages are left untouched",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After building, keep watching the package sources and regenerate "
+        "the pages of modules as they are saved (AST backend only)",
     )
     parser.add_argument(
-        "--since_hours",
+        "--split_threshold",
         type=int,
-        default=24,
-        help="Hours to look back for changed files (used with --incremental)",
+        default=0,
+        metavar="KB",
+        help="Split module pages larger than this many KB into an overview page "
+        "plus one page per class under <module>/ (AST backend; default: 0, "
+        "never split)",
+    )
+    parser.add_argument(
+        "--no_llms_txt",
+        action="store_true",
+        help="Do not update llms.txt (page index with token counts) and "
+        "llms-full.txt (plain text of every page) next to docs.json",
+    )
+    parser.add_argument(
+        "--no_check",
+        action="store_true",
+        help="Do not check generated pages for MDX syntax errors (unclosed "
+        "braces and tags, stray <); by default such errors fail the build",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="TRACE_JSON",
+        help="Record wall time, CPU time and peak memory per stage and module, "
+        "print the slowest ones and write a Chrome trace (default: "
+        "api_docs_profile.json next to the output directory)",
     )
     args = parser.parse_args()
 
-    if not args.skip_generation:
-        # Update module mappings based on discovered structure
-        print("Discovering module structure...")
-        structure = update_module_mappings()
-        print(f"Discovered {len(structure)} top-level modules")
-        
-        # Create output directory
-        os.makedirs(args.output_dir, exist_ok=True)
+    if args.watch and args.backend != "ast":
+        parser.error("--watch requires --backend ast")
+    if args.only and args.clean:
+        parser.error("--clean would remove every page outside --only")
+    if args.since_ref and args.clean:
+        parser.error("--since_ref builds a subset of pages; --clean needs them all")
+    if args.split_threshold and args.backend != "ast":
+        parser.error("--split_threshold requires --backend ast")
+    if args.export:
+        if args.backend != "ast":
+            parser.error("--export requires --backend ast")
+        if args.ref or args.archive or args.watch or args.since_ref or args.clean:
+            parser.error(
+                "--export cannot be combined with --ref, --archive, --watch, "
+                "--since_ref or --clean"
+            )
+    if args.ref or args.archive:
+        if args.backend != "ast":
+            parser.error("--ref and --archive require --backend ast")
+        if args.incremental or args.since_ref or args.clean or args.watch:
+            parser.error(
+                "--ref and --archive always build every version in full; "
+                "they cannot be combined with --incremental, --since_ref, "
+                "--clean or --watch"
+            )
 
-        # Clean output directory (if needed)
-        if args.clean:
-            print(f"Cleaning output directory: {args.output_dir}")
-            for file in glob.glob(os.path.join(args.output_dir, "*.mdx")):
-                # Preserve the index.mdx file (API Reference landing page)
-                if os.path.basename(file) == "index.mdx":
-                    print(f"  Preserving {os.path.basename(file)}")
-                    continue
-                os.remove(file)
-                print(f"  Removed {os.path.basename(file)}")
+    cache_file = args.cache_file or os.path.join(
+        os.path.dirname(os.path.abspath(args.output_dir)),
+        ".api_docs_cache.sqlite",
+    )
+
+    symbol_index = args.symbol_index or os.path.join(
+        os.path.dirname(os.path.abspath(args.output_dir)), "api_symbols.json"
+    )
+
+    model_dir = args.model_cache or os.path.join(
+        os.path.dirname(os.path.abspath(args.output_dir)), ".api_docs_models"
+    )
+
+    if args.profile is None:
+        build_docs(args, cache_file, symbol_index, model_dir)
+    else:
+        profiler = BuildProfiler()
+        with profiler.activate():
+            build_docs(args, cache_file, symbol_index, model_dir)
+        trace_file = args.profile or os.path.join(
+            os.path.dirname(os.path.abspath(args.output_dir)), "api_docs_profile.json"
+        )
+        profiler.write_trace(trace_file)
+        print(f"\n{profiler.summary()}")
+        print(f"Profile trace: {trace_file}")
+
+    if args.watch:
+        watch_package(
+            args.output_dir, args.mint_json, args.package, args.source_root,
+            cache_file, symbol_index, not args.no_xref,
+            args.split_threshold * 1024 or None, DocModelCache(model_dir),
+            not args.no_llms_txt,
+        )
+
+
+BuildResult = namedtuple(
+    "BuildResult",
+    [
+        "modules", "generated", "skipped", "written", "unchanged", "removed",
+        "navigation", "navigation_updated", "issues", "timings",
+    ],
+)
+
+
+@contextlib.contextmanager
+def _timed_stage(timings, name):
+    """profile_stage that also adds the stage's wall time to timings[name]"""
+    start = time.perf_counter()
+    try:
+        with profile_stage(name):
+            yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def _file_stamp(path):
+    """Return (mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DocBuilder:
+    """Build the API reference in-process, keeping state warm between builds
+
+    The options are those of the command line; split_threshold is in bytes,
+    and docs.json is left alone if docs_json is None. Unless check is False,
+    every page generated is checked for MDX syntax errors (see check_mdx).
+    Nothing module-level is changed, so builders for different packages or
+    output directories can share a process, and builds of one builder are
+    serialized. Between builds a builder keeps the content hashes of
+    unchanged source files, the symbol table and the class hierarchy in
+    memory (as the process keeps the parsed-docstring memo), so a build
+    after a small edit only reads and parses what changed. The symbol table
+    and hierarchy are reloaded from the build cache if another process
+    wrote it in the meantime. The AST backend keeps the documentation
+    models it extracts in the model_cache directory (see DocModelCache).
+    Unless llms_txt is False, the reference pages in the llms.txt and
+    llms-full.txt bundles next to docs.json are updated after each build
+    (see update_llms_bundle).
+    """
+
+    def __init__(
+        self,
+        package="camel",
+        source_root=None,
+        output_dir="docs/mintlify/reference",
+        docs_json="docs/mintlify/docs.json",
+        backend="ast",
+        jobs=1,
+        xref=True,
+        split_threshold=None,
+        cache_file=None,
+        symbol_index=None,
+        sphinx_dir=None,
+        check=True,
+        model_cache=None,
+        llms_txt=True,
+    ):
+        self.package = package
+        self.source_root = source_root
+        self.output_dir = os.path.abspath(output_dir)
+        self.docs_json = docs_json
+        self.backend = backend
+        self.jobs = jobs
+        self.xref = backend == "ast" and xref
+        self.split_threshold = split_threshold
+        self.check = check
+        self.llms_txt = llms_txt
+        parent = os.path.dirname(self.output_dir)
+        self.cache_file = cache_file or os.path.join(parent, ".api_docs_cache.sqlite")
+        self.symbol_index = symbol_index or os.path.join(parent, "api_symbols.json")
+        self.sphinx_dir = sphinx_dir or os.path.join(parent, ".sphinx_build")
+        self.model_cache = DocModelCache(
+            model_cache or os.path.join(parent, ".api_docs_models")
+        )
+        self.config_hash = compute_config_hash(
+            package, backend, self.xref, split_threshold
+        )
+        self._lock = threading.Lock()
+        self._source_hashes = {}  # path: (mtime_ns, size, source hash)
+        self._symbol_table = None
+        self._hierarchy = None
+        self._cache_stamp = None
+
+    def build(
+        self,
+        only=None,
+        incremental=False,
+        since_ref=None,
+        clean=False,
+        skip_generation=False,
+    ):
+        """Generate pages and update docs.json, returning a BuildResult
+
+        only, incremental, since_ref, clean and skip_generation are as on
+        the command line. Raises RuntimeError if since_ref cannot be diffed.
+        """
+        with self._lock:
+            timings = {}
+            try:
+                return self._build(
+                    only, incremental, since_ref, clean, skip_generation, timings
+                )
+            except BaseException:
+                # The symbol table and hierarchy may be ahead of the cache
+                self._symbol_table = self._hierarchy = None
+                raise
+
+    def _scan(self):
+        """Index the package, reusing the hashes of files that did not change"""
+        index = PackageIndex(self.package, self.source_root)
+        stamps = {}
+        for module, info in index.modules.items():
+            # Stamped before hashing, so a save during the build is seen
+            # by the next one
+            stamp = _file_stamp(info.path)
+            if stamp is None:
+                continue
+            stamps[module] = (info.path,) + stamp
+            known = self._source_hashes.get(info.path)
+            if known and known[:2] == stamp:
+                index.seed_hash(module, known[2])
+        return index, stamps
+
+    def _load_state(self, cache):
+        """Return (symbol table, class hierarchy) as of the last build"""
+        if (
+            self._hierarchy is None
+            or (self.xref and self._symbol_table is None)
+            or _file_stamp(self.cache_file) != self._cache_stamp
+        ):
+            self._symbol_table = SymbolTable(cache.symbols()) if self.xref else None
+            self._hierarchy = ClassHierarchy(cache.classes())
+        return self._symbol_table, self._hierarchy
+
+    def _build(self, only, incremental, since_ref, clean, skip_generation, timings):
+        modules = []
+        generated_count = skipped_count = 0
+        issues = []
+        stats = OutputStats()
+        structure = None
+        if not skip_generation:
+            print("Discovering module structure...")
+            with _timed_stage(timings, "discover"):
+                index, stamps = self._scan()
+                structure = discover_module_structure(
+                    self.package, self.source_root, index
+                )
+            print(f"Discovered {len(structure)} top-level modules")
+
+            # Create output directory
+            os.makedirs(self.output_dir, exist_ok=True)
+
+            # Get modules to process
+            all_modules = index.names(only)
+            if only:
+                print(
+                    f"Selected {len(all_modules)} of {len(index.modules)} modules "
+                    f"matching {', '.join(only)}"
+                )
+            else:
+                print(f"Found {len(all_modules)} modules in {self.package}")
+
+            cache = BuildCache(self.cache_file)
+            try:
+                outcome = self._generate(
+                    cache, index, all_modules, incremental, since_ref, clean,
+                    stats, timings,
+                )
+            finally:
+                cache.close()
+                self._cache_stamp = _file_stamp(self.cache_file)
+                hashes = index.known_hashes()
+                self._source_hashes = {
+                    path: (mtime, size, hashes[module])
+                    for module, (path, mtime, size) in stamps.items()
+                    if module in hashes
+                }
+            if outcome is None:
+                return BuildResult([], 0, 0, 0, 0, 0, None, False, [], timings)
+            modules, generated_count, skipped_count, pages = outcome
 
-        # Get modules to process
-        if args.incremental:
             print(
-                f"Looking for modules changed in the last {args.since_hours} hours..."
+                f"\nGenerated: {generated_count} files, Skipped: {skipped_count} files"
             )
-            modules = get_changed_modules(args.package, args.since_hours)
-            if not modules:
-                print("No modules have been changed recently.")
-                return
-            print(f"Found {len(modules)} changed modules")
+            print(f"Output files: {stats.summary()}")
+
+            if self.check and pages:
+                with _timed_stage(timings, "check"):
+                    issues = check_mdx_files(pages)
+                print(f"Checked {len(pages)} pages: {len(issues)} MDX errors")
+
+        # Build module tree and update mint.json
+        print("\nUpdating mint.json configuration...")
+        navigation = None
+        navigation_updated = False
+        with _timed_stage(timings, "navigation"):
+            # Get generated MDX files
+            mdx_files = find_reference_pages(self.output_dir)
+            if not mdx_files:
+                print(f"No MDX files found in {self.output_dir}")
+            else:
+                print(f"Found {len(mdx_files)} MDX files")
+                display_names = module_order = None
+                if structure is not None:
+                    display_names, module_order = module_mappings(structure)
+
+                # Build module tree
+                module_tree = build_module_tree(mdx_files)
+
+                # Convert to navigation format
+                navigation = convert_tree_to_navigation(
+                    module_tree, module_order, display_names
+                )
+
+                # Update mint.json
+                if self.docs_json:
+                    navigation_updated = update_docs_json(self.docs_json, navigation)
+                if navigation_updated:
+                    print(
+                        f"Updated {self.docs_json} with {len(navigation)} navigation groups"
+                    )
+
+        if self.llms_txt and self.docs_json:
+            with _timed_stage(timings, "llms.txt"):
+                update_reference_bundle(self.output_dir, self.docs_json)
+
+        return BuildResult(
+            modules, generated_count, skipped_count, stats.written,
+            stats.unchanged, stats.removed, navigation, navigation_updated,
+            issues, timings,
+        )
+
+    def _generate(
+        self,
+        cache,
+        index,
+        all_modules,
+        incremental,
+        since_ref,
+        clean,
+        stats,
+        timings,
+    ):
+        """Generate the pages of a build; None if nothing needs doing
+
+        Returns (modules, generated count, skipped count, page files)
+        otherwise; the page files are those of every page generated.
+        """
+        output_dir = self.output_dir
+        config_hash = self.config_hash
+        with _timed_stage(timings, "plan"):
+            if since_ref:
+                # git knows what changed, so no source needs hashing
+                changes = git_changes(
+                    index.package_path, since_ref, (".py",)
+                ) if index.package_path else []
+                modules, removed = plan_git_build(
+                    all_modules, cache, changes, config_hash, self.package,
+                    self.source_root, known=index.modules,
+                )
+            else:
+                source_hashes = {
+                    module: index.source_hash(module) for module in all_modules
+                }
+                modules, removed = plan_incremental_build(
+                    all_modules, cache, source_hashes, config_hash,
+                    known=index.modules,
+                )
+
+        with _timed_stage(timings, "load cache"):
+            # Cross-references resolve against every documented symbol: those
+            # recorded by earlier builds, replaced as modules are regenerated.
+            # Likewise for the class hierarchy behind inherited members
+            previous_table, hierarchy = self._load_state(cache)
+            if self.backend != "ast":
+                hierarchy = None
+
+        if removed:
+            remove_vanished_pages(removed, cache, output_dir)
+
+        symbol_table = None
+        if self.xref:
+            symbol_table = previous_table.copy()
+            for module in removed:
+                symbol_table.replace_module(module, ())
+        if hierarchy is not None:
+            for module in removed:
+                hierarchy.replace_module(module, ())
+
+        incremental = (incremental or since_ref) and not clean
+        if incremental:
+            if not modules and not removed:
+                if since_ref:
+                    print(f"No modules have changed since {since_ref}.")
+                else:
+                    print("No modules have changed since the last build.")
+                return None
+            if since_ref:
+                print(
+                    f"Found {len(modules)} modules to regenerate and "
+                    f"{len(removed)} removed since {since_ref}"
+                )
+            else:
+                print(
+                    f"Found {len(modules)} changed and {len(removed)} removed modules"
+                )
+        else:
+            modules = all_modules
+
+        previous_outputs = {
+            module: entry[2] for module, entry in cache.entries().items()
+        }
+        results = []
+        pages = set()
+
+        def record_result(
+            module,
+            output_file,
+            dependencies,
+            symbols,
+            references,
+            classes,
+        ):
+            results.append(
+                (module, output_file, dependencies, symbols, references, classes)
+            )
+
+        @profiled("record")
+        def record_results(build_dir):
+            # Only record pages once they are in place, so an interrupted
+            # build is redone by the next --incremental run
+            for module, output_file, dependencies, symbols, references, classes in results:
+                if output_file:
+                    output_file = os.path.join(
+                        output_dir, os.path.relpath(output_file, build_dir)
+                    )
+                    pages.add(output_file)
+                    pages.update(
+                        page_file(output_dir, symbol.page) for symbol in symbols
+                    )
+                elif previous_outputs.get(module) and os.path.exists(previous_outputs[module]):
+                    # The module no longer has enough content for a page
+                    os.remove(previous_outputs[module])
+                    stats.removed += 1
+                # Class pages of modules that are no longer split (or were
+                # split differently) are not replaced by the staged sync
+                stats.removed += remove_stale_class_pages(
+                    output_dir, module, {symbol.page for symbol in symbols}
+                )
+                cache.record(
+                    module, index.source_hash(module), config_hash, output_file,
+                    dependencies, symbols, references, classes,
+                )
+            results.clear()
+
+        # Full rebuilds are generated into a sibling staging directory and
+        # synced into the output directory at the end, so an interrupted
+        # build leaves the previous pages in place; only changed pages are
+        # rewritten either way
+        if incremental:
+            build = contextlib.nullcontext(output_dir)
         else:
-            print(f"Discovering all modules in {args.package}...")
-            modules = get_all_modules(args.package)
+            build = staged_directory(
+                output_dir,
+                stats,
+                prune=("*.mdx",) if clean else (),
+                # Preserve the index.mdx file (API Reference landing page)
+                keep=("index.mdx",),
+            )
 
         # Generate documentation
         print(f"Generating documentation for {len(modules)} modules...")
-        generated_count, skipped_count = generate_custom_docs(modules, args.output_dir, args.package)
-
-        print(
-            f"\nGenerated: {generated_count} files, Skipped: {skipped_count} files"
-        )
+        with _timed_stage(timings, "generate"), build as build_dir:
+            page_stats = stats if incremental else None
+            if self.backend == "sphinx":
+                generated_count, skipped_count = generate_sphinx_docs(
+                    modules,
+                    build_dir,
+                    self.package,
+                    self.source_root,
+                    self.sphinx_dir,
+                    on_result=record_result,
+                    stats=page_stats,
+                )
+            else:
+                generated_count, skipped_count = generate_custom_docs(
+                    modules,
+                    build_dir,
+                    self.package,
+                    self.source_root,
+                    self.jobs,
+                    on_result=record_result,
+                    stats=page_stats,
+                    index=index,
+                    symbol_table=symbol_table,
+                    hierarchy=hierarchy,
+                    split_threshold=self.split_threshold,
+                    model_cache=self.model_cache,
+                )
+        record_results(build_dir)
 
-    # Build module tree and update mint.json
-    print("\nUpdating mint.json configuration...")
+        if self.xref:
+            # Pages that were not regenerated but mention a symbol that
+            # appeared, moved or disappeared need their links refreshed
+            relink = find_relinked_pages(
+                cache.references(), previous_table, symbol_table, exclude=set(modules)
+            )
+            relink = [module for module in relink if module in index]
+            if relink:
+                print(f"Relinking {len(relink)} pages whose references changed...")
+                with _timed_stage(timings, "relink"):
+                    generate_custom_docs(
+                        relink,
+                        output_dir,
+                        self.package,
+                        self.source_root,
+                        self.jobs,
+                        on_result=record_result,
+                        stats=stats,
+                        index=index,
+                        symbol_table=symbol_table,
+                        hierarchy=hierarchy,
+                        split_threshold=self.split_threshold,
+                        model_cache=self.model_cache,
+                    )
+                record_results(output_dir)
 
-    # Get generated MDX files
-    mdx_files = list(Path(args.output_dir).glob("*.mdx"))
-    if not mdx_files:
-        print(f"No MDX files found in {args.output_dir}")
-        return
+        # Symbols of unchanged modules come from the cache, so the index
+        # is complete after incremental and --only builds too
+        if self.backend == "ast":
+            with _timed_stage(timings, "symbol index"):
+                updated = write_symbol_index(cache, self.symbol_index)
+            if updated:
+                print(f"Updated symbol index {self.symbol_index}")
+            with _timed_stage(timings, "evict models"):
+                self.model_cache.evict()
 
-    print(f"Found {len(mdx_files)} MDX files")
+        self._symbol_table = symbol_table
+        return modules, generated_count, skipped_count, sorted(pages)
 
-    # Build module tree
-    module_tree = build_module_tree(mdx_files)
 
-    # Convert to navigation format
-    navigation = convert_tree_to_navigation(module_tree)
+def build_docs(args, cache_file, symbol_index, model_dir):
+    """Run one build with the parsed command line options"""
+    if args.ref or args.archive:
+        build_reference_versions(args, model_dir)
+        return
+    if args.export:
+        export_dir = args.export_dir or os.path.join(
+            os.path.dirname(os.path.abspath(args.output_dir)), f"api_{args.export}"
+        )
+        model_cache = DocModelCache(model_dir)
+        stats = export_models(
+            args.package, export_dir, args.export, args.source_root,
+            model_cache, args.only,
+        )
+        model_cache.evict()
+        print(f"Exported to {export_dir}: {stats.summary()}")
+        return
 
-    # Update mint.json
-    if update_docs_json(args.mint_json, navigation):
-        print(
-            f"Updated {args.mint_json} with {len(navigation)} navigation groups"
+    builder = DocBuilder(
+        args.package,
+        args.source_root,
+        args.output_dir,
+        args.mint_json,
+        args.backend,
+        args.jobs,
+        xref=not args.no_xref,
+        split_threshold=args.split_threshold * 1024 or None,
+        cache_file=cache_file,
+        symbol_index=symbol_index,
+        sphinx_dir=args.sphinx_dir,
+        check=not args.no_check,
+        model_cache=model_dir,
+        llms_txt=not args.no_llms_txt,
+    )
+    try:
+        result = builder.build(
+            args.only, args.incremental, args.since_ref, args.clean,
+            args.skip_generation,
         )
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print(f"Error: build cache {builder.cache_file}: {e}")
+        sys.exit(1)
+    if result.issues:
+        print("\nMDX errors (the Mintlify build would fail on these pages):")
+        for issue in result.issues:
+            print(f"  {format_mdx_issue(issue)}")
+        sys.exit(1)
+    if result.navigation is None:
+        return
 
     # Print navigation structure summary
     print("\nNavigation structure summary:")
-    for item in navigation:
+    for item in result.navigation:
         if isinstance(item, str):
             print(f"- {item}")
         else:
@@ -1344,7 +4648,10 @@ def main():
     print(f"Configuration file: {args.mint_json}")
 
     if not args.skip_generation:
-        print("\nDocumentation generated using custom AST parser.")
+        if args.backend == "sphinx":
+            print("\nDocumentation generated using Sphinx.")
+        else:
+            print("\nDocumentation generated using custom AST parser.")
         print("To preview your Mintlify documentation, run:")
         print("  cd docs/mintlify && npx mintlify dev")
 
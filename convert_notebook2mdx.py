@@ -22,17 +22,38 @@ the docs/cookbooks directory to mdx format for migration to mintify.
 """
 
 import argparse
-import json
+import base64
+import contextlib
 import os
 import re
-import subprocess
+import sys
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from pathlib import Path
 
+# Clock readings around the nbconvert imports, reported by --profile
+_IMPORT_START = (time.perf_counter_ns(), time.thread_time_ns())
 import nbformat
 from nbconvert import MarkdownExporter
 from nbconvert.preprocessors import Preprocessor
+_IMPORT_END = (time.perf_counter_ns(), time.thread_time_ns())
+
+from doc_build_utils import (
+    LLMS_FULL,
+    LLMS_INDEX,
+    BuildProfiler,
+    OutputStats,
+    check_mdx_files,
+    format_mdx_issue,
+    git_changes,
+    profile_stage,
+    profiled,
+    staged_directory,
+    update_json_subtree,
+    update_llms_bundle,
+    write_if_changed,
+)
 
 
 class RemoveOutputPreprocessor(Preprocessor):
@@ -45,6 +66,24 @@ class RemoveOutputPreprocessor(Preprocessor):
         return cell, resources
 
 
+def create_exporter(remove_outputs=True):
+    """Return the nbconvert exporter that turns notebooks into Markdown"""
+    # Configure exporter; if outputs need to be removed, add preprocessor
+    with profile_stage("exporter setup"):
+        exporter = MarkdownExporter()
+        if remove_outputs:
+            # Create a preprocessor to remove code cell outputs
+            exporter.register_preprocessor(RemoveOutputPreprocessor, enabled=True)
+    return exporter
+
+
+@profiled("base64 decode")
+def decode_base64_image(base64_data):
+    """Decode the payload of a data:image URI"""
+    return base64.b64decode(base64_data)
+
+
+@profiled("fix html tags")
 def fix_html_tags(content):
     """Fix HTML tag closures and handle MDX special syntax."""
     # Fix common unclosed tags
@@ -119,14 +158,19 @@ def fix_duplicate_paths(path_str):
 
 
 def convert_md_to_mdx(
-    md_file, output_dir=None, image_dir=None, input_root=None
+    md_file, output_dir=None, image_dir=None, input_root=None, stats=None
 ):
-    """Convert Markdown files to MDX format."""
+    """Convert Markdown files to MDX format.
+
+    Output files are only rewritten when their content changes; stats, if
+    given, is an OutputStats counting the outcome of each write.
+    """
     print(f"Converting MD file: {md_file}")
 
     # Read Markdown file content
-    with open(md_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with profile_stage("read"):
+        with open(md_file, 'r', encoding='utf-8') as f:
+            content = f.read()
 
     # Create output file path
     if output_dir:
@@ -163,10 +207,9 @@ def convert_md_to_mdx(
                 image_path = os.path.join(image_output_dir, image_name)
 
                 # Save image
-                import base64
-
-                with open(image_path, 'wb') as img_file:
-                    img_file.write(base64.b64decode(base64_data))
+                write_if_changed(
+                    image_path, decode_base64_image(base64_data), stats
+                )
 
                 images_saved.append((image_name, image_path))
                 print(
@@ -217,10 +260,9 @@ def convert_md_to_mdx(
                 image_path = os.path.join(image_output_dir, image_name)
 
                 # Save image
-                import base64
-
-                with open(image_path, 'wb') as img_file:
-                    img_file.write(base64.b64decode(base64_data))
+                write_if_changed(
+                    image_path, decode_base64_image(base64_data), stats
+                )
 
                 images_saved.append((image_name, image_path))
                 print(
@@ -264,12 +306,12 @@ title: "{title}"
         content = front_matter + content
 
     # Write to MDX file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    write_if_changed(output_file, content, stats)
 
     return output_file
 
 
+@profiled("standardize html")
 def standardize_html_blocks(content):
     """Standardize HTML code blocks, especially for handling button and image layouts."""
     print("Starting to standardize HTML code blocks...")
@@ -348,13 +390,21 @@ def convert_ipynb_to_mdx(
     image_dir=None,
     input_root=None,
     remove_outputs=True,
+    stats=None,
+    exporter=None,
 ):
-    """Convert Jupyter Notebook to MDX format."""
+    """Convert Jupyter Notebook to MDX format.
+
+    Output files are written as in convert_md_to_mdx. An exporter from
+    create_exporter may be passed to reuse it across notebooks, in which
+    case remove_outputs is ignored.
+    """
     print(f"Converting IPYNB file: {ipynb_file}")
 
     # Read Jupyter Notebook
-    with open(ipynb_file, 'r', encoding='utf-8') as f:
-        notebook = nbformat.read(f, as_version=4)
+    with profile_stage("read"):
+        with open(ipynb_file, 'r', encoding='utf-8') as f:
+            notebook = nbformat.read(f, as_version=4)
 
     # Create output file path
     if output_dir:
@@ -368,14 +418,12 @@ def convert_ipynb_to_mdx(
     # Ensure image output directory exists
     os.makedirs(image_output_dir, exist_ok=True)
 
-    # Configure exporter; if outputs need to be removed, add preprocessor
-    exporter = MarkdownExporter()
-    if remove_outputs:
-        # Create a preprocessor to remove code cell outputs
-        exporter.register_preprocessor(RemoveOutputPreprocessor, enabled=True)
+    if exporter is None:
+        exporter = create_exporter(remove_outputs)
 
     # Use nbconvert to convert Notebook to Markdown
-    markdown, resources = exporter.from_notebook_node(notebook)
+    with profile_stage("nbconvert"):
+        markdown, resources = exporter.from_notebook_node(notebook)
 
     # Extract and save images
     images_saved = []
@@ -383,8 +431,7 @@ def convert_ipynb_to_mdx(
         print(f"  Found {len(resources['outputs'])} image resources")
         for image_name, image_data in resources['outputs'].items():
             image_path = os.path.join(image_output_dir, image_name)
-            with open(image_path, 'wb') as f:
-                f.write(image_data)
+            write_if_changed(image_path, image_data, stats)
             images_saved.append((image_name, image_path))
 
     # Images are always in ./images/ relative to mdx file
@@ -407,10 +454,9 @@ def convert_ipynb_to_mdx(
                 image_path = os.path.join(image_output_dir, image_name)
 
                 # Save image
-                import base64
-
-                with open(image_path, 'wb') as img_file:
-                    img_file.write(base64.b64decode(base64_data))
+                write_if_changed(
+                    image_path, decode_base64_image(base64_data), stats
+                )
 
                 images_saved.append((image_name, image_path))
                 print(
@@ -468,10 +514,9 @@ def convert_ipynb_to_mdx(
                 image_path = os.path.join(image_output_dir, image_name)
 
                 # Save image
-                import base64
-
-                with open(image_path, 'wb') as img_file:
-                    img_file.write(base64.b64decode(base64_data))
+                write_if_changed(
+                    image_path, decode_base64_image(base64_data), stats
+                )
 
                 images_saved.append((image_name, image_path))
                 print(
@@ -531,12 +576,19 @@ title: "{title}"
     markdown = front_matter + markdown
 
     # Write to MDX file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(markdown)
+    write_if_changed(output_file, markdown, stats)
 
     return output_file
 
 
+def _group_output_dir(file_path, directory, output_dir):
+    """Return the group-specific output directory of a source file"""
+    group_name = smart_detect_group_from_path(file_path, directory)
+    if 'cookbooks' in str(file_path):
+        return output_dir / "cookbooks" / group_name
+    return output_dir / group_name
+
+
 def process_directory(
     directory,
     output_dir=None,
@@ -548,8 +600,14 @@ def process_directory(
     use_git=False,
     base_branch="origin/master",
     specific_files=None,
+    stats=None,
+    exporter=None,
 ):
-    """Process all ipynb and md files in the specified directory and its subdirectories."""
+    """Process all ipynb and md files in the specified directory and its subdirectories.
+
+    stats, if given, is the OutputStats that counts the output files, and
+    exporter is passed on to convert_ipynb_to_mdx.
+    """
     directory = Path(directory)
     converted_files = []
 
@@ -558,12 +616,15 @@ def process_directory(
         os.makedirs(output_dir, exist_ok=True)
 
     # Statistics counters
+    if stats is None:
+        stats = OutputStats()
     total_ipynb = 0
     total_md = 0
     total_images = 0
 
     # Determine which files to process
     files_to_process = []
+    deleted_files = []
     
     if specific_files:
         # Process specific files provided
@@ -573,12 +634,26 @@ def process_directory(
         if use_git:
             # Use git to find changed files
             print(f"Looking for files changed compared to {base_branch}...")
-            files_to_process = get_git_changed_files(directory, base_branch)
+            files_to_process, deleted_files = get_git_changed_files(
+                directory, base_branch
+            )
         else:
             # Use file modification time
             print(f"Looking for files changed in the last {since_hours} hours...")
             files_to_process = get_changed_files(directory, since_hours)
         
+        for file_path in deleted_files:
+            # Renamed files are converted under their new name below
+            if output_dir:
+                output_file = _group_output_dir(file_path, directory, output_dir)
+                output_file = output_file / f"{file_path.stem}.mdx"
+            else:
+                output_file = file_path.with_suffix('.mdx')
+            if output_file.exists():
+                os.remove(output_file)
+                stats.removed += 1
+                print(f"  Removed {output_file} ({file_path.name} was deleted or renamed)")
+
         if not files_to_process:
             print("No changed files found.")
             return converted_files
@@ -589,53 +664,70 @@ def process_directory(
     else:
         # Process all files (original behavior)
         print("Processing all files in directory...")
-        for root, _dirs, files in os.walk(directory):
-            root_path = Path(root)
-            for file in files:
-                if file.endswith(('.ipynb', '.md')):
-                    files_to_process.append(root_path / file)
+        with profile_stage("discover"):
+            for root, _dirs, files in os.walk(directory):
+                root_path = Path(root)
+                for file in files:
+                    if file.endswith(('.ipynb', '.md')):
+                        files_to_process.append(root_path / file)
+
+    # A full conversion into a separate output directory is staged next to
+    # it and synced in at the end, so an interrupted run leaves the previous
+    # files in place; only files whose content changed are rewritten
+    if output_dir and not incremental and not specific_files:
+        build = staged_directory(output_dir, stats)
+        page_stats = None  # Counted when the staging directory is synced
+    else:
+        build = contextlib.nullcontext(output_dir)
+        page_stats = stats
 
     # Process the determined files
-    for file_path in files_to_process:
-        # Determine the group for this file
-        group_name = smart_detect_group_from_path(file_path, directory)
-        
-        # Create output directory structure
-        if output_dir:
-            # Create group-specific output directory
-            if 'cookbooks' in str(file_path):
-                current_output_dir = output_dir / "cookbooks" / group_name
+    with build as build_dir:
+        build_dir = Path(build_dir) if build_dir else None
+        for file_path in files_to_process:
+            # Create output directory structure
+            if output_dir:
+                current_output_dir = _group_output_dir(file_path, directory, build_dir)
+                os.makedirs(current_output_dir, exist_ok=True)
             else:
-                current_output_dir = output_dir / group_name
-            os.makedirs(current_output_dir, exist_ok=True)
-        else:
-            current_output_dir = None
-
-        # Process the file
-        try:
-            if file_path.suffix == '.ipynb':
-                output_file = convert_ipynb_to_mdx(
-                    file_path,
-                    current_output_dir,
-                    None,  # No longer use image_dir
-                    directory,
-                    remove_outputs,
-                )
-                converted_files.append((file_path, output_file))
-                total_ipynb += 1
-                print(f"  Converted IPYNB: {file_path.name} -> {output_file}")
-            elif file_path.suffix == '.md':
-                output_file = convert_md_to_mdx(
-                    file_path,
-                    current_output_dir,
-                    None,  # No longer use image_dir
-                    directory,
-                )
-                converted_files.append((file_path, output_file))
-                total_md += 1
-                print(f"  Converted MD: {file_path.name} -> {output_file}")
-        except Exception as e:
-            print(f"Error converting {file_path}: {e}")
+                current_output_dir = None
+
+            # Process the file
+            with profile_stage("convert", str(file_path)):
+                try:
+                    if file_path.suffix == '.ipynb':
+                        output_file = convert_ipynb_to_mdx(
+                            file_path,
+                            current_output_dir,
+                            None,  # No longer use image_dir
+                            directory,
+                            remove_outputs,
+                            page_stats,
+                            exporter,
+                        )
+                        converted_files.append((file_path, output_file))
+                        total_ipynb += 1
+                        print(f"  Converted IPYNB: {file_path.name} -> {output_file}")
+                    elif file_path.suffix == '.md':
+                        output_file = convert_md_to_mdx(
+                            file_path,
+                            current_output_dir,
+                            None,  # No longer use image_dir
+                            directory,
+                            page_stats,
+                        )
+                        converted_files.append((file_path, output_file))
+                        total_md += 1
+                        print(f"  Converted MD: {file_path.name} -> {output_file}")
+                except Exception as e:
+                    print(f"Error converting {file_path}: {e}")
+
+    if output_dir and build_dir != output_dir:
+        # Report the synced locations rather than the staging directory
+        converted_files = [
+            (source, output_dir / Path(dest).relative_to(build_dir))
+            for source, dest in converted_files
+        ]
 
     # Count images in output directory
     if output_dir:
@@ -653,42 +745,18 @@ def process_directory(
     print(f"- IPYNB files: {total_ipynb}")
     print(f"- MD files: {total_md}")
     print(f"- Extracted images: {total_images}")
+    print(f"- Output files: {stats.summary()}")
 
     return converted_files
 
 
-def generate_navigation_from_files(output_dir, relative_path_prefix=""):
+def find_cookbook_pages(output_dir, relative_path_prefix=""):
     """
-    Generate navigation structure for docs.json based on converted files.
+    Return (group name, docs.json page, file) for every converted cookbook
+    page under output_dir, index pages excepted.
     """
     output_dir = Path(output_dir)
-
-    # Define group mapping and order
-    group_mapping = {
-        'basic_concepts': 'Basic Concepts',
-        'advanced_features': 'Advanced Features',
-        'applications': 'Applications',
-        'data_generation': 'Data Generation',
-        'data_processing': 'Data Processing',
-        'loong': 'Loong',
-        'multi_agent_society': 'Multi Agent Society',
-        'mcp': 'MCP',
-    }
-
-    # Group order (adding mcp to the list)
-    group_order = [
-        'basic_concepts',
-        'advanced_features',
-        'applications',
-        'data_generation',
-        'data_processing',
-        'loong',
-        'multi_agent_society',
-        'mcp',
-    ]
-
-    # Collect all mdx files organized by group
-    groups = defaultdict(list)
+    pages = []
 
     # Look for cookbooks directory structure
     cookbooks_dir = (
@@ -710,7 +778,7 @@ def generate_navigation_from_files(output_dir, relative_path_prefix=""):
                         if file_path.stem != "index":
                             # Create relative path for docs.json
                             rel_path = f"{relative_path_prefix}cookbooks/{group_name}/{file_path.stem}"
-                            groups[group_name].append(rel_path)
+                            pages.append((group_name, rel_path, file_path))
         else:
             # Check if this directory itself is a group directory
             # Extract group name from the path
@@ -728,7 +796,45 @@ def generate_navigation_from_files(output_dir, relative_path_prefix=""):
                 for file_path in output_dir.glob("*.mdx"):
                     if file_path.stem != "index":
                         rel_path = f"{relative_path_prefix}cookbooks/{group_name}/{file_path.stem}"
-                        groups[group_name].append(rel_path)
+                        pages.append((group_name, rel_path, file_path))
+
+    return pages
+
+
+def generate_navigation_from_files(output_dir, relative_path_prefix=""):
+    """
+    Generate navigation structure for docs.json based on converted files.
+    """
+    # Define group mapping and order
+    group_mapping = {
+        'basic_concepts': 'Basic Concepts',
+        'advanced_features': 'Advanced Features',
+        'applications': 'Applications',
+        'data_generation': 'Data Generation',
+        'data_processing': 'Data Processing',
+        'loong': 'Loong',
+        'multi_agent_society': 'Multi Agent Society',
+        'mcp': 'MCP',
+    }
+
+    # Group order (adding mcp to the list)
+    group_order = [
+        'basic_concepts',
+        'advanced_features',
+        'applications',
+        'data_generation',
+        'data_processing',
+        'loong',
+        'multi_agent_society',
+        'mcp',
+    ]
+
+    # Collect all mdx files organized by group
+    groups = defaultdict(list)
+    for group_name, rel_path, _file_path in find_cookbook_pages(
+        output_dir, relative_path_prefix
+    ):
+        groups[group_name].append(rel_path)
 
     # Generate navigation structure
     navigation_groups = []
@@ -764,6 +870,9 @@ def generate_navigation_from_files(output_dir, relative_path_prefix=""):
 def update_docs_json(docs_json_path, output_dir, relative_path_prefix=""):
     """
     Update docs.json file with newly converted files.
+
+    Only the Cookbooks group is changed, under a lock, so a concurrent API
+    reference build keeps its update (see update_json_subtree).
     """
     docs_json_path = Path(docs_json_path)
 
@@ -772,10 +881,6 @@ def update_docs_json(docs_json_path, output_dir, relative_path_prefix=""):
         return False
 
     try:
-        # Read current docs.json
-        with open(docs_json_path, 'r', encoding='utf-8') as f:
-            docs_config = json.load(f)
-
         # Generate new navigation for cookbooks
         new_cookbooks_nav = generate_navigation_from_files(
             output_dir, relative_path_prefix
@@ -785,31 +890,30 @@ def update_docs_json(docs_json_path, output_dir, relative_path_prefix=""):
             print("No cookbooks navigation to update")
             return False
 
-        # Find and update the Cookbooks section in navigation
-        updated = False
-        for tab in docs_config.get("navigation", {}).get("tabs", []):
-            if tab.get("tab") == "Documentation":
-                for group in tab.get("groups", []):
-                    if group.get("group") == "Cookbooks":
-                        # Update the pages structure
-                        group["pages"] = new_cookbooks_nav
-                        updated = True
-                        print(
-                            f"Updated Cookbooks navigation with {len(new_cookbooks_nav)} groups"
-                        )
-                        break
-                if updated:
-                    break
+        def update(group):
+            group["pages"] = new_cookbooks_nav
+            return group
 
-        if not updated:
+        try:
+            updated = update_json_subtree(
+                docs_json_path,
+                [
+                    "navigation", "tabs", ("tab", "Documentation"),
+                    "groups", ("group", "Cookbooks"),
+                ],
+                update,
+            )
+        except LookupError:
             print("Could not find Cookbooks section in docs.json to update")
             return False
 
-        # Write updated docs.json
-        with open(docs_json_path, 'w', encoding='utf-8') as f:
-            json.dump(docs_config, f, indent=2, ensure_ascii=False)
-
-        print(f"Successfully updated {docs_json_path}")
+        if updated:
+            print(
+                f"Updated Cookbooks navigation with {len(new_cookbooks_nav)} groups"
+            )
+            print(f"Successfully updated {docs_json_path}")
+        else:
+            print(f"Cookbooks navigation in {docs_json_path} is already up to date")
         return True
 
     except Exception as e:
@@ -843,35 +947,31 @@ def get_changed_files(directory, since_hours=24, file_extensions=None):
 
 
 def get_git_changed_files(directory, base_branch="origin/master", file_extensions=None):
-    """Get files changed in git compared to base branch"""
+    """Get files changed in git compared to base branch
+
+    Returns (changed, deleted): files added, modified or renamed, and files
+    deleted or renamed away, from a single git diff against the working
+    tree (see git_changes).
+    """
     if file_extensions is None:
         file_extensions = ['.ipynb', '.md']
-    
+
     try:
-        # Get list of changed files from git
-        result = subprocess.run([
-            'git', 'diff', '--name-only', base_branch, 'HEAD'
-        ], capture_output=True, text=True, cwd=directory)
-        
-        if result.returncode != 0:
-            print(f"Git command failed: {result.stderr}")
-            return []
-        
-        changed_files = []
-        directory = Path(directory)
-        
-        for file_path in result.stdout.strip().split('\n'):
-            if file_path:  # Skip empty lines
-                full_path = directory / file_path
-                # Check if file exists and has the right extension
-                if full_path.exists() and any(file_path.endswith(ext) for ext in file_extensions):
-                    changed_files.append(full_path)
-        
-        return sorted(changed_files)
-        
-    except Exception as e:
+        changes = git_changes(directory, base_branch, file_extensions)
+    except (OSError, RuntimeError) as e:
         print(f"Error getting git changed files: {e}")
-        return []
+        return [], []
+
+    changed = []
+    deleted = []
+    for change in changes:
+        if change.status == "D":
+            deleted.append(Path(change.path))
+            continue
+        changed.append(Path(change.path))
+        if change.old_path:
+            deleted.append(Path(change.old_path))
+    return sorted(changed), sorted(deleted)
 
 
 def smart_detect_group_from_path(file_path, input_root):
@@ -942,34 +1042,202 @@ def main():
         default='',
         help='Path prefix for docs.json navigation entries (e.g., "docs/")',
     )
+    parser.add_argument(
+        '--since-ref',
+        metavar='REF',
+        help='Only convert files changed since this git ref (e.g. origin/master), '
+        'and remove the output of files deleted or renamed since then',
+    )
+    parser.add_argument(
+        '--no-llms-txt',
+        action='store_true',
+        help='Do not update llms.txt (page index with token counts) and '
+        'llms-full.txt (plain text of every page) next to docs.json',
+    )
+    parser.add_argument(
+        '--no-check',
+        action='store_true',
+        help='Do not check converted files for MDX syntax errors (unclosed '
+        'braces and tags, stray <); by default such errors fail the run',
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='TRACE_JSON',
+        help='Record wall time, CPU time and peak memory per stage and file, '
+        'print the slowest ones and write a Chrome trace (default: '
+        'notebook_profile.json next to the output directory)',
+    )
 
     args = parser.parse_args()
 
-    print(f"Starting to process directory: {args.input}")
-    converted_files = process_directory(
+    profiler = None
+    if args.profile is not None:
+        profiler = BuildProfiler()
+        profiler.add_span("import", _IMPORT_START, _IMPORT_END)
+
+    with profiler.activate() if profiler else contextlib.nullcontext():
+        convert_and_update(args)
+
+    if profiler:
+        trace_file = args.profile or os.path.join(
+            os.path.dirname(os.path.abspath(args.output or args.input)),
+            'notebook_profile.json',
+        )
+        profiler.write_trace(trace_file)
+        print(f"\n{profiler.summary()}")
+        print(f"Profile trace: {trace_file}")
+
+
+ConversionResult = namedtuple(
+    "ConversionResult",
+    [
+        "converted", "written", "unchanged", "removed", "docs_json_updated",
+        "issues", "timings",
+    ],
+)
+
+
+@contextlib.contextmanager
+def _timed_stage(timings, name):
+    """profile_stage that also adds the stage's wall time to timings[name]"""
+    start = time.perf_counter()
+    try:
+        with profile_stage(name):
+            yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+class NotebookConverter:
+    """Convert cookbooks in-process, keeping the nbconvert exporter warm
+
+    The options are those of the command line; docs.json is only updated
+    if docs_json and output_dir are given, and so are the cookbook pages in
+    the llms.txt and llms-full.txt bundles next to it, unless llms_txt is
+    False (see update_llms_bundle). Unless check is False, converted files
+    are checked for MDX syntax errors (see check_mdx). The exporter (and
+    the templates it loads) is created by the first conversion and reused
+    by every later one. Nothing module-level is changed, and conversions of
+    one converter are serialized.
+    """
+
+    def __init__(
+        self,
+        input_dir='docs/cookbooks',
+        output_dir=None,
+        remove_outputs=True,
+        docs_json=None,
+        docs_path_prefix='',
+        check=True,
+        llms_txt=True,
+    ):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.remove_outputs = remove_outputs
+        self.docs_json = docs_json
+        self.docs_path_prefix = docs_path_prefix
+        self.check = check
+        self.llms_txt = llms_txt
+        self._exporter = None
+        self._lock = threading.Lock()
+
+    @property
+    def exporter(self):
+        if self._exporter is None:
+            self._exporter = create_exporter(self.remove_outputs)
+        return self._exporter
+
+    def convert(self, since_ref=None, files=None):
+        """Convert the input directory, returning a ConversionResult
+
+        With since_ref, only files changed since that git ref are converted
+        (see process_directory); files converts just the given files.
+        """
+        with self._lock:
+            timings = {}
+            stats = OutputStats()
+            print(f"Starting to process directory: {self.input_dir}")
+            with _timed_stage(timings, "convert"):
+                converted_files = process_directory(
+                    self.input_dir,
+                    self.output_dir,
+                    remove_outputs=self.remove_outputs,
+                    incremental=bool(since_ref),
+                    use_git=bool(since_ref),
+                    base_branch=since_ref,
+                    specific_files=files,
+                    stats=stats,
+                    exporter=self.exporter,
+                )
+            print(f"Conversion completed, processed {len(converted_files)} files")
+
+            issues = []
+            if self.check and converted_files:
+                with _timed_stage(timings, "check"):
+                    issues = check_mdx_files(dest for _source, dest in converted_files)
+                print(f"Checked {len(converted_files)} files: {len(issues)} MDX errors")
+
+            # Update docs.json if requested
+            updated = False
+            if self.docs_json and self.output_dir:
+                print("\nUpdating docs.json...")
+                with _timed_stage(timings, "docs.json"):
+                    updated = update_docs_json(
+                        self.docs_json, self.output_dir, self.docs_path_prefix
+                    )
+                if updated:
+                    print("docs.json update completed successfully")
+                else:
+                    print("docs.json update failed")
+
+            if self.llms_txt and self.docs_json and self.output_dir:
+                bundle_dir = os.path.dirname(os.path.abspath(self.docs_json))
+                with _timed_stage(timings, "llms.txt"):
+                    bundle_updated = update_llms_bundle(
+                        bundle_dir,
+                        "cookbooks",
+                        {
+                            page: file_path
+                            for _group, page, file_path in find_cookbook_pages(
+                                self.output_dir, self.docs_path_prefix
+                            )
+                        },
+                    )
+                if bundle_updated:
+                    print(f"Updated {LLMS_INDEX} and {LLMS_FULL} in {bundle_dir}")
+
+            return ConversionResult(
+                converted_files, stats.written, stats.unchanged, stats.removed,
+                updated, issues, timings,
+            )
+
+
+def convert_and_update(args):
+    """Convert the input directory and update docs.json as requested"""
+    converter = NotebookConverter(
         args.input,
         args.output,
-        args.images,
         remove_outputs=not args.keep_outputs,
+        docs_json=args.update_docs_json,
+        docs_path_prefix=args.docs_path_prefix,
+        check=not args.no_check,
+        llms_txt=not args.no_llms_txt,
     )
-
-    print(f"Conversion completed, processed {len(converted_files)} files")
+    result = converter.convert(since_ref=args.since_ref)
 
     if args.verbose:
         print("Conversion details:")
-        for source, dest in converted_files:
+        for source, dest in result.converted:
             print(f"{source} -> {dest}")
 
-    # Update docs.json if requested
-    if args.update_docs_json and args.output:
-        print("\nUpdating docs.json...")
-        success = update_docs_json(
-            args.update_docs_json, args.output, args.docs_path_prefix
-        )
-        if success:
-            print("docs.json update completed successfully")
-        else:
-            print("docs.json update failed")
+    if result.issues:
+        print("\nMDX errors (the Mintlify build would fail on these files):")
+        for issue in result.issues:
+            print(f"  {format_mdx_issue(issue)}")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,1229 @@
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ========= Copyright 2023-2024 @ CAMEL-AI.org. All Rights Reserved. =========
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Helpers shared by build_api_docs.py and convert_notebook2mdx.py.
+
+Output files are only rewritten when their content changes, and every write
+is atomic (temporary file plus rename), so unchanged pages keep their mtimes
+and an interrupted build never leaves a truncated file behind.
+
+git_changes lists the files changed since a git ref, with deletions and
+renames, for builds that only redo what a branch touched. git_tree_files,
+read_git_blobs and read_archive read sources straight from a git ref or a
+wheel or sdist, without a checkout or an install.
+
+update_json_subtree changes one part of a JSON file such as docs.json under
+a file lock, so the API reference and cookbook builds can update their own
+navigation concurrently.
+
+check_mdx finds the MDX syntax errors (unclosed braces and tags, stray <)
+that would otherwise only surface when the Mintlify build fails.
+
+update_llms_bundle keeps llms.txt and llms-full.txt, the index and the
+plain text of the docs for LLM consumers, up to date page by page.
+
+BuildProfiler records per-stage timings and memory for --profile.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import copy
+import filecmp
+import fnmatch
+import functools
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from collections import namedtuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Files created through mkstemp are private; give them the usual permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+# Rows shown in each table of the --profile summary
+PROFILE_TOP_N = 15
+
+
+class OutputStats:
+    """Counts of output files written, left unchanged and removed"""
+
+    def __init__(self):
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def add(self, written):
+        if written:
+            self.written += 1
+        else:
+            self.unchanged += 1
+
+    def summary(self):
+        text = f"{self.written} written, {self.unchanged} unchanged"
+        if self.removed:
+            text += f", {self.removed} removed"
+        return text
+
+
+def profiled(name):
+    """Decorator recording every call of a function as a stage of the active profiler
+
+    The cache_info and cache_clear methods of a functools.lru_cache function
+    stay available on the decorated function.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE_PROFILER.get()
+            if profiler is None:
+                return func(*args, **kwargs)
+            with profiler.stage(name):
+                return func(*args, **kwargs)
+        for attr in ("cache_info", "cache_clear", "cache_parameters"):
+            if hasattr(func, attr):
+                setattr(wrapper, attr, getattr(func, attr))
+        return wrapper
+    return decorator
+
+
+@profiled("write")
+def write_if_changed(path, content, stats=None):
+    """Atomically write content to path unless the file already holds it.
+
+    content may be str (written as UTF-8) or bytes. Returns True if the file
+    was written.
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    path = os.fspath(path)
+
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                if f.read() == data:
+                    if stats is not None:
+                        stats.add(False)
+                    return False
+    except OSError:
+        pass  # Missing or unreadable; write it
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+    if stats is not None:
+        stats.add(True)
+    return True
+
+
+def sync_tree(source_dir, target_dir, stats=None, prune=(), keep=()):
+    """Move every file under source_dir into target_dir if its content differs.
+
+    Files in target_dir whose names match one of the prune patterns and that
+    were not produced in source_dir are deleted, except for names in keep.
+    Both directories must be on the same filesystem.
+    """
+    synced = set()
+    for root, _dirs, files in os.walk(source_dir):
+        rel_root = os.path.relpath(root, source_dir)
+        for name in files:
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            synced.add(rel_path)
+            source = os.path.join(root, name)
+            target = os.path.join(target_dir, rel_path)
+
+            if os.path.isfile(target) and filecmp.cmp(source, target, shallow=False):
+                if stats is not None:
+                    stats.add(False)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(source, target)
+            if stats is not None:
+                stats.add(True)
+
+    if not prune:
+        return
+    for root, _dirs, files in os.walk(target_dir):
+        rel_root = os.path.relpath(root, target_dir)
+        for name in files:
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            if rel_path in synced or name in keep:
+                continue
+            if any(fnmatch.fnmatch(name, pattern) for pattern in prune):
+                os.remove(os.path.join(root, name))
+                if stats is not None:
+                    stats.removed += 1
+
+
+@contextlib.contextmanager
+def staged_directory(target_dir, stats=None, prune=(), keep=()):
+    """Build into a sibling staging directory and sync it into target_dir.
+
+    The target is only touched once the body finishes without an exception;
+    see sync_tree for the meaning of prune and keep. The staging directory is
+    always removed afterwards.
+    """
+    target_dir = os.path.abspath(os.fspath(target_dir))
+    parent = os.path.dirname(target_dir)
+    os.makedirs(target_dir, exist_ok=True)
+
+    staging_dir = tempfile.mkdtemp(
+        prefix=f".{os.path.basename(target_dir)}.staging-", dir=parent
+    )
+    try:
+        yield staging_dir
+        with profile_stage("sync"):
+            sync_tree(staging_dir, target_dir, stats, prune, keep)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on path, created if missing, across processes
+
+    Lock a file of its own rather than the data file: atomic writes replace
+    the data file, and a lock on the replaced file protects nothing.
+    """
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _select(node, selector):
+    """Return the key or index selector picks in node, or None"""
+    if isinstance(selector, tuple):
+        field, value = selector
+        if isinstance(node, list):
+            for i, item in enumerate(node):
+                if isinstance(item, dict) and item.get(field) == value:
+                    return i
+        return None
+    if isinstance(node, dict) and selector in node:
+        return selector
+    return None
+
+
+def update_json_subtree(path, selectors, update):
+    """Replace one subtree of a JSON file without losing concurrent updates
+
+    The file is read, changed and written while holding file_lock on
+    "<path>.lock", so processes updating different subtrees of the same
+    file (the API reference and the cookbooks in docs.json) all keep their
+    changes. selectors lead from the root to the subtree: a string selects
+    a key of an object, a (key, value) pair the first object in a list
+    whose key holds value. update(subtree) returns the new subtree; it gets
+    a copy, so it may change it in place.
+
+    Nothing outside the subtree changes, and the file keeps its indent=2
+    layout, so the diff is limited to the subtree. The file is written
+    atomically, and only if the subtree changed. Returns True if it was
+    written; raises LookupError if a selector matches nothing.
+    """
+    path = os.fspath(path)
+    with file_lock(path + ".lock"):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        data = json.loads(text)
+
+        parent, key, node = None, None, data
+        for selector in selectors:
+            parent, key = node, _select(node, selector)
+            if key is None:
+                raise LookupError(f"{selector!r} not found in {path}")
+            node = parent[key]
+
+        new = update(copy.deepcopy(node))
+        if new == node:
+            return False
+        if parent is None:
+            data = new
+        else:
+            parent[key] = new
+        content = json.dumps(data, indent=2, ensure_ascii=False)
+        if text.endswith("\n"):
+            content += "\n"
+        return write_if_changed(path, content)
+
+
+GitChange = namedtuple("GitChange", ["status", "path", "old_path"])
+
+
+def git_changes(directory, ref, suffixes=None, target=None):
+    """Return the files under directory changed between ref and target
+
+    target defaults to the working tree (untracked files are not seen).
+    Runs a single git diff with rename detection and returns GitChanges
+    whose status is "A" (added or copied), "M" (modified), "D" (deleted) or
+    "R" (renamed from old_path); paths are joined to directory. With
+    suffixes, only files ending in one of them are reported, and a rename
+    across that boundary counts as an addition or a deletion. Raises
+    RuntimeError if git fails, e.g. for an unknown ref.
+    """
+    command = ["git", "diff", "--name-status", "-M", "-z", "--relative", ref]
+    if target:
+        command.append(target)
+    result = subprocess.run(
+        command + ["--", "."], cwd=directory, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"git diff against {ref} failed: {result.stderr.strip()}"
+        )
+
+    suffixes = tuple(suffixes) if suffixes else ("",)
+    fields = result.stdout.split("\0")
+    changes = []
+    i = 0
+    while i < len(fields) - 1:
+        status = fields[i][:1]
+        if status in "RC":
+            old_path, path = fields[i + 1], fields[i + 2]
+            i += 3
+        else:
+            old_path, path = None, fields[i + 1]
+            i += 2
+        if status == "C":
+            status, old_path = "A", None
+        elif status == "D":
+            old_path, path = path, None
+        elif status not in "AR":
+            status = "M"  # Type changes and unmerged files
+
+        if old_path is not None and not old_path.endswith(suffixes):
+            old_path = None
+        if path is not None and not path.endswith(suffixes):
+            path = None
+        if status == "R" and (path is None or old_path is None):
+            status = "A" if path is not None else "D"
+        if status == "D":
+            path, old_path = old_path, None
+        if path is None:
+            continue
+        changes.append(GitChange(
+            status,
+            os.path.join(directory, path),
+            os.path.join(directory, old_path) if old_path else None,
+        ))
+    return changes
+
+
+def git_tree_files(directory, ref, path="."):
+    """Return {path: (blob_id, size)} for the files below path at ref
+
+    Reads the git object database with one git ls-tree, so nothing is
+    checked out. Paths are relative to directory and '/'-separated. Raises
+    RuntimeError if git fails, e.g. for an unknown ref.
+    """
+    result = subprocess.run(
+        ["git", "ls-tree", "-r", "-l", "-z", ref, "--", path],
+        cwd=directory, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"git ls-tree of {ref} failed: {result.stderr.strip()}"
+        )
+
+    files = {}
+    for entry in result.stdout.split("\0"):
+        if not entry:
+            continue
+        info, _, file_path = entry.partition("\t")
+        _mode, kind, blob_id, size = info.split()
+        if kind == "blob":
+            files[file_path] = (blob_id, int(size))
+    return files
+
+
+def read_git_blobs(directory, blob_ids):
+    """Return {blob_id: bytes} for blobs of the git repository at directory
+
+    Every blob is read by a single git cat-file --batch.
+    """
+    blob_ids = list(dict.fromkeys(blob_ids))
+    if not blob_ids:
+        return {}
+    result = subprocess.run(
+        ["git", "cat-file", "--batch"],
+        cwd=directory, capture_output=True,
+        input="".join(f"{blob_id}\n" for blob_id in blob_ids).encode("ascii"),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(
+            f"git cat-file failed: {result.stderr.decode(errors='replace').strip()}"
+        )
+
+    blobs = {}
+    output = result.stdout
+    position = 0
+    for blob_id in blob_ids:
+        end = output.index(b"\n", position)
+        header = output[position:end].split()
+        if header[-1] == b"missing":
+            raise RuntimeError(f"git object {blob_id} is missing")
+        size = int(header[2])
+        blobs[blob_id] = output[end + 1:end + 1 + size]
+        position = end + 1 + size + 1  # Content is followed by a newline
+    return blobs
+
+
+def git_blob_id(data):
+    """Return the id git gives a blob of these bytes"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def read_archive(path, suffixes=None):
+    """Return {member: bytes} for the files of a wheel, sdist or other archive
+
+    Zip files (.whl, .zip) and tarballs (.tar.gz, .tgz, ...) are read in
+    memory; nothing is extracted or installed. With suffixes, only members
+    ending in one of them are read. Raises RuntimeError for other files.
+    """
+    suffixes = tuple(suffixes) if suffixes else ("",)
+    members = {}
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.endswith(suffixes):
+                    members[info.filename] = archive.read(info)
+        return members
+
+    try:
+        with tarfile.open(path) as archive:
+            for info in archive:
+                if info.isfile() and info.name.endswith(suffixes):
+                    members[info.name] = archive.extractfile(info).read()
+    except tarfile.TarError as e:
+        raise RuntimeError(f"{path} is not a wheel or sdist: {e}") from e
+    return members
+
+
+MdxIssue = namedtuple("MdxIssue", ["path", "line", "column", "token", "message"])
+
+# Characters that may start MDX syntax outside code
+_MDX_SPECIAL_RE = re.compile(r"[\\`{<\n]")
+_MDX_FENCE_RE = re.compile(r" {0,3}(`{3,}|~{3,})")
+_MDX_BACKTICKS_RE = re.compile(r"`+")
+_MDX_NAME_RE = re.compile(r"[A-Za-z_$][\w$.:-]*")
+_MDX_SPACE_RE = re.compile(r"\s*")
+
+# Source files checked per worker task by check_mdx_files
+MDX_CHECK_BATCH = 16
+
+
+class _MdxError(Exception):
+    def __init__(self, pos, token, message):
+        super().__init__(message)
+        self.pos = pos
+        self.token = token
+        self.message = message
+
+
+def _skip_expression(text, pos):
+    """Return the index after the } closing the { at pos"""
+    depth = 0
+    i = pos
+    while i < len(text):
+        char = text[i]
+        if text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            if end == -1:
+                break
+            i = end + 1
+        elif char in "\"'`":
+            end = text.find(char, i + 1)
+            while end != -1 and text[end - 1] == "\\":
+                end = text.find(char, end + 1)
+            if end == -1:
+                break
+            i = end
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise _MdxError(pos, "{", "unclosed `{` (escape a literal brace as \\{)")
+
+
+def _parse_tag(text, pos):
+    """Parse the JSX tag at pos; return (end, name, closing, self_closing)"""
+    i = pos + 1
+    closing = text.startswith("/", i)
+    if closing:
+        i += 1
+    i = _MDX_SPACE_RE.match(text, i).end()
+    name = ""
+    if not text.startswith(">", i):
+        match = _MDX_NAME_RE.match(text, i)
+        if not match:
+            raise _MdxError(
+                pos, text[pos:i + 1].strip() or "<",
+                "`<` does not start a tag (escape it as &lt;)",
+            )
+        name = match.group(0)
+        i = match.end()
+
+    while True:
+        i = _MDX_SPACE_RE.match(text, i).end()
+        if i >= len(text):
+            raise _MdxError(pos, f"<{'/' if closing else ''}{name}", "unclosed tag")
+        char = text[i]
+        if char == ">":
+            return i + 1, name, closing, False
+        if char == "/" and not closing:
+            if text.startswith(">", i + 1):
+                return i + 2, name, closing, True
+            raise _MdxError(i, text[i:i + 2], f"expected `>` after `/` in <{name}>")
+        if closing:
+            raise _MdxError(i, char, f"unexpected `{char}` in closing tag </{name}>")
+        if char == "{":
+            i = _skip_expression(text, i)
+            continue
+        match = _MDX_NAME_RE.match(text, i)
+        if not match:
+            raise _MdxError(i, char, f"unexpected `{char}` in tag <{name}>")
+        i = _MDX_SPACE_RE.match(text, match.end()).end()
+        if not text.startswith("=", i):
+            continue
+        i = _MDX_SPACE_RE.match(text, i + 1).end()
+        quote = text[i:i + 1]
+        if quote in ("\"", "'"):
+            end = text.find(quote, i + 1)
+            if end == -1:
+                raise _MdxError(i, quote, f"unclosed attribute value in <{name}>")
+            i = end + 1
+        elif quote == "{":
+            i = _skip_expression(text, i)
+        else:
+            raise _MdxError(
+                i, quote or "=", f"attribute value must be quoted in <{name}>"
+            )
+
+
+def check_mdx(text, path=None):
+    """Return MdxIssues for MDX syntax errors in text
+
+    A structural check of what breaks the MDX compiler in generated pages:
+    unclosed { expressions, < that does not start a tag, malformed tags,
+    unclosed or mismatched tags and HTML comments. Code fences, inline code
+    and backslash escapes are skipped, as is YAML front matter. Expression
+    contents are not parsed as JavaScript.
+    """
+    issues = []
+    line_starts = None
+
+    def report(pos, token, message):
+        nonlocal line_starts
+        if line_starts is None:
+            line_starts = [0] + [m.end() for m in re.finditer("\n", text)]
+        line = bisect.bisect_right(line_starts, pos)
+        issues.append(MdxIssue(path, line, pos - line_starts[line - 1] + 1, token, message))
+
+    pos = 0
+    if text.startswith("---\n"):
+        end = text.find("\n---", 3)
+        if end != -1:
+            pos = end + len("\n---")
+
+    stack = []  # (name, pos) of open tags
+    line_start = pos == 0
+    while pos < len(text):
+        if line_start:
+            line_start = False
+            fence = _MDX_FENCE_RE.match(text, pos)
+            if fence:
+                marker = fence.group(1)
+                close = re.compile(
+                    rf"^ {{0,3}}{re.escape(marker[0])}{{{len(marker)},}}[ \t]*$",
+                    re.MULTILINE,
+                )
+                body = text.find("\n", fence.end())
+                match = close.search(text, body) if body != -1 else None
+                # An unclosed fence runs to the end of the page
+                pos = match.end() if match else len(text)
+                continue
+
+        match = _MDX_SPECIAL_RE.search(text, pos)
+        if not match:
+            break
+        pos = match.start()
+        char = text[pos]
+        if char == "\n":
+            pos += 1
+            line_start = True
+        elif char == "\\":
+            pos += 2
+        elif char == "`":
+            run = _MDX_BACKTICKS_RE.match(text, pos).end() - pos
+            # Inline code ends at the next run of as many backticks, within
+            # the paragraph
+            paragraph_end = text.find("\n\n", pos)
+            closer = re.compile(rf"(?<!`){'`' * run}(?!`)")
+            code = closer.search(
+                text, pos + run, len(text) if paragraph_end == -1 else paragraph_end
+            )
+            pos = code.end() if code else pos + run
+        else:
+            try:
+                if char == "{":
+                    pos = _skip_expression(text, pos)
+                elif text.startswith("<!--", pos):
+                    raise _MdxError(
+                        pos, "<!--", "HTML comments are not valid MDX (use {/* */})"
+                    )
+                else:
+                    end, name, closing, self_closing = _parse_tag(text, pos)
+                    if closing:
+                        open_names = [open_name for open_name, _ in stack]
+                        if name not in open_names:
+                            report(pos, text[pos:end], "closing tag without an opening tag")
+                        else:
+                            while stack[-1][0] != name:
+                                open_name, open_pos = stack.pop()
+                                report(
+                                    open_pos, f"<{open_name}>",
+                                    f"<{open_name}> is not closed before </{name}>",
+                                )
+                            stack.pop()
+                    elif not self_closing:
+                        stack.append((name, pos))
+                    pos = end
+            except _MdxError as e:
+                report(e.pos, e.token, e.message)
+                # Resume past the error, not just past the `<` or `{` that led
+                # to it, or an error inside the tag is reported again; a run
+                # of backticks is read again whole, as it may open inline code
+                pos = e.pos if text.startswith("`", e.pos) and e.pos > pos else e.pos + 1
+
+    for name, open_pos in stack:
+        report(open_pos, f"<{name}>", f"<{name}> is never closed (use <{name} /> if empty)")
+    return issues
+
+
+def check_mdx_file(path):
+    """Return the MdxIssues of an MDX file"""
+    with open(path, encoding="utf-8") as f:
+        return check_mdx(f.read(), os.fspath(path))
+
+
+def _check_mdx_batch(paths):
+    return [issue for path in paths for issue in check_mdx_file(path)]
+
+
+def check_mdx_files(paths, jobs=None):
+    """Check MDX files, in jobs worker processes; return their MdxIssues
+
+    jobs defaults to one per CPU; small sets of files are checked in this
+    process. Issues are sorted by path and position.
+    """
+    paths = [os.fspath(path) for path in paths]
+    if jobs is None or jobs < 1:
+        jobs = os.cpu_count() or 1
+    batches = [
+        paths[i:i + MDX_CHECK_BATCH] for i in range(0, len(paths), MDX_CHECK_BATCH)
+    ]
+    with profile_stage("check mdx"):
+        if jobs == 1 or len(batches) < 2:
+            issues = _check_mdx_batch(paths)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(jobs, len(batches))) as executor:
+                issues = [
+                    issue
+                    for batch_issues in executor.map(_check_mdx_batch, batches)
+                    for issue in batch_issues
+                ]
+    return sorted(issues, key=lambda issue: (issue.path, issue.line, issue.column))
+
+
+def format_mdx_issue(issue):
+    """Format an MdxIssue as path:line:column: message (token)"""
+    return f"{issue.path}:{issue.line}:{issue.column}: {issue.message} (`{issue.token}`)"
+
+
+PlainPage = namedtuple("PlainPage", ["title", "summary", "text"])
+
+# Bundles for LLM consumers written next to docs.json (see update_llms_bundle)
+LLMS_INDEX = "llms.txt"
+LLMS_FULL = "llms-full.txt"
+LLMS_MANIFEST = ".llms_bundle.json"
+
+# Bump whenever the text of bundle sections changes, so every page is
+# stripped again
+LLMS_BUNDLE_VERSION = "1"
+
+# Longest page summary in llms.txt, in characters
+LLMS_SUMMARY_CHARS = 160
+
+_FRONTMATTER_RE = re.compile(r"\A---[ \t]*\n(.*?)\n---[ \t]*(?:\n|\Z)", re.S)
+_FRONTMATTER_TITLE_RE = re.compile(r"^title:[ \t]*(.*?)[ \t]*$", re.M)
+# MDX module syntax, as opposed to prose that happens to start with "import"
+_MDX_ESM_RE = re.compile(
+    r"(?:import\s.*\bfrom\s*['\"]|import\s*['\"]|export\s+(?:const|default|function|let|var)\b)"
+)
+_MDX_COMMENT_RE = re.compile(r"\{/\*.*?\*/\}|<!--.*?-->", re.S)
+_MDX_CODE_SPAN_RE = re.compile(r"(`+)([^\n]+?)\1")
+_MDX_TAG_RE = re.compile(r"(?<!\\)</?[A-Za-z][\w.:-]*(?:\s[^<>]*?)?/?>")
+_MDX_UNESCAPE_RE = re.compile(r"\\([\\{}<>])")
+# Word, number, punctuation and line break runs counted by estimate_tokens
+_TOKEN_PIECE_RE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]+|_+|\n")
+
+
+def _plain_prose(text):
+    """Remove tags and undo escapes in prose outside inline code"""
+    return html.unescape(_MDX_UNESCAPE_RE.sub(r"\1", _MDX_TAG_RE.sub("", text)))
+
+
+def _strip_mdx_prose(lines):
+    """Return the plain text lines of prose, at most one blank line in a row"""
+    text = "\n".join(line for line in lines if not _MDX_ESM_RE.match(line))
+    text = _MDX_COMMENT_RE.sub("", text)
+    pieces = []
+    pos = 0
+    for match in _MDX_CODE_SPAN_RE.finditer(text):
+        pieces.append(_plain_prose(text[pos:match.start()]))
+        pieces.append(match.group(0))
+        pos = match.end()
+    pieces.append(_plain_prose(text[pos:]))
+
+    stripped = []
+    for line in "".join(pieces).split("\n"):
+        line = line.rstrip()
+        if line or not stripped or stripped[-1]:
+            stripped.append(line)
+    return stripped
+
+
+def _summarize(paragraph):
+    """Return a paragraph on one line, cut to LLMS_SUMMARY_CHARS at a word"""
+    summary = " ".join(paragraph.split())
+    if len(summary) > LLMS_SUMMARY_CHARS:
+        summary = summary[:LLMS_SUMMARY_CHARS].rsplit(" ", 1)[0] + "..."
+    return summary
+
+
+def strip_mdx(text):
+    """Return the PlainPage of an MDX page: its title, summary and plain text
+
+    ESM imports and exports, JSX and HTML tags and MDX comments are removed
+    and escapes undone; code blocks and inline code are kept verbatim. The
+    title comes from the frontmatter, or else from a leading # heading,
+    which is then removed from the text; it is None if there is neither.
+    The summary is the first paragraph of prose before any ## heading or
+    code block, on one line, or "".
+    """
+    title = None
+    match = _FRONTMATTER_RE.match(text)
+    if match:
+        found = _FRONTMATTER_TITLE_RE.search(match.group(1))
+        if found:
+            title = found.group(1).strip("\"'") or None
+        text = text[match.end():]
+
+    lines = []
+    prose = []
+    fence = None
+    for line in text.split("\n"):
+        if fence is not None:
+            lines.append(line)
+            marker = line.strip()
+            if marker.startswith(fence) and not marker.strip(fence[0]):
+                fence = None
+            continue
+        match = _MDX_FENCE_RE.match(line)
+        if not match:
+            prose.append(line)
+            continue
+        lines.extend(_strip_mdx_prose(prose))
+        prose = []
+        fence = match.group(1)
+        lines.append(line)
+    lines.extend(_strip_mdx_prose(prose))
+
+    while lines and not lines[0]:
+        lines.pop(0)
+    if lines and lines[0].startswith("# "):
+        heading = lines[0][2:].strip()
+        if title is None or heading == title:
+            title = title or heading
+            lines.pop(0)
+            while lines and not lines[0]:
+                lines.pop(0)
+    while lines and not lines[-1]:
+        lines.pop()
+
+    summary = ""
+    paragraph = []
+    for line in lines + [""]:
+        if line.startswith("##") or _MDX_FENCE_RE.match(line):
+            break
+        if line.startswith("# "):
+            line = ""
+        if line:
+            paragraph.append(line)
+        elif paragraph:
+            if not paragraph[0].startswith(("|", "!", ">")):
+                summary = _summarize(" ".join(paragraph))
+                break
+            paragraph = []
+    return PlainPage(title, summary, "\n".join(lines))
+
+
+def estimate_tokens(text):
+    """Estimate how many tokens of a typical LLM tokenizer text takes
+
+    Computed locally, without a tokenizer or its vocabulary, so counts are
+    the same on every machine: a word takes one token per six letters, a
+    number one per three digits, punctuation one per two characters and a
+    line break one.
+    """
+    tokens = 0
+    for piece in _TOKEN_PIECE_RE.findall(text):
+        if piece[0].isdigit():
+            tokens += (len(piece) + 2) // 3
+        elif piece[0].isalpha():
+            tokens += (len(piece) + 5) // 6
+        else:
+            tokens += (len(piece) + 1) // 2
+    return tokens
+
+
+def _stat_stamp(path):
+    """Return [mtime_ns, size] of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _load_llms_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != LLMS_BUNDLE_VERSION:
+        return {}
+    return manifest
+
+
+def _llms_section(page, file):
+    """Return (manifest entry, section bytes) of a page, or None if it is gone"""
+    try:
+        with open(file, encoding="utf-8") as f:
+            plain = strip_mdx(f.read())
+    except (OSError, UnicodeDecodeError):
+        return None
+    title = plain.title or page.rpartition("/")[2]
+    section = f"# {title}\nSource: /{page}\n\n"
+    if plain.text:
+        section += plain.text + "\n\n"
+    return {
+        "title": title,
+        "summary": plain.summary,
+        "tokens": estimate_tokens(section),
+    }, section.encode("utf-8")
+
+
+def _copy_range(source, target, start, length, chunk_size=1 << 20):
+    """Copy length bytes of source from start on to target"""
+    source.seek(start)
+    while length > 0:
+        data = source.read(min(chunk_size, length))
+        if not data:
+            raise OSError(f"{source.name} is shorter than recorded")
+        target.write(data)
+        length -= len(data)
+
+
+def _render_llms_index(title, pages, order):
+    """Return the content of llms.txt"""
+    total = sum(pages[page]["tokens"] for page in order)
+    lines = [
+        f"# {title}",
+        "",
+        f"> Index of the {title} documentation: {len(order)} pages, about "
+        f"{total:,} tokens. {LLMS_FULL} holds the text of every page.",
+    ]
+    scope = None
+    for page in order:
+        entry = pages[page]
+        if entry["scope"] != scope:
+            scope = entry["scope"]
+            lines.extend(["", f"## {scope.replace('_', ' ').title()}", ""])
+        link_title = entry["title"].replace("[", "\\[").replace("]", "\\]")
+        summary = f": {entry['summary']}" if entry["summary"] else ""
+        lines.append(
+            f"- [{link_title}](/{page}){summary} ({entry['tokens']:,} tokens)"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def update_llms_bundle(bundle_dir, scope, pages, title="CAMEL"):
+    """Update the llms.txt and llms-full.txt bundles with one scope's pages
+
+    pages maps the path of every page of scope ("reference", "cookbooks"),
+    as linked from the site root, to its MDX file; earlier pages of the
+    scope that are not listed are dropped, and other scopes' pages are
+    kept. llms-full.txt holds each page as plain text (see strip_mdx)
+    under its title and link; llms.txt links every page with its summary
+    and estimated token count (see estimate_tokens).
+
+    Only pages whose file changed since the last update are read: the
+    sections of the others are copied from the existing llms-full.txt at
+    the offsets recorded in the .llms_bundle.json manifest, so the corpus
+    is never stripped or counted again as a whole. Updates of several
+    processes are serialized by a file lock. Returns True if a bundle file
+    was written.
+    """
+    bundle_dir = os.fspath(bundle_dir)
+    manifest_path = os.path.join(bundle_dir, LLMS_MANIFEST)
+    full_path = os.path.join(bundle_dir, LLMS_FULL)
+    with file_lock(manifest_path + ".lock"):
+        manifest = _load_llms_manifest(manifest_path)
+        old_pages = manifest.get("pages", {})
+        # Recorded offsets only hold if nothing else wrote llms-full.txt
+        full_stamp = _stat_stamp(full_path)
+        reusable = full_stamp is not None and manifest.get("full") == full_stamp
+
+        entries = {
+            page: entry for page, entry in old_pages.items()
+            if entry["scope"] != scope
+        }
+        for page, file in pages.items():
+            file = os.path.abspath(os.fspath(file))
+            stamp = _stat_stamp(file)
+            old = old_pages.get(page)
+            if (
+                old and old["scope"] == scope and old["file"] == file
+                and old["stamp"] == stamp
+            ):
+                entries[page] = old
+            else:
+                entries[page] = {"scope": scope, "file": file, "stamp": stamp}
+
+        fresh = {}
+        for page, entry in list(entries.items()):
+            if reusable and "offset" in entry:
+                continue
+            with profile_stage("strip", entry["file"]):
+                section = _llms_section(page, entry["file"])
+            if section is None:
+                del entries[page]
+                continue
+            entry.update(section[0])
+            entry.pop("offset", None)
+            fresh[page] = section[1]
+
+        order = sorted(entries, key=lambda page: (entries[page]["scope"], page))
+        written = False
+        if (
+            fresh
+            or not reusable
+            or order != list(old_pages)
+            or manifest.get("title") != title
+        ):
+            written = True
+            header = (
+                f"# {title}\n\n> The text of every page of the {title} "
+                f"documentation, without MDX markup; {LLMS_INDEX} lists the "
+                "pages.\n\n"
+            ).encode("utf-8")
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{LLMS_FULL}.", suffix=".tmp", dir=bundle_dir
+            )
+            try:
+                with contextlib.ExitStack() as stack:
+                    target = stack.enter_context(os.fdopen(fd, "wb"))
+                    source = None
+                    if reusable and len(fresh) < len(order):
+                        source = stack.enter_context(open(full_path, "rb"))
+                    target.write(header)
+                    pos = len(header)
+                    # Adjacent unchanged sections are copied in one go
+                    run = None  # [offset, length] of old bytes to copy next
+                    for page in order:
+                        entry = entries[page]
+                        if page in fresh:
+                            if run:
+                                _copy_range(source, target, *run)
+                                run = None
+                            target.write(fresh[page])
+                            length = len(fresh[page])
+                        else:
+                            length = entry["length"]
+                            if run and run[0] + run[1] == entry["offset"]:
+                                run[1] += length
+                            else:
+                                if run:
+                                    _copy_range(source, target, *run)
+                                run = [entry["offset"], length]
+                        entry["offset"] = pos
+                        entry["length"] = length
+                        pos += length
+                    if run:
+                        _copy_range(source, target, *run)
+                os.chmod(tmp_path, 0o666 & ~_UMASK)
+                os.replace(tmp_path, full_path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+                raise
+
+        if write_if_changed(
+            os.path.join(bundle_dir, LLMS_INDEX),
+            _render_llms_index(title, entries, order),
+        ):
+            written = True
+        manifest = {
+            "version": LLMS_BUNDLE_VERSION,
+            "title": title,
+            "full": _stat_stamp(full_path),
+            "pages": {page: entries[page] for page in order},
+        }
+        write_if_changed(manifest_path, json.dumps(manifest, separators=(",", ":")))
+    return written
+
+
+ProfileEvent = namedtuple(
+    "ProfileEvent",
+    ["name", "file", "root", "start", "wall", "cpu", "self", "peak", "pid"],
+)
+
+_ACTIVE_PROFILER = contextvars.ContextVar("active_profiler", default=None)
+_NO_STAGE = contextlib.nullcontext()
+
+
+class _StageFrame:
+    __slots__ = ("file", "start", "cpu", "memory", "peak", "children")
+
+    def __init__(self, file):
+        self.file = file
+        self.memory = 0
+        self.peak = 0
+        self.children = 0
+
+
+class BuildProfiler:
+    """Wall time, CPU time and peak memory of the stages of one build
+
+    Stages are nested spans opened with stage(), or with profile_stage()
+    and @profiled while the profiler is active. Each becomes a ProfileEvent
+    with its wall and CPU time and its self time (excluding nested stages)
+    in nanoseconds, and peak, how far traced memory rose above its start
+    in bytes. A stage given a file is a root stage of that file; nested
+    stages inherit it. Memory is traced with tracemalloc, which slows the
+    build down, so compare timings between profiled runs only.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.events = []
+        self._stack = []
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Make this the profiler that profile_stage and @profiled record into"""
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        token = _ACTIVE_PROFILER.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_PROFILER.reset(token)
+            if started:
+                tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def stage(self, name, file=None):
+        parent = self._stack[-1] if self._stack else None
+        inherited = parent.file if parent else None
+        frame = _StageFrame(file or inherited)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            # tracemalloc keeps a single peak; carry the parent's over
+            frame.memory, peak = tracemalloc.get_traced_memory()
+            if parent:
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+
+        self._stack.append(frame)
+        frame.cpu = time.thread_time_ns()
+        frame.start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - frame.start
+            cpu = time.thread_time_ns() - frame.cpu
+            self._stack.pop()
+            peak = 0
+            if tracing:
+                peak = max(tracemalloc.get_traced_memory()[1], frame.peak)
+                if parent:
+                    parent.peak = max(parent.peak, peak)
+                peak -= frame.memory
+            if parent:
+                parent.children += wall
+            self.events.append(ProfileEvent(
+                name, frame.file, file is not None and file != inherited,
+                frame.start, wall, cpu, wall - frame.children, peak, os.getpid(),
+            ))
+
+    def add_span(self, name, start, end):
+        """Record a stage measured elsewhere as (perf_counter_ns, thread_time_ns) pairs"""
+        wall = end[0] - start[0]
+        self.events.append(ProfileEvent(
+            name, None, False, start[0], wall, end[1] - start[1], wall, 0,
+            os.getpid(),
+        ))
+
+    def merge(self, events):
+        """Add events recorded by a profiler in a worker process"""
+        self.events.extend(events)
+
+    def write_trace(self, path):
+        """Write the events as Chrome trace JSON (chrome://tracing, Perfetto)
+
+        Returns True if the file changed.
+        """
+        origin = min((event.start for event in self.events), default=0)
+        main_pid = os.getpid()
+        trace = [
+            {
+                "name": "process_name", "ph": "M", "pid": pid, "tid": pid,
+                "args": {"name": "main" if pid == main_pid else f"worker {pid}"},
+            }
+            for pid in sorted({event.pid for event in self.events})
+        ]
+        for event in sorted(self.events, key=lambda event: (event.pid, event.start)):
+            args = {
+                "cpu_ms": round(event.cpu / 1e6, 3),
+                "self_ms": round(event.self / 1e6, 3),
+                "peak_kb": round(event.peak / 1024, 1),
+            }
+            if event.file:
+                args["file"] = event.file
+            trace.append({
+                "name": f"{event.name} {event.file}" if event.root else event.name,
+                "cat": "file" if event.root else "stage",
+                "ph": "X",
+                "ts": (event.start - origin) / 1000,
+                "dur": event.wall / 1000,
+                "pid": event.pid,
+                "tid": event.pid,
+                "args": args,
+            })
+        content = json.dumps(
+            {"traceEvents": trace, "displayTimeUnit": "ms"}, separators=(",", ":")
+        )
+        return write_if_changed(path, content + "\n")
+
+    def summary(self, top=PROFILE_TOP_N):
+        """Return the slowest stages (by self time) and files as text"""
+        stages = {}
+        files = {}
+        for event in self.events:
+            totals = stages.setdefault(event.name, [0, 0, 0, 0, 0])
+            totals[0] += 1
+            totals[1] += event.wall
+            totals[2] += event.self
+            totals[3] += event.cpu
+            totals[4] = max(totals[4], event.peak)
+            if event.root:
+                totals = files.setdefault(event.file, [0, 0, 0])
+                totals[0] += event.wall
+                totals[1] += event.cpu
+                totals[2] = max(totals[2], event.peak)
+
+        def ms(ns):
+            return f"{ns / 1e6:10.1f}"
+
+        def kb(size):
+            return f"{size / 1024:9.0f}"
+
+        lines = [
+            f"Slowest stages ({len(stages)} kinds, {len(self.events)} recorded):",
+            f"  {'stage':<20} {'calls':>7} {'wall ms':>10} {'self ms':>10} "
+            f"{'cpu ms':>10} {'peak KB':>9}",
+        ]
+        ranked = sorted(stages.items(), key=lambda item: -item[1][2])
+        for name, (calls, wall, own, cpu, peak) in ranked[:top]:
+            lines.append(
+                f"  {name:<20} {calls:>7} {ms(wall)} {ms(own)} {ms(cpu)} {kb(peak)}"
+            )
+        if files:
+            ranked = sorted(files.items(), key=lambda item: -item[1][0])[:top]
+            width = max(len(file) for file, _totals in ranked)
+            lines.append(f"Slowest files ({len(files)} profiled):")
+            lines.append(f"  {'file':<{width}} {'wall ms':>10} {'cpu ms':>10} {'peak KB':>9}")
+            for file, (wall, cpu, peak) in ranked:
+                lines.append(f"  {file:<{width}} {ms(wall)} {ms(cpu)} {kb(peak)}")
+        return "\n".join(lines)
+
+
+def active_profiler():
+    """Return the active BuildProfiler, or None when not profiling"""
+    return _ACTIVE_PROFILER.get()
+
+
+def profile_stage(name, file=None):
+    """Return a context manager recording a stage of the active profiler, if any"""
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is None:
+        return _NO_STAGE
+    return profiler.stage(name, file)
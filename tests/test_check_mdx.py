@@ -0,0 +1,30 @@
+"""Tests for check_mdx"""
+
+import pytest
+
+from doc_build_utils import check_mdx
+
+
+def test_valid_mdx_has_no_issues():
+    assert check_mdx('<Note title="x">\n\nUse `a < b` and \\{x\\}.\n\n</Note>\n') == []
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("x {y", [(1, 3, "{")]),
+        ("a < b {x", [(1, 7, "{")]),
+        ("a < b < c {", [(1, 7, "<"), (1, 11, "{")]),
+        ("<Foo a={1} b", [(1, 1, "<Foo")]),
+        # The backticks that broke the tag are not inline code, so `<=` is seen
+        ("0 < t ``<= 2` and p >`= 0", [(1, 7, "`"), (1, 9, "<=")]),
+    ],
+)
+def test_each_error_is_reported_once(text, expected):
+    issues = check_mdx(text)
+    assert [(issue.line, issue.column, issue.token) for issue in issues] == expected
+
+
+def test_unclosed_tag_is_reported_at_its_opening():
+    issues = check_mdx("<Note>\n\ntext\n")
+    assert [(issue.line, issue.column, issue.token) for issue in issues] == [(1, 1, "<Note>")]
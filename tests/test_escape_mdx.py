@@ -0,0 +1,80 @@
+"""Golden tests for escape_mdx_content
+
+tests/golden/escape_mdx_content.json holds docstring snippets and their
+expected escaped form. The cases named nested_* and double_backtick_span
+are code spans nested in other code spans, which the regex-based escaper
+this one replaced turned into __INLINE_CODE_n__ placeholders; every other
+case matches that escaper's output byte for byte.
+
+The escaped form of every case should also be valid MDX. The cases in
+KNOWN_BAD are not yet: their expected outputs pin what the escaper does
+today, and their golden tests are allowed to fail, so a fix of the
+escaper is not reported as a regression. When a change of the escaping
+is intended, regenerate the expected outputs, review the diff of the JSON
+file and drop the cases it fixes from KNOWN_BAD.
+"""
+
+import json
+import os
+
+import pytest
+
+from build_api_docs import escape_mdx_content
+from doc_build_utils import check_mdx
+
+GOLDEN_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "golden", "escape_mdx_content.json"
+)
+
+# Cases whose escaped form is not valid MDX, with the reason
+KNOWN_BAD = {
+    "anchor_tag": "the closing </a> is wrapped in inline code, leaving <a> unclosed",
+    "less_than": "a `<` followed by a space is left unescaped",
+    "comparison_chain": "the wrappings of `< temperature ... >` and `<= 2` "
+    "overlap, leaving unbalanced backticks",
+    "length_constraint": "the range and bound wrappings overlap, leaving a "
+    "bare `<=` outside inline code",
+    "double_backtick_span": "a `<` followed by a space is left unescaped",
+}
+
+with open(GOLDEN_FILE, encoding="utf-8") as f:
+    CASES = json.load(f)
+
+
+def _cases(strict):
+    """Return the cases as pytest params, expecting the KNOWN_BAD ones to fail"""
+    return [
+        pytest.param(
+            case,
+            id=case["name"],
+            marks=pytest.mark.xfail(reason=KNOWN_BAD[case["name"]], strict=strict)
+            if case["name"] in KNOWN_BAD
+            else (),
+        )
+        for case in CASES
+    ]
+
+
+def test_known_bad_cases_exist():
+    assert KNOWN_BAD.keys() <= {case["name"] for case in CASES}
+
+
+# Not strict: the expected outputs still pin the known-bad escaping
+@pytest.mark.parametrize("case", _cases(strict=False))
+def test_escape_mdx_content_matches_golden(case):
+    assert escape_mdx_content(case["input"]) == case["expected"]
+
+
+@pytest.mark.parametrize("case", _cases(strict=True))
+def test_escaped_content_is_valid_mdx(case):
+    assert check_mdx(escape_mdx_content(case["input"])) == []
+
+
+def test_no_placeholders_leak():
+    for case in CASES:
+        assert "__INLINE_CODE_" not in escape_mdx_content(case["input"])
+
+
+def test_plain_text_is_returned_as_is():
+    text = "Nothing special in this sentence."
+    assert escape_mdx_content(text) is text
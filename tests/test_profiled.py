@@ -0,0 +1,29 @@
+"""Tests for the profiled decorator"""
+
+import functools
+
+from doc_build_utils import BuildProfiler, profiled
+
+
+def test_lru_cache_methods_stay_available():
+    @profiled("square")
+    @functools.lru_cache(maxsize=None)
+    def square(x):
+        return x * x
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square.cache_info().hits == 1
+    square.cache_clear()
+    assert square.cache_info().currsize == 0
+
+
+def test_calls_are_recorded_while_profiling():
+    @profiled("double")
+    def double(x):
+        return 2 * x
+
+    profiler = BuildProfiler()
+    with profiler.activate():
+        assert double(2) == 4
+    assert "double" in profiler.summary()